@@ -101,12 +101,16 @@ class JumbotronDataDemo:
         self.print_section("Live Data Update Simulation")
         
         print("\nSimulating live game updates (press Ctrl+C to stop)...")
+        game_path = "/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8"
+        game, etag = None, None
         try:
             for i in range(3):  # Simulate 3 updates
-                # Get fresh game data
-                game = self.client.get_game("NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8")
+                # Conditional poll: only re-read the game when it has changed
+                fresh_game, etag = self.client.fetch_if_changed(game_path, etag)
+                if fresh_game is not None:
+                    game = fresh_game
                 
-                print(f"\nUpdate #{i+1}")
+                print(f"\nUpdate #{i+1}{'' if fresh_game is not None else ' (no change)'}")
                 print(f"Game Status: {game.get('status', 'In Progress')}")
                 print(f"Current Score: {game.get('home_points', 0)} - {game.get('away_points', 0)}")
                 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compression Benchmark
+
+For the main response recorded in each bundled cassette, reports:
+
+    * the raw, gzip and deflate body sizes
+    * the one-time cost of compressing the body
+    * the cost of serving the cached compressed variant afterwards
+    * end-to-end request time through create_app() with and without gzip
+
+Usage:
+    python benchmarks/compression_benchmark.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse_mock import MockAPIClient, create_app  # noqa: E402
+from pulse_mock.payload import Payload  # noqa: E402
+
+BASE_URL = 'http://localhost:1339'
+REPEATS = 200
+
+
+def largest_interaction_url(client: MockAPIClient, cassette: str) -> str:
+    """Load one cassette and return the URL of its largest recorded response."""
+    client.clear_cassettes()
+    client.load_cassette(cassette)
+    largest = max(client.interactions, key=lambda interaction: len(interaction.body))
+    return largest.url
+
+
+def time_call(func, repeats: int = REPEATS) -> float:
+    """Return the mean seconds per call of func over several repeats."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    client = MockAPIClient()
+    http = create_app().test_client()
+
+    header = (f"{'cassette':<28}{'raw':>10}{'gzip':>10}{'deflate':>10}{'ratio':>8}"
+              f"{'compress':>11}{'cached':>9}{'GET raw':>10}{'GET gzip':>10}")
+    print(header)
+    print('-' * len(header))
+
+    totals = {'raw': 0, 'gzip': 0, 'deflate': 0}
+    for cassette in client.discover_available_cassettes():
+        url = largest_interaction_url(client, cassette)
+        data = client.get_payload(url).data
+
+        # A fresh payload measures the one-time compression cost
+        payload = Payload(data)
+        start = time.perf_counter()
+        gzip_size = len(payload.encoded('gzip'))
+        compress_ms = (time.perf_counter() - start) * 1000
+        deflate_size = len(payload.encoded('deflate'))
+        cached_us = time_call(lambda: payload.encoded('gzip')) * 1_000_000
+
+        path = url[len(BASE_URL):].split('?')[0]
+        get_raw_ms = time_call(lambda: http.get(path), 20) * 1000
+        get_gzip_ms = time_call(lambda: http.get(path, headers={'Accept-Encoding': 'gzip'}), 20) * 1000
+
+        totals['raw'] += len(data)
+        totals['gzip'] += gzip_size
+        totals['deflate'] += deflate_size
+        print(f"{cassette:<28}{len(data):>10,}{gzip_size:>10,}{deflate_size:>10,}"
+              f"{len(data) / gzip_size:>7.1f}x{compress_ms:>9.2f}ms{cached_us:>7.2f}us"
+              f"{get_raw_ms:>8.2f}ms{get_gzip_ms:>8.2f}ms")
+
+    print('-' * len(header))
+    print(f"{'total':<28}{totals['raw']:>10,}{totals['gzip']:>10,}{totals['deflate']:>10,}"
+          f"{totals['raw'] / totals['gzip']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Import-time Benchmark
+
+Measures what importing pulse_mock costs a fresh interpreter, which short-lived
+batch jobs and test workers pay on every start. Each scenario runs in its own
+subprocess:
+
+    * python      - an empty interpreter, the floor every scenario includes
+    * client      - ``from pulse_mock import NFLMockClient``
+    * client+load - the same, then loading every cassette (from the warm cache)
+    * eager       - the package plus its asyncio client and Flask server, which
+                    is what every import cost before they were imported lazily
+    * server      - ``from pulse_mock import create_app`` and create_app()
+
+and reports the median wall time and which heavy dependencies ended up loaded.
+
+Usage:
+    python benchmarks/import_benchmark.py
+    python benchmarks/import_benchmark.py --runs 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('yaml', 'asyncio', 'flask', 'werkzeug')
+
+SCENARIOS = [
+    ('python', 'pass'),
+    ('client', 'from pulse_mock import NFLMockClient'),
+    ('client+load', 'from pulse_mock import NFLMockClient; NFLMockClient()'),
+    ('eager', 'import pulse_mock, pulse_mock.aio, pulse_mock.server'),
+    ('server', 'from pulse_mock import create_app; create_app()'),
+]
+
+# Wraps a scenario: time it and report the heavy modules it loaded
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [m for m in {modules!r} if m in sys.modules]]))
+'''
+
+
+def run(code: str):
+    """Run one scenario in a fresh interpreter and return (total seconds, in-script seconds, modules)."""
+    script = PROBE.format(code=code, modules=HEAVY_MODULES)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    total = time.perf_counter() - start
+    elapsed, modules = json.loads(output.strip().splitlines()[-1])
+    return total, elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pulse_mock import time')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per scenario (default: 10)')
+    args = parser.parse_args()
+
+    # Populate the compiled cassette cache and bytecode first
+    run('from pulse_mock import create_app; create_app()')
+
+    header = f"  {'scenario':<12}{'process ms':>11}{'import ms':>11}   loaded"
+    print("Fresh interpreter per run, median of", args.runs)
+    print(header)
+    print('  ' + '-' * (len(header) - 2))
+    results = {}
+    for name, code in SCENARIOS:
+        samples = [run(code) for _ in range(args.runs)]
+        total = statistics.median(sample[0] for sample in samples) * 1000
+        elapsed = statistics.median(sample[1] for sample in samples) * 1000
+        results[name] = elapsed
+        print(f"  {name:<12}{total:>11.1f}{elapsed:>11.1f}   {', '.join(samples[-1][2]) or '-'}")
+    print(f"  client-only import is {results['eager'] / results['client']:.1f}x cheaper than the eager import")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Indexed Cassette Benchmark
+
+Converts the bundled cassettes to indexed (.pulse) cassettes in a temporary
+directory and compares, for a fresh lazily loading client, the cost of the
+first response for a URL:
+
+    * yaml      - the cassette is parsed from YAML (use_cache=False)
+    * cached    - the cassette comes from the warm compiled cache
+    * indexed   - the indexed cassette is memory-mapped; only the header is
+                  parsed and only the requested body is read
+
+Reported per scenario: median time to the first response body, and the
+memory the client holds afterwards (tracemalloc; mapped file pages are not
+counted, as they belong to the page cache).
+
+Usage:
+    python benchmarks/indexed_benchmark.py
+    python benchmarks/indexed_benchmark.py --runs 10
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse_mock import MockAPIClient, cache  # noqa: E402
+from pulse_mock.indexed import convert_cassette  # noqa: E402
+
+BUNDLED_CASSETTES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pulse_mock', 'cassettes'
+)
+
+BASE_URL = 'http://localhost:1339'
+URLS = [
+    ('players (2 MB)', '/v1/leagues/NFL/players'),
+    ('games (330 KB)', '/v1/leagues/NFL/games'),
+    ('one team', '/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH'),
+]
+
+
+def first_response(cassette_dir: str, use_cache: bool, url: str):
+    """Return (seconds, bytes held) for one fresh client's first response for a URL."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    client = MockAPIClient(cassette_dir=cassette_dir, use_cache=use_cache)
+    client.get(BASE_URL + url).content
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare YAML and indexed cassette loading')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per scenario (default: 5)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        yaml_dir = os.path.join(tmp, 'yaml')
+        indexed_dir = os.path.join(tmp, 'indexed')
+        shutil.copytree(BUNDLED_CASSETTES, yaml_dir, ignore=shutil.ignore_patterns(cache.CACHE_DIRNAME))
+        os.makedirs(indexed_dir)
+        for name in sorted(os.listdir(yaml_dir)):
+            if name.endswith('.yaml'):
+                convert_cassette(os.path.join(yaml_dir, name),
+                                 os.path.join(indexed_dir, name[:-len('.yaml')] + '.pulse'))
+
+        # Warm the compiled cache and both manifests
+        MockAPIClient(cassette_dir=yaml_dir).load_all_available_cassettes()
+        MockAPIClient(cassette_dir=indexed_dir).cassette_manifest()
+
+        print(f"First response from a fresh client, median of {args.runs} runs")
+        print(f"  {'url':<16}{'scenario':<10}{'time ms':>10}{'held KB':>10}")
+        for label, url in URLS:
+            for scenario, cassette_dir, use_cache in (('yaml', yaml_dir, False), ('cached', yaml_dir, True),
+                                                      ('indexed', indexed_dir, True)):
+                samples = [first_response(cassette_dir, use_cache, url) for _ in range(args.runs)]
+                elapsed = statistics.median(sample[0] for sample in samples) * 1000
+                held = statistics.median(sample[1] for sample in samples) / 1024
+                print(f"  {label:<16}{scenario:<10}{elapsed:>10.2f}{held:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Interaction Memory Benchmark
+
+Loads every bundled cassette (from the warm compiled cache) into a fresh
+NFLMockClient under tracemalloc and reports what the client keeps:
+
+    * retained   - memory still allocated once loading is done
+    * bodies     - the distinct recorded bodies among it
+    * overhead   - everything else (records, headers, index, lists), in total
+                   and per interaction
+    * responses  - memory held by 1000 MockResponse objects for one URL,
+                   beyond the body they all share
+
+Usage:
+    python benchmarks/memory_benchmark.py
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse_mock import NFLMockClient  # noqa: E402
+
+URL = 'http://localhost:1339/v1/leagues'
+RESPONSES = 1000
+
+
+def traced() -> int:
+    """Collect garbage and return the memory currently traced."""
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    # Populate the compiled cache, so that YAML parsing does not skew the peak
+    NFLMockClient()
+
+    tracemalloc.start()
+    before = traced()
+    client = NFLMockClient()
+    retained = traced() - before
+
+    interactions = client.interactions
+    distinct = {id(interaction.body): interaction.body for interaction in interactions}
+    bodies = sum(sys.getsizeof(body) for body in distinct.values())
+    overhead = retained - bodies
+
+    client.get(URL)
+    before = traced()
+    responses = [client.get(URL) for _ in range(RESPONSES)]
+    per_response = (traced() - before) / len(responses)
+    tracemalloc.stop()
+
+    print(f"{len(client.loaded_cassettes)} cassettes, {len(interactions)} interactions, "
+          f"{len(distinct)} distinct bodies")
+    print(f"  retained   {retained / 1024:10.1f} KB")
+    print(f"  bodies     {bodies / 1024:10.1f} KB")
+    print(f"  overhead   {overhead / 1024:10.1f} KB   ({overhead / len(interactions):.0f} bytes per interaction)")
+    print(f"  responses  {per_response:10.0f} bytes per MockResponse (body shared)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Pre-fork Worker Benchmark
+
+Forks worker processes the way ``python -m pulse_mock.server --workers N``
+does and reports, per worker count:
+
+    * the time for a worker to build its app after the fork
+    * the private (unshared) and proportional memory of each worker after it
+      has served the recorded list endpoints
+
+once with every worker loading its own cassettes, and once with all workers
+attached to a SharedCassetteStore (with the derived payloads precomputed)
+built in the parent.
+
+Linux only (reads /proc/<pid>/smaps_rollup).
+
+Usage:
+    python benchmarks/prefork_benchmark.py [max_workers]
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse_mock import create_app  # noqa: E402
+from pulse_mock.server import precompute_payloads  # noqa: E402
+from pulse_mock.shared import SharedCassetteStore  # noqa: E402
+
+PATHS = [
+    '/v1/leagues',
+    '/v1/leagues/NFL/teams',
+    '/v1/leagues/NFL/players',
+    '/v1/leagues/NFL/games',
+    '/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH/games',
+]
+
+
+def memory_kb() -> dict:
+    """Return this process's private and proportional set size in KB."""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {'private': fields['Private_Clean'] + fields['Private_Dirty'], 'pss': fields['Pss']}
+
+
+def run_worker(store, write_fd: int, release_fd: int) -> None:
+    """Build an app (attached to store if given), serve PATHS, report and exit."""
+    start = time.perf_counter()
+    app = create_app(shared_store=store) if store is not None else create_app()
+    spawn_ms = (time.perf_counter() - start) * 1000
+    http = app.test_client()
+    for path in PATHS:
+        http.get(path, headers={'Accept-Encoding': 'gzip'})
+    report = dict(memory_kb(), spawn_ms=spawn_ms)
+    os.write(write_fd, json.dumps(report).encode('utf-8') + b'\n')
+    # Stay alive until the parent has collected every report, so that shared
+    # pages are counted across all workers
+    os.read(release_fd, 1)
+    os._exit(0)
+
+
+def measure(workers: int, shared: bool) -> list:
+    """Fork workers and collect their reports."""
+    store = SharedCassetteStore.build(precompute=precompute_payloads) if shared else None
+    gc.collect()
+    gc.freeze()
+    read_fd, write_fd = os.pipe()
+    release_read_fd, release_write_fd = os.pipe()
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.close(release_write_fd)
+            run_worker(store, write_fd, release_read_fd)
+        children.append(pid)
+    os.close(write_fd)
+    os.close(release_read_fd)
+
+    reports = []
+    with os.fdopen(read_fd) as reader:
+        for line in reader:
+            reports.append(json.loads(line))
+            if len(reports) == workers:
+                break
+    # Closing the release pipe lets every worker exit
+    os.close(release_write_fd)
+    for pid in children:
+        os.waitpid(pid, 0)
+    gc.unfreeze()
+    return reports
+
+
+def main():
+    if not os.path.exists('/proc/self/smaps_rollup') or not hasattr(os, 'fork'):
+        print("This benchmark needs Linux (fork and /proc/self/smaps_rollup)")
+        return
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    # Warm the compiled cassette cache so both modes read the same files
+    create_app()
+
+    header = f"{'mode':<10}{'workers':>8}{'spawn ms':>10}{'private MB':>12}{'PSS MB':>9}"
+    print(header)
+    print('-' * len(header))
+    for shared in (False, True):
+        for workers in sorted({1, 2, max_workers}):
+            reports = measure(workers, shared)
+            spawn = sum(r['spawn_ms'] for r in reports) / workers
+            private = sum(r['private'] for r in reports) / workers / 1024
+            pss = sum(r['pss'] for r in reports) / workers / 1024
+            mode = 'shared' if shared else 'separate'
+            print(f"{mode:<10}{workers:>8}{spawn:>10.1f}{private:>12.1f}{pss:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
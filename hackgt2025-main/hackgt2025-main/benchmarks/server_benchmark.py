@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Server Throughput Benchmark
+
+Starts ``python -m pulse_mock.server`` once with Werkzeug's development
+server and once with the asyncio front end, and drives each from a set of
+keep-alive connections for a fixed time. Werkzeug closes the connection after
+every response, so its latencies include connection set-up. Reports, per
+server and concurrency level:
+
+    * requests per second
+    * mean and 99th percentile latency
+
+The load generator runs in this process on its own event loop; each server
+runs in a subprocess on a free port.
+
+Usage:
+    python benchmarks/server_benchmark.py [seconds] [connections ...]
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PATHS = [
+    '/v1/leagues',
+    '/v1/leagues/NFL/teams',
+    '/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH',
+    '/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH/stats',
+    '/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8',
+    '/v1/leagues/NFL/players/NFL_player_SyWsd7T30Oev84KlU0vKvQrU',
+    '/v1/leagues/NFL/players/search?name=hurts&limit=5',
+    '/health',
+]
+
+
+def free_port() -> int:
+    """Pick an unused local port."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(server: str, port: int) -> subprocess.Popen:
+    """Start the mock server in a subprocess and wait until it answers."""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'pulse_mock.server', '--server', server, '--host', '127.0.0.1', '--port', str(port)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{server} server did not start")
+
+
+async def connection(port: int, offset: int, stop_at: float, latencies: List[float]) -> None:
+    """
+    Send requests over one connection until stop_at, keeping it alive unless
+    the server answers with Connection: close (Werkzeug always does).
+    """
+    reader = writer = None
+    i = offset
+    while time.perf_counter() < stop_at:
+        path = PATHS[i % len(PATHS)]
+        i += 1
+        start = time.perf_counter()
+        if writer is None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode('latin-1'))
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = 0
+        close = False
+        for line in head.lower().split(b'\r\n'):
+            if line.startswith(b'content-length:'):
+                length = int(line.split(b':', 1)[1])
+            elif line.startswith(b'connection:') and b'close' in line:
+                close = True
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        if close:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port: int, connections: int, seconds: float) -> Tuple[float, List[float]]:
+    """Run the load and return (elapsed seconds, per-request latencies)."""
+    latencies: List[float] = []
+    start = time.perf_counter()
+    stop_at = start + seconds
+    await asyncio.gather(*(connection(port, i, stop_at, latencies) for i in range(connections)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    levels = [int(arg) for arg in sys.argv[2:]] or [1, 8, 32]
+
+    header = f"{'server':<10}{'conns':>6}{'requests':>10}{'req/s':>10}{'mean ms':>9}{'p99 ms':>9}"
+    print(header)
+    print('-' * len(header))
+    for server in ('werkzeug', 'asyncio'):
+        port = free_port()
+        process = start_server(server, port)
+        try:
+            # Warm up caches and derived payloads before measuring
+            asyncio.run(drive(port, 1, 0.5))
+            for connections in levels:
+                elapsed, latencies = asyncio.run(drive(port, connections, seconds))
+                latencies.sort()
+                p99 = latencies[int(len(latencies) * 0.99)] * 1000
+                mean = sum(latencies) / len(latencies) * 1000
+                print(f"{server:<10}{connections:>6}{len(latencies):>10}{len(latencies) / elapsed:>10.0f}"
+                      f"{mean:>9.2f}{p99:>9.2f}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
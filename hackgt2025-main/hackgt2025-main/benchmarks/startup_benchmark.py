@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Start-up Benchmark
+
+Measures how long create_app() takes to load every bundled cassette:
+
+    * no cache  - YAML is parsed on every start (use_cache=False)
+    * cold      - cache enabled but empty, so YAML is parsed and the cache written
+    * warm      - cache populated, so parsed cassettes come from the sidecar cache
+
+The cassettes are copied to a temporary directory first, so the benchmark never
+touches the cache next to the bundled cassettes.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 10
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse_mock import cache, create_app  # noqa: E402
+
+BUNDLED_CASSETTES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pulse_mock', 'cassettes'
+)
+
+
+def time_create_app(cassette_dir: str, use_cache: bool) -> float:
+    """Return the wall-clock seconds taken by a single create_app() call."""
+    start = time.perf_counter()
+    create_app(cassette_dir=cassette_dir, use_cache=use_cache)
+    return time.perf_counter() - start
+
+
+def report(label: str, samples) -> None:
+    """Print a one-line summary for a list of timings."""
+    print(f"  {label:<10} median {statistics.median(samples) * 1000:8.1f} ms"
+          f"   min {min(samples) * 1000:8.1f} ms   ({len(samples)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark create_app() start-up time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per scenario (default: 5)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette_dir = os.path.join(tmp, 'cassettes')
+        shutil.copytree(BUNDLED_CASSETTES, cassette_dir,
+                        ignore=shutil.ignore_patterns(cache.CACHE_DIRNAME))
+
+        no_cache = [time_create_app(cassette_dir, use_cache=False) for _ in range(args.runs)]
+
+        cold = []
+        for _ in range(args.runs):
+            cache.clear_cache(cassette_dir)
+            cold.append(time_create_app(cassette_dir, use_cache=True))
+
+        warm = [time_create_app(cassette_dir, use_cache=True) for _ in range(args.runs)]
+
+    print("create_app() start-up with all bundled cassettes")
+    report('no cache', no_cache)
+    report('cold', cold)
+    report('warm', warm)
+    print(f"  warm start is {statistics.median(no_cache) / statistics.median(warm):.1f}x "
+          f"faster than parsing YAML")
+
+
+if __name__ == '__main__':
+    main()
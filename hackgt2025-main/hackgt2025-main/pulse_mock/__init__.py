@@ -3,18 +3,55 @@ Pulse Mock API Client
 
 A Python package for creating mock API clients using VCR cassettes.
 Easily simulate API responses for testing and development.
+
+The synchronous client is imported with the package. The asyncio client and
+the Flask server are imported on first access (``pulse_mock.create_app``,
+``from pulse_mock import AsyncNFLMockClient``), so client-only code never
+pays for importing asyncio or Flask.
 """
 
+from typing import TYPE_CHECKING, Any, List
+
 from .client import MockAPIClient, NFLMockClient
 from .exceptions import CassetteNotFoundError, RequestNotFoundError, InvalidCassetteError
-from .server import create_app
+from .frozen import FrozenDict, FrozenList
+
+if TYPE_CHECKING:
+    from .aio import AsyncMockAPIClient, AsyncNFLMockClient
+    from .server import create_app
 
 __version__ = "1.0.0"
 __all__ = [
-    "MockAPIClient", 
-    "NFLMockClient", 
-    "CassetteNotFoundError", 
-    "RequestNotFoundError", 
+    "MockAPIClient",
+    "NFLMockClient",
+    "AsyncMockAPIClient",
+    "AsyncNFLMockClient",
+    "CassetteNotFoundError",
+    "RequestNotFoundError",
     "InvalidCassetteError",
+    "FrozenDict",
+    "FrozenList",
     "create_app"
 ]
+
+# Public names imported on first access, by the module that defines them
+_LAZY_ATTRIBUTES = {
+    "AsyncMockAPIClient": "aio",
+    "AsyncNFLMockClient": "aio",
+    "create_app": "server",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module}", __name__), name)
+    # Cache it, so that later lookups no longer reach __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
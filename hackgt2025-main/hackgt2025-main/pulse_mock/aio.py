@@ -0,0 +1,389 @@
+"""
+Asyncio-native mock clients.
+
+AsyncMockAPIClient and AsyncNFLMockClient offer the same API as their
+synchronous counterparts, with every request method being a coroutine:
+
+    client = AsyncNFLMockClient()
+    teams = await client.get_teams()
+
+Only cassette I/O is ever slow - reading and parsing YAML, building the URL
+manifest and decoding large JSON bodies - so that is the only work handed to
+an executor. (With the default thread pool the parsers still hold the GIL for
+part of the work, so a large cassette can delay the loop by a few tens of
+milliseconds while it loads.) Everything else - index lookups, filtering,
+cached statistics - runs inline on the event loop, where it takes
+microseconds. All client state is modified on the event loop thread, and
+cassette loads are serialized by an asyncio.Lock, so any number of concurrent
+tasks can share one client.
+
+Screens that need several pieces of data can fetch them in one await:
+
+    screen = await client.fetch_all(
+        game=client.get_game(game_id),
+        stats=client.get_team_statistics(team_id),
+        qbs=client.get_players_by_position("QB", team_id),
+    )
+"""
+
+import asyncio
+import json
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from .client import IGNORED_QUERY_PARAMS, MockAPIClient, MockResponse, NFLMockClient
+from .exceptions import CassetteNotFoundError, InvalidCassetteError
+from .frozen import freeze_json
+from .payload import Payload
+from .store import Interaction
+
+T = TypeVar('T')
+
+
+class _CassettesNeeded(Exception):
+    """Raised inside a loop-bound client when a call needs cassette I/O first."""
+
+    def __init__(self, url: Optional[str] = None):
+        super().__init__(url)
+        self.url = url
+
+
+class _NonBlockingMixin:
+    """
+    Replace the blocking parts of MockAPIClient's auto-loading.
+
+    Instead of reading cassettes itself, the client raises _CassettesNeeded
+    and the async wrapper performs the I/O in an executor before retrying.
+    """
+
+    unloadable: Set[str]
+
+    def cassette_manifest(self) -> Dict[str, List[str]]:
+        if self._manifest is None:
+            raise _CassettesNeeded()
+        return self._manifest
+
+    def auto_load_cassette_for_url(self, url: str) -> bool:
+        normalized_url = self._normalize_url(url)
+        if normalized_url in self._store.urls:
+            return True
+        candidates = self.cassette_manifest().get(normalized_url, [])
+        if any(c not in self.loaded_cassettes and c not in self.unloadable for c in candidates):
+            raise _CassettesNeeded(url)
+        return False
+
+
+class _LoopBoundMockAPIClient(_NonBlockingMixin, MockAPIClient):
+    pass
+
+
+class _LoopBoundNFLMockClient(_NonBlockingMixin, NFLMockClient):
+    pass
+
+
+def _prepare_cassette(client: MockAPIClient, cassette_name: str) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    Read a cassette and decode its JSON bodies (runs in the executor).
+
+    Returns:
+        Tuple of (cassette filename, parsed cassette data, decoded bodies by body string)
+    """
+    cassette_name, cassette_data = client._read_cassette(cassette_name)
+    decoded = {}
+    for interaction in cassette_data['interactions'] or []:
+        if isinstance(interaction, Interaction):
+            # Indexed cassettes: bodies stay in the file until a request reads them
+            continue
+        body = interaction.get('response', {}).get('body', '')
+        if body and body not in client._decoded_bodies and body not in decoded:
+            try:
+                decoded[body] = freeze_json(json.loads(body))
+            except ValueError:
+                continue
+    return cassette_name, cassette_data, decoded
+
+
+class AsyncMockAPIClient:
+    """
+    Async counterpart to MockAPIClient.
+
+    Example:
+        client = AsyncMockAPIClient()
+        response = await client.get('http://localhost:1339/v1/leagues')
+        print(response.json())
+    """
+
+    _client_class = _LoopBoundMockAPIClient
+
+    def __init__(self, cassette_dir: Optional[str] = None, auto_load_all: bool = False,
+                 use_cache: bool = True, executor: Optional[Executor] = None,
+                 ignored_query_params: Iterable[str] = IGNORED_QUERY_PARAMS):
+        """
+        Initialize the AsyncMockAPIClient.
+
+        No I/O happens here; cassettes are read on the first request that needs them.
+
+        Args:
+            cassette_dir: Directory containing VCR cassette files. Defaults to cassettes/ subdirectory.
+            auto_load_all: If True, load all available cassettes before the first request.
+            use_cache: If True, use the compiled sidecar cache (see pulse_mock.cache).
+            executor: Executor for cassette I/O (default: the event loop's default executor)
+            ignored_query_params: Query parameters left out when matching a
+                request to a recording, for volatile parameters such as cache
+                busters.
+        """
+        self.client = self._client_class(cassette_dir, auto_load_all=False, use_cache=use_cache,
+                                         ignored_query_params=ignored_query_params)
+        self.client.unloadable = set()
+        self.executor = executor
+        self._load_all_pending = auto_load_all
+        # Created on first use so it binds to the running loop (Python < 3.10)
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def loaded_cassettes(self) -> List[str]:
+        """Cassettes loaded so far."""
+        return self.client.loaded_cassettes
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _run_blocking(self, func: Callable[..., T], *args) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _load(self, cassette_names: List[str], url: Optional[str] = None) -> List[Tuple[str, Exception]]:
+        """
+        Load cassettes that are not loaded yet, one at a time.
+
+        Args:
+            cassette_names: Cassettes to load
+            url: If given, stop as soon as a loaded cassette records this URL
+
+        Returns:
+            List of (cassette name, error) for cassettes that could not be loaded
+        """
+        failures = []
+        async with self._get_lock():
+            for cassette in cassette_names:
+                if cassette in self.client.loaded_cassettes or cassette in self.client.unloadable:
+                    continue
+                try:
+                    name, data, decoded = await self._run_blocking(_prepare_cassette, self.client, cassette)
+                except (CassetteNotFoundError, InvalidCassetteError) as e:
+                    self.client.unloadable.add(cassette)
+                    failures.append((cassette, e))
+                    continue
+                # Another task may have loaded it while this one was reading
+                if name not in self.client.loaded_cassettes:
+                    self.client._decoded_bodies.update(decoded)
+                    self.client._add_cassette(name, data)
+                if url is not None and self.client._normalize_url(url) in self.client._store.urls:
+                    break
+        return failures
+
+    async def _load_manifest(self) -> Dict[str, List[str]]:
+        async with self._get_lock():
+            if self.client._manifest is None:
+                self.client._manifest = await self._run_blocking(self.client._build_manifest)
+        return self.client._manifest
+
+    async def _call(self, method: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a synchronous client method on the event loop, loading cassettes as needed.
+
+        Every retry follows a manifest build or a cassette load, so the loop
+        ends once the call has everything it needs (or fails for good).
+        """
+        if self._load_all_pending:
+            await self.load_all_available_cassettes()
+        while True:
+            try:
+                return method(*args, **kwargs)
+            except _CassettesNeeded as needed:
+                manifest = await self._load_manifest()
+                if needed.url is not None:
+                    await self._load(manifest.get(self.client._normalize_url(needed.url), []), needed.url)
+
+    async def load_cassette(self, cassette_name: str) -> None:
+        """
+        Load a VCR cassette file without blocking the event loop.
+
+        Args:
+            cassette_name: Name of the cassette file (with or without extension)
+
+        Raises:
+            CassetteNotFoundError: If the cassette file cannot be found
+            InvalidCassetteError: If the cassette file is malformed
+        """
+        async with self._get_lock():
+            name, data, decoded = await self._run_blocking(_prepare_cassette, self.client, cassette_name)
+            self.client._decoded_bodies.update(decoded)
+            self.client._add_cassette(name, data)
+
+    async def load_all_available_cassettes(self) -> None:
+        """Load all available cassette files without blocking the event loop."""
+        self._load_all_pending = False
+        available = await self._run_blocking(self.client.discover_available_cassettes)
+        for cassette, e in await self._load(available):
+            print(f"Warning: Could not load cassette {cassette}: {e}")
+
+    def clear_cassettes(self) -> None:
+        """Clear all loaded cassettes and interactions."""
+        self.client.clear_cassettes()
+        self.client.unloadable.clear()
+
+    async def fetch_all(self, return_exceptions: bool = False, **calls: Awaitable[Any]) -> Dict[str, Any]:
+        """
+        Await several client calls concurrently and collect their results by name.
+
+        Args:
+            return_exceptions: If True, failed calls put their exception in the
+                result instead of raising the first error
+            **calls: Awaitables to run, keyed by the name to return them under
+
+        Returns:
+            Dictionary mapping each keyword to its call's result
+        """
+        results = await asyncio.gather(*calls.values(), return_exceptions=return_exceptions)
+        return dict(zip(calls.keys(), results))
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, Any]] = None,
+                      **kwargs) -> MockResponse:
+        """Make a mock request (see MockAPIClient.request())."""
+        return await self._call(self.client.request, method, url, headers, **kwargs)
+
+    async def get(self, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
+        """Make a GET request."""
+        return await self.request('GET', url, headers, **kwargs)
+
+    async def post(self, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
+        """Make a POST request."""
+        return await self.request('POST', url, headers, **kwargs)
+
+    async def put(self, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
+        """Make a PUT request."""
+        return await self.request('PUT', url, headers, **kwargs)
+
+    async def delete(self, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
+        """Make a DELETE request."""
+        return await self.request('DELETE', url, headers, **kwargs)
+
+    async def patch(self, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
+        """Make a PATCH request."""
+        return await self.request('PATCH', url, headers, **kwargs)
+
+    async def get_payload(self, url: str, method: str = 'GET') -> Payload:
+        """Get the encoded recorded response body for a request (see MockAPIClient.get_payload())."""
+        return await self._call(self.client.get_payload, url, method)
+
+
+class AsyncNFLMockClient(AsyncMockAPIClient):
+    """
+    Async counterpart to NFLMockClient.
+
+    Each method takes the same arguments as the NFLMockClient method of the
+    same name and returns the same data.
+
+    Example:
+        client = AsyncNFLMockClient()
+        teams, games = await asyncio.gather(client.get_teams(), client.get_all_games())
+    """
+
+    _client_class = _LoopBoundNFLMockClient
+
+    def __init__(self, cassette_dir: Optional[str] = None, auto_load_all: bool = True,
+                 use_cache: bool = True, executor: Optional[Executor] = None,
+                 ignored_query_params: Iterable[str] = IGNORED_QUERY_PARAMS):
+        """
+        Initialize the AsyncNFLMockClient.
+
+        Args:
+            cassette_dir: Directory containing VCR cassette files. Defaults to cassettes/ subdirectory.
+            auto_load_all: If True (default), load all available cassettes before the first request.
+            use_cache: If True, use the compiled sidecar cache (see pulse_mock.cache).
+            executor: Executor for cassette I/O (default: the event loop's default executor)
+            ignored_query_params: Query parameters left out when matching requests
+        """
+        super().__init__(cassette_dir, auto_load_all, use_cache, executor, ignored_query_params)
+        self.base_url = self.client.base_url
+
+    async def get_path_payload(self, path: str) -> Payload:
+        """Get the encoded recorded response body for an API path."""
+        return await self._call(self.client.get_path_payload, path)
+
+    async def fetch_if_changed(self, path: str, etag: Optional[str] = None) -> Tuple[Optional[Any], str]:
+        """Fetch an API path unless it still matches a known ETag (see NFLMockClient.fetch_if_changed())."""
+        return await self._call(self.client.fetch_if_changed, path, etag)
+
+    async def get_leagues(self) -> List[Dict[str, Any]]:
+        """Get all available leagues."""
+        return await self._call(self.client.get_leagues)
+
+    async def get_teams(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                        fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all teams in a league."""
+        return await self._call(self.client.get_teams, league, limit, offset, fields)
+
+    async def get_team(self, team_id: str, league: str = "NFL") -> Dict[str, Any]:
+        """Get a specific team by ID."""
+        return await self._call(self.client.get_team, team_id, league)
+
+    async def get_team_players(self, team_id: str, league: str = "NFL") -> List[Dict[str, Any]]:
+        """Get all players for a specific team."""
+        return await self._call(self.client.get_team_players, team_id, league)
+
+    async def get_team_games(self, team_id: str, league: str = "NFL") -> List[Dict[str, Any]]:
+        """Get all games for a specific team."""
+        return await self._call(self.client.get_team_games, team_id, league)
+
+    async def get_player(self, player_id: str, league: str = "NFL") -> Dict[str, Any]:
+        """Get a specific player by ID."""
+        return await self._call(self.client.get_player, player_id, league)
+
+    async def get_game(self, game_id: str, league: str = "NFL") -> Dict[str, Any]:
+        """Get a specific game by ID."""
+        return await self._call(self.client.get_game, game_id, league)
+
+    async def get_all_games(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                            fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all games in a league."""
+        return await self._call(self.client.get_all_games, league, limit, offset, fields)
+
+    async def get_all_players(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                              fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get all players in a league."""
+        return await self._call(self.client.get_all_players, league, limit, offset, fields)
+
+    async def find_team_by_name(self, team_name: str, league: str = "NFL") -> Optional[Dict[str, Any]]:
+        """Find a team by name, market or abbreviation."""
+        return await self._call(self.client.find_team_by_name, team_name, league)
+
+    async def find_player_by_name(self, player_name: str, league: str = "NFL",
+                                  limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find players by name, best matches first."""
+        return await self._call(self.client.find_player_by_name, player_name, league, limit)
+
+    async def autocomplete_players(self, prefix: str, league: str = "NFL", limit: int = 10) -> List[Dict[str, Any]]:
+        """Suggest players whose first, last or full name starts with a prefix."""
+        return await self._call(self.client.autocomplete_players, prefix, league, limit)
+
+    async def get_games_between_teams(self, team1_id: str, team2_id: str, league: str = "NFL") -> List[Dict[str, Any]]:
+        """Get all games between two specific teams."""
+        return await self._call(self.client.get_games_between_teams, team1_id, team2_id, league)
+
+    async def get_players_by_position(self, position: str, team_id: Optional[str] = None, league: str = "NFL",
+                                      limit: Optional[int] = None, offset: int = 0,
+                                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get players by position, optionally filtered by team."""
+        return await self._call(self.client.get_players_by_position, position, team_id, league, limit, offset, fields)
+
+    async def get_team_statistics(self, team_id: str, league: str = "NFL") -> Dict[str, Any]:
+        """Get basic statistics for a team."""
+        return await self._call(self.client.get_team_statistics, team_id, league)
+
+    async def get_league_statistics(self, league: str = "NFL") -> Dict[str, Any]:
+        """Get league-wide statistics with a per-team breakdown."""
+        return await self._call(self.client.get_league_statistics, league)
@@ -0,0 +1,393 @@
+"""
+Asyncio HTTP/1.1 front end for the mock API server.
+
+Werkzeug's development server (used by app.run()) parses every request with
+http.server and runs each connection in its own thread. AsyncHTTPServer
+serves the same WSGI app instead - every route, header and error response of
+create_app() - from a single asyncio event loop: connections are kept alive
+between requests, request heads are parsed with a few bytes operations, and
+the app is called directly on the loop. Response bodies that can be
+iterated asynchronously, like the live game streams of pulse_mock.live, are
+awaited on the loop, so idle streaming clients cost no thread.
+
+Calling the app on the loop is safe because the mock server's handlers only
+read in-memory data. The exception is lazy loading (create_app(lazy=True)),
+where the first request routed to a cassette blocks the loop while that
+cassette is read.
+
+Usage:
+    from pulse_mock.aioserver import serve_asyncio
+
+    serve_asyncio(create_app(), 'localhost', 1339)
+
+Or run directly:
+    python -m pulse_mock.server --server asyncio
+"""
+
+import asyncio
+import io
+import json
+import socket
+import sys
+import time
+import traceback
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote_to_bytes
+
+# Largest accepted request head (request line plus headers) and body
+MAX_HEAD_SIZE = 64 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+
+# Pending connections the kernel queues for accept(); large enough for a
+# stadium's worth of devices connecting to a live stream at once
+BACKLOG = 1024
+
+# Seconds an idle keep-alive connection is held open
+KEEP_ALIVE_TIMEOUT = 5.0
+
+SERVER_SOFTWARE = 'pulse-mock-asyncio'
+
+
+class _HTTPError(Exception):
+    """A request the server rejects before it reaches the app."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncHTTPServer:
+    """
+    Serve a WSGI application from an asyncio event loop with HTTP/1.1 keep-alive.
+
+    Example:
+        server = AsyncHTTPServer(create_app(), 'localhost', 1339)
+        asyncio.run(server.serve_forever())
+    """
+
+    def __init__(self, app: Callable, host: str = 'localhost', port: int = 1339,
+                 sock: Optional[socket.socket] = None, keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT):
+        """
+        Initialize the AsyncHTTPServer.
+
+        Args:
+            app: WSGI application, e.g. from create_app()
+            host: Host to bind to
+            port: Port to bind to; 0 picks a free port (see address)
+            sock: Already bound listening socket to accept on instead of host and port
+            keep_alive_timeout: Seconds an idle connection is held open
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self._sock = sock
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._date: Tuple[int, str] = (0, '')
+
+    async def start(self) -> None:
+        """Start accepting connections."""
+        if self._sock is not None:
+            self._server = await asyncio.start_server(self._handle, sock=self._sock, limit=MAX_HEAD_SIZE,
+                                                      backlog=BACKLOG)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEAD_SIZE,
+                                                      backlog=BACKLOG)
+        self.host, self.port = self.address
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """The (host, port) the server is listening on, once started."""
+        if self._server is None:
+            return self.host, self.port
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        """Stop accepting connections."""
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until either side closes it."""
+        peer = writer.get_extra_info('peername') or ('', 0)
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.keep_alive_timeout)
+                except asyncio.LimitOverrunError:
+                    await self._send_error(writer, 431, 'Request header fields too large')
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                try:
+                    environ, keep_alive = self._parse_head(head, peer)
+                    body = await self._read_body(reader, writer, environ)
+                except _HTTPError as e:
+                    await self._send_error(writer, e.status, str(e))
+                    break
+                environ['wsgi.input'] = io.BytesIO(body)
+                keep_alive = await self._respond(reader, writer, environ, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutdown; nothing awaits a connection handler
+            pass
+        finally:
+            writer.close()
+
+    def _parse_head(self, head: bytes, peer: Tuple[Any, ...]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Build the WSGI environ for a request head.
+
+        Returns:
+            Tuple of (environ without wsgi.input, whether the client wants keep-alive)
+
+        Raises:
+            _HTTPError: If the request line or a header is malformed
+        """
+        lines = head[:-4].decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise _HTTPError(400, 'Malformed request line')
+        if not version.startswith('HTTP/1.'):
+            raise _HTTPError(505, 'HTTP version not supported')
+
+        if '://' in target:
+            # Absolute-form target, as sent to proxies
+            target = '/' + target.split('://', 1)[1].partition('/')[2]
+        path, _, query = target.partition('?')
+        environ: Dict[str, Any] = {
+            'REQUEST_METHOD': method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+            'QUERY_STRING': query,
+            'REQUEST_URI': target,
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': str(self.port),
+            'SERVER_PROTOCOL': version,
+            'SERVER_SOFTWARE': SERVER_SOFTWARE,
+            'REMOTE_ADDR': str(peer[0]),
+            'REMOTE_PORT': str(peer[1]) if len(peer) > 1 else '',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if not sep or not name or name != name.strip():
+                raise _HTTPError(400, 'Malformed header line')
+            key = name.upper().replace('-', '_')
+            value = value.strip()
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = 'HTTP_' + key
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+
+        connection = environ.get('HTTP_CONNECTION', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = 'keep-alive' in connection
+        else:
+            keep_alive = 'close' not in connection
+        return environ, keep_alive
+
+    async def _read_body(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         environ: Dict[str, Any]) -> bytes:
+        """
+        Read the request body announced by Content-Length.
+
+        Raises:
+            _HTTPError: For chunked, oversized or malformed request bodies
+        """
+        if 'chunked' in environ.get('HTTP_TRANSFER_ENCODING', '').lower():
+            raise _HTTPError(501, 'Chunked request bodies are not supported')
+        length = environ.get('CONTENT_LENGTH')
+        if not length:
+            return b''
+        try:
+            size = int(length)
+        except ValueError:
+            raise _HTTPError(400, 'Invalid Content-Length')
+        if size < 0:
+            raise _HTTPError(400, 'Invalid Content-Length')
+        if size > MAX_BODY_SIZE:
+            raise _HTTPError(413, 'Request body too large')
+        if environ.get('HTTP_EXPECT', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+        return await reader.readexactly(size)
+
+    async def _respond(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                       environ: Dict[str, Any], keep_alive: bool) -> bool:
+        """
+        Call the app for one request and write its response.
+
+        Bodies with a Content-Length are written as they are; other bodies
+        (streamed NDJSON, event streams) use chunked transfer encoding, or
+        close the connection for HTTP/1.0 clients. A response iterable that
+        is also an async iterable is consumed asynchronously.
+
+        Returns:
+            Whether the connection can be used for another request
+        """
+        response: List[Any] = [None, None]
+        written: List[bytes] = []
+        head_sent = False
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            if exc_info and head_sent:
+                raise exc_info[1].with_traceback(exc_info[2])
+            response[0], response[1] = status, headers
+            return written.append
+
+        try:
+            result = self.app(environ, start_response)
+        except Exception:
+            traceback.print_exc()
+            await self._send_error(writer, 500, 'Internal server error')
+            return False
+
+        chunked = False
+        send_body = True
+
+        async def send(chunk: bytes) -> None:
+            nonlocal head_sent, chunked, send_body, keep_alive
+            if not head_sent:
+                head, chunked, send_body, keep_alive = self._head(environ, response, keep_alive)
+                writer.write(head)
+                head_sent = True
+            if written:
+                chunk = b''.join(written) + chunk
+                written.clear()
+            if chunk and send_body:
+                writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk) if chunked else chunk)
+                await writer.drain()
+
+        try:
+            if hasattr(result, '__aiter__'):
+                # Long-lived bodies (Server-Sent Events) wait on the loop
+                # instead of blocking it, and end as soon as the client hangs up
+                keep_alive = False
+                hangup = asyncio.ensure_future(self._close_on_hangup(reader, result))
+                try:
+                    async for chunk in result:
+                        await send(chunk)
+                finally:
+                    hangup.cancel()
+            else:
+                for chunk in result:
+                    await send(chunk)
+            await send(b'')
+            if chunked:
+                writer.write(b'0\r\n\r\n')
+        except ConnectionError:
+            return False
+        except Exception:
+            traceback.print_exc()
+            if not head_sent:
+                await self._send_error(writer, 500, 'Internal server error')
+            return False
+        finally:
+            close = getattr(result, 'close', None)
+            if close is not None:
+                close()
+        await writer.drain()
+        return keep_alive
+
+    @staticmethod
+    async def _close_on_hangup(reader: asyncio.StreamReader, result: Any) -> None:
+        """Close a streamed response body once the client closes the connection."""
+        try:
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        close = getattr(result, 'close', None)
+        if close is not None:
+            close()
+
+    def _head(self, environ: Dict[str, Any], response: List[Any],
+              keep_alive: bool) -> Tuple[bytes, bool, bool, bool]:
+        """
+        Encode the status line and headers of a response.
+
+        Returns:
+            Tuple of (encoded head, use chunked encoding, send a body, keep-alive)
+        """
+        status, headers = response
+        if status is None:
+            raise RuntimeError('The application did not call start_response()')
+        code = int(status[:3])
+        send_body = environ['REQUEST_METHOD'] != 'HEAD' and code >= 200 and code not in (204, 304)
+        names = {name.lower() for name, _ in headers}
+        chunked = False
+        if send_body and 'content-length' not in names:
+            if environ['SERVER_PROTOCOL'] == 'HTTP/1.1':
+                chunked = True
+            else:
+                keep_alive = False
+
+        lines = [f"HTTP/1.1 {status}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        if 'date' not in names:
+            lines.append(f"Date: {self._http_date()}")
+        if 'server' not in names:
+            lines.append(f"Server: {SERVER_SOFTWARE}")
+        if chunked:
+            lines.append('Transfer-Encoding: chunked')
+        if not keep_alive:
+            lines.append('Connection: close')
+        elif environ['SERVER_PROTOCOL'] == 'HTTP/1.0':
+            lines.append('Connection: keep-alive')
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'), chunked, send_body, keep_alive
+
+    async def _send_error(self, writer: asyncio.StreamWriter, status: int, message: str) -> None:
+        """Send a JSON error response in the app's format and end the connection."""
+        body = json.dumps({'error': HTTPStatus(status).phrase, 'message': message}).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Date: {self._http_date()}\r\n"
+                f"Server: {SERVER_SOFTWARE}\r\n"
+                f"Connection: close\r\n\r\n")
+        try:
+            writer.write(head.encode('latin-1') + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _http_date(self) -> str:
+        """The current time as an HTTP date, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._date[0]:
+            self._date = (now, formatdate(now, usegmt=True))
+        return self._date[1]
+
+
+def serve_asyncio(app: Callable, host: str = 'localhost', port: int = 1339,
+                  sock: Optional[socket.socket] = None) -> None:
+    """
+    Serve a WSGI app with AsyncHTTPServer until interrupted.
+
+    Args:
+        app: WSGI application, e.g. from create_app()
+        host: Host to bind to
+        port: Port to bind to
+        sock: Already bound listening socket to accept on instead of host and port
+    """
+    server = AsyncHTTPServer(app, host, port, sock=sock)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,360 @@
+"""
+Benchmark suite for cassette loading, request matching and serving.
+
+Measures, against the bundled cassettes (or any cassette directory):
+
+    * load        - MockAPIClient.load_cassette() for each cassette file
+    * match       - MockAPIClient._match_request() for recorded and unknown URLs
+    * helpers     - NFLMockClient search, position filter and statistics helpers
+    * serve       - end-to-end requests to create_app() through Flask's test client
+
+Each benchmark reports latency percentiles over many calls (after one warm-up
+call, whose time is reported separately as "first") and the peak memory
+allocated while running it, measured with tracemalloc in a separate pass so
+that tracing does not distort the timings.
+
+Results can be saved as a JSON baseline and compared against on a later run;
+the comparison exits with status 1 when a benchmark got slower than the
+threshold allows, so it can guard against regressions in CI.
+
+Usage:
+    python -m pulse_mock.benchmark
+    python -m pulse_mock.benchmark --save baseline.json
+    python -m pulse_mock.benchmark --compare baseline.json --threshold 0.25
+    python -m pulse_mock.benchmark --filter serve --repeats 500
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .client import MockAPIClient, NFLMockClient
+from .exceptions import RequestNotFoundError
+from .server import create_app
+
+BASELINE_VERSION = 1
+
+# Calls per benchmark; loading a cassette is far slower than the rest, so
+# load benchmarks run a fraction of these
+DEFAULT_REPEATS = 200
+LOAD_REPEATS_DIVISOR = 10
+
+# Relative slow-down of the median tolerated by compare(), and the absolute
+# slow-down (microseconds) below which differences are treated as noise
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 5.0
+
+BASE_URL = 'http://localhost:1339'
+EAGLES_ID = 'NFL_team_ram7VKb86QoDRToIZOIN8rH'
+COWBOYS_ID = 'NFL_team_hPzx2TFJb9jCeRnREnXB2WC2'
+GAME_ID = 'NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8'
+PLAYER_ID = 'NFL_player_SyWsd7T30Oev84KlU0vKvQrU'
+
+# A benchmark: (name, function to time, number of timed calls)
+Benchmark = Tuple[str, Callable[[], Any], int]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """
+    Get a percentile of sorted samples, interpolating between neighbours.
+
+    Args:
+        samples: Samples in ascending order
+        q: Percentile between 0 and 100
+
+    Returns:
+        The percentile value
+    """
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def _ignore_not_found(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a call that is expected to raise RequestNotFoundError."""
+    def call():
+        try:
+            func()
+        except RequestNotFoundError:
+            pass
+    return call
+
+
+def build_suite(cassette_dir: Optional[str] = None, use_cache: bool = True,
+                repeats: int = DEFAULT_REPEATS) -> List[Benchmark]:
+    """
+    Build the benchmarks.
+
+    Args:
+        cassette_dir: Directory containing VCR cassette files
+        use_cache: Whether cassette loading may use the compiled cassette cache
+        repeats: Timed calls per benchmark (load benchmarks run fewer)
+
+    Returns:
+        List of (name, function, repeats) tuples
+    """
+    suite: List[Benchmark] = []
+
+    loader = MockAPIClient(cassette_dir, use_cache=use_cache)
+    load_repeats = max(1, repeats // LOAD_REPEATS_DIVISOR)
+    for cassette in loader.discover_available_cassettes():
+        def load(cassette=cassette):
+            loader.clear_cassettes()
+            loader.load_cassette(cassette)
+        suite.append((f'load/{cassette}', load, load_repeats))
+
+    client = NFLMockClient(cassette_dir, use_cache=use_cache)
+    for name, path in [
+        ('teams', '/v1/leagues/NFL/teams'),
+        ('player', f'/v1/leagues/NFL/players/{PLAYER_ID}'),
+        ('game', f'/v1/leagues/NFL/games/{GAME_ID}'),
+        ('query', '/v1/leagues/NFL/players?per_page=2500&cursor='),
+    ]:
+        suite.append((f'match/{name}', lambda url=BASE_URL + path: client._match_request('GET', url), repeats))
+    suite.append(('match/miss', _ignore_not_found(
+        lambda: client._match_request('GET', f'{BASE_URL}/v1/leagues/NFL/teams/unknown')), repeats))
+
+    suite.extend([
+        ('helpers/find_team_by_name', lambda: client.find_team_by_name('Eagles'), repeats),
+        ('helpers/find_player_by_name', lambda: client.find_player_by_name('Hurts'), repeats),
+        ('helpers/autocomplete_players', lambda: client.autocomplete_players('ja'), repeats),
+        ('helpers/players_by_position', lambda: client.get_players_by_position('QB'), repeats),
+        ('helpers/players_by_position_team', lambda: client.get_players_by_position('WR', EAGLES_ID), repeats),
+        ('helpers/games_between_teams', lambda: client.get_games_between_teams(EAGLES_ID, COWBOYS_ID), repeats),
+        ('helpers/team_statistics', lambda: client.get_team_statistics(EAGLES_ID), repeats),
+        ('helpers/league_statistics', lambda: client.get_league_statistics(), repeats),
+    ])
+
+    http = create_app(cassette_dir=cassette_dir, use_cache=use_cache).test_client()
+    for name, path, headers in [
+        ('health', '/health', None),
+        ('teams', '/v1/leagues/NFL/teams', None),
+        ('team', f'/v1/leagues/NFL/teams/{EAGLES_ID}', None),
+        ('players', '/v1/leagues/NFL/players', None),
+        ('players_gzip', '/v1/leagues/NFL/players', {'Accept-Encoding': 'gzip'}),
+        ('players_qb', '/v1/leagues/NFL/players?position=QB', None),
+        ('players_page', '/v1/leagues/NFL/players?limit=25&offset=100&fields=id,last_name', None),
+        ('player_search', '/v1/leagues/NFL/players/search?name=hurts', None),
+        ('team_stats', f'/v1/leagues/NFL/teams/{EAGLES_ID}/stats', None),
+        ('league_stats', '/v1/leagues/NFL/stats', None),
+        ('game', f'/v1/leagues/NFL/games/{GAME_ID}', None),
+        ('not_found', '/v1/leagues/NFL/teams/unknown', None),
+    ]:
+        suite.append((f'serve/{name}', lambda path=path, headers=headers: http.get(path, headers=headers), repeats))
+    return suite
+
+
+def run_benchmark(func: Callable[[], Any], repeats: int, memory: bool = True) -> Dict[str, Any]:
+    """
+    Time a function and measure its peak memory.
+
+    Args:
+        func: Function to benchmark
+        repeats: Number of timed calls, after one warm-up call
+        memory: Whether to measure peak memory (one extra traced call)
+
+    Returns:
+        Dictionary with calls, first, mean, p50, p90, p99 and max (microseconds)
+        and, with memory, peak_kb
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    samples.sort()
+
+    result: Dict[str, Any] = {
+        'calls': repeats,
+        'first': first * 1e6,
+        'mean': sum(samples) / len(samples) * 1e6 if samples else 0.0,
+        'p50': percentile(samples, 50) * 1e6,
+        'p90': percentile(samples, 90) * 1e6,
+        'p99': percentile(samples, 99) * 1e6,
+        'max': (samples[-1] if samples else 0.0) * 1e6,
+    }
+    if memory:
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+        result['peak_kb'] = max(0, peak - baseline) / 1024
+    return result
+
+
+def run_suite(suite: List[Benchmark], name_filter: Optional[str] = None, memory: bool = True,
+              progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run benchmarks.
+
+    Args:
+        suite: Benchmarks from build_suite()
+        name_filter: Only run benchmarks whose name contains this string
+        memory: Whether to measure peak memory
+        progress: Optional callback receiving each (name, result) as it finishes
+
+    Returns:
+        Dictionary mapping benchmark names to their results
+    """
+    results = {}
+    for name, func, repeats in suite:
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = run_benchmark(func, repeats, memory)
+        if progress is not None:
+            progress(name, results[name])
+    return results
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str) -> None:
+    """
+    Save results as a JSON baseline, with the environment they were measured in.
+
+    Args:
+        results: Results from run_suite()
+        path: File to write
+    """
+    document = {
+        'version': BASELINE_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the results saved in a JSON baseline.
+
+    Args:
+        path: Baseline file written by save_baseline()
+
+    Returns:
+        Dictionary mapping benchmark names to their results
+
+    Raises:
+        ValueError: If the file is not a baseline this version can read
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    if not isinstance(document, dict) or document.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} benchmark baseline")
+    return document['results']
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = DEFAULT_THRESHOLD, min_delta: float = DEFAULT_MIN_DELTA) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline by median latency.
+
+    Args:
+        results: Results of this run
+        baseline: Results loaded with load_baseline()
+        threshold: Relative slow-down of the median counted as a regression
+        min_delta: Smallest slow-down of the median, in microseconds, counted
+            as a regression; sub-microsecond benchmarks are otherwise all noise
+
+    Returns:
+        One dictionary per benchmark present in both, with name, baseline,
+        current, ratio and regression
+    """
+    comparisons = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['p50']
+        after = result['p50']
+        ratio = after / before if before else 1.0
+        comparisons.append({
+            'name': name,
+            'baseline': before,
+            'current': after,
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold and after - before > min_delta,
+        })
+    return comparisons
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """Format one result as a report line."""
+    peak = f"{result['peak_kb']:>10.1f}" if 'peak_kb' in result else f"{'-':>10}"
+    return (f"{name:<38}{result['calls']:>6}{result['first']:>11.1f}{result['p50']:>10.1f}"
+            f"{result['p90']:>10.1f}{result['p99']:>10.1f}{peak}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description='Benchmark cassette loading, request matching and serving')
+    parser.add_argument('--cassette-dir', help='Directory containing VCR cassette files')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Load cassettes from YAML instead of the compiled cache')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f'Timed calls per benchmark (default: {DEFAULT_REPEATS})')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--no-memory', action='store_true', help='Skip peak memory measurement')
+    parser.add_argument('--save', metavar='PATH', help='Save the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results with a saved baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Median slow-down counted as a regression (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA,
+                        help=f'Smallest median slow-down in microseconds counted as a regression '
+                             f'(default: {DEFAULT_MIN_DELTA})')
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    header = f"{'benchmark':<38}{'calls':>6}{'first us':>11}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'peak KB':>10}"
+    print(header)
+    print('-' * len(header))
+    suite = build_suite(args.cassette_dir, use_cache=not args.no_cache, repeats=args.repeats)
+    results = run_suite(suite, args.filter, memory=not args.no_memory,
+                        progress=lambda name, result: print(format_result(name, result), flush=True))
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nSaved baseline to {args.save}")
+
+    if baseline is None:
+        return 0
+    comparisons = compare(results, baseline, args.threshold, args.min_delta)
+    print(f"\nMedian latency against {args.compare}:")
+    for comparison in comparisons:
+        flag = '  REGRESSION' if comparison['regression'] else ''
+        print(f"  {comparison['name']:<38}{comparison['baseline']:>10.1f} -> {comparison['current']:>10.1f} us"
+              f"  {comparison['ratio']:>5.2f}x{flag}")
+    regressions = [c for c in comparisons if c['regression']]
+    print(f"\n{len(regressions)} of {len(comparisons)} benchmarks regressed "
+          f"(median over {1 + args.threshold:.2f}x and {args.min_delta:g} us slower than baseline)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
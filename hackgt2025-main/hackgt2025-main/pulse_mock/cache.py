@@ -0,0 +1,218 @@
+"""
+Compiled sidecar cache and URL manifest for VCR cassettes.
+
+Parsing YAML is by far the most expensive part of loading a cassette (the
+league-wide players cassette alone takes close to a second). The parsed
+cassette data is therefore stored next to the cassettes in a compact binary
+form (``marshal``) and reused on the next start as long as the cassette's
+path, modification time and size are unchanged.
+
+The same directory holds a small JSON manifest mapping every recorded URL to
+the cassettes that contain it, so lazily loading clients can pick exactly the
+cassette a request needs instead of trying them one by one. The manifest is
+rebuilt whenever any cassette in the directory is added, removed or changed.
+
+The cache is strictly best-effort: unreadable, stale or corrupt entries are
+ignored, and failures to write (for example a read-only install) never
+prevent a cassette from loading.
+"""
+
+import json
+import marshal
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_DIRNAME = '.pulse_cache'
+MANIFEST_FILENAME = 'manifest.json'
+
+# Bump whenever the layout of a cache entry changes.
+CACHE_FORMAT_VERSION = 1
+
+# marshal output is only guaranteed to be readable by the same Python version.
+_CACHE_TAG = f"pulse-mock-{CACHE_FORMAT_VERSION}-py{sys.version_info[0]}{sys.version_info[1]}"
+
+
+def cache_dir_for(cassette_dir: str) -> str:
+    """Return the sidecar cache directory used for a cassette directory."""
+    return os.path.join(cassette_dir, CACHE_DIRNAME)
+
+
+def cache_path_for(cassette_path: str) -> str:
+    """Return the compiled cache file path for a cassette file."""
+    cassette_dir, filename = os.path.split(cassette_path)
+    return os.path.join(cache_dir_for(cassette_dir), filename + '.marshal')
+
+
+def cassette_signature(cassette_path: str) -> Tuple[str, int, int]:
+    """
+    Build the cache key for a cassette file.
+
+    Args:
+        cassette_path: Path to the cassette file
+
+    Returns:
+        Tuple of (absolute path, mtime in nanoseconds, size in bytes)
+    """
+    stat = os.stat(cassette_path)
+    return (os.path.abspath(cassette_path), stat.st_mtime_ns, stat.st_size)
+
+
+def directory_signature(cassette_dir: str, cassette_names: List[str]) -> Dict[str, List[int]]:
+    """
+    Build the manifest key for a set of cassettes.
+
+    Args:
+        cassette_dir: Directory containing the cassettes
+        cassette_names: Cassette filenames in the directory
+
+    Returns:
+        Dictionary mapping each readable cassette filename to [mtime_ns, size]
+    """
+    signatures = {}
+    for name in cassette_names:
+        try:
+            stat = os.stat(os.path.join(cassette_dir, name))
+        except OSError:
+            continue
+        signatures[name] = [stat.st_mtime_ns, stat.st_size]
+    return signatures
+
+
+def load_manifest(cassette_dir: str, signatures: Dict[str, List[int]]) -> Optional[Dict[str, List[str]]]:
+    """
+    Load the URL manifest for a cassette directory.
+
+    Args:
+        cassette_dir: Directory containing the cassettes
+        signatures: Current signatures, from directory_signature()
+
+    Returns:
+        Dictionary mapping normalized URLs to cassette filenames, or None if
+        the manifest is missing or any cassette has changed since it was built
+    """
+    path = os.path.join(cache_dir_for(cassette_dir), MANIFEST_FILENAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (not isinstance(manifest, dict) or manifest.get('version') != CACHE_FORMAT_VERSION or
+            manifest.get('cassettes') != signatures or not isinstance(manifest.get('routes'), dict)):
+        return None
+    return manifest['routes']
+
+
+def store_manifest(cassette_dir: str, signatures: Dict[str, List[int]], routes: Dict[str, List[str]]) -> bool:
+    """
+    Write the URL manifest for a cassette directory.
+
+    Args:
+        cassette_dir: Directory containing the cassettes
+        signatures: Signatures of the cassettes the manifest was built from
+        routes: Dictionary mapping normalized URLs to cassette filenames
+
+    Returns:
+        True if the manifest was written, False otherwise
+    """
+    manifest = {'version': CACHE_FORMAT_VERSION, 'cassettes': signatures, 'routes': routes}
+    directory = cache_dir_for(cassette_dir)
+    target = os.path.join(directory, MANIFEST_FILENAME)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, target)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def load_cached(cassette_path: str, signature: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+    """
+    Load previously parsed cassette data from the compiled cache.
+
+    Args:
+        cassette_path: Path to the cassette file
+        signature: Current signature of the cassette, from cassette_signature()
+
+    Returns:
+        The parsed cassette data, or None if there is no valid cache entry
+    """
+    try:
+        with open(cache_path_for(cassette_path), 'rb') as f:
+            entry = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (not isinstance(entry, tuple) or len(entry) != 3 or
+            entry[0] != _CACHE_TAG or entry[1] != signature):
+        return None
+    return entry[2]
+
+
+def store_cached(cassette_path: str, signature: Tuple[str, int, int], cassette_data: Dict[str, Any]) -> bool:
+    """
+    Write parsed cassette data to the compiled cache.
+
+    The entry is written to a temporary file and atomically moved into place,
+    so concurrent readers never observe a partially written entry.
+
+    Args:
+        cassette_path: Path to the cassette file
+        signature: Signature of the cassette taken *before* it was parsed
+        cassette_data: Parsed cassette data
+
+    Returns:
+        True if the entry was written, False otherwise
+    """
+    try:
+        payload = marshal.dumps((_CACHE_TAG, signature, cassette_data))
+    except ValueError:
+        # Data contains types marshal cannot represent (e.g. YAML timestamps)
+        return False
+
+    target = cache_path_for(cassette_path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, target)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def clear_cache(cassette_dir: str) -> int:
+    """
+    Remove all compiled cache entries and the manifest for a cassette directory.
+
+    Args:
+        cassette_dir: Directory containing VCR cassette files
+
+    Returns:
+        Number of cache files removed
+    """
+    directory = cache_dir_for(cassette_dir)
+    removed = 0
+    if not os.path.isdir(directory):
+        return removed
+    for filename in os.listdir(directory):
+        if filename.endswith('.marshal') or filename == MANIFEST_FILENAME:
+            try:
+                os.remove(os.path.join(directory, filename))
+                removed += 1
+            except OSError:
+                pass
+    return removed
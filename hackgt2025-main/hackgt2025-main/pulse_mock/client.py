@@ -3,29 +3,207 @@ Main MockAPIClient implementation for handling VCR cassettes.
 """
 
 import os
-import yaml
+import threading
 import json
-from typing import Dict, List, Any, Optional, Union
-from urllib.parse import urlparse, parse_qs
+from functools import lru_cache
+from itertools import islice
+from typing import (TYPE_CHECKING, Dict, FrozenSet, List, Any, Callable, Hashable, Iterable, Iterator, Optional, Set,
+                    Tuple, Union)
+from urllib.parse import urlencode, urlparse, parse_qs, parse_qsl
 
+from . import cache
+from .frozen import freeze_json
+from .indexes import MatchupIndex, PositionIndex, TeamIndex
+from .metrics import MatchCounters
+from .payload import Payload
+from .search import PlayerNameIndex
+from .stats import LeagueStats
+from .store import UNKNOWN_DEPENDENCY, Headers, Interaction, InteractionKey, InteractionStore
 from .exceptions import CassetteNotFoundError, RequestNotFoundError, InvalidCassetteError
 
+if TYPE_CHECKING:
+    from .shared import SharedCassetteStore
+
+
+def _yaml_loader(yaml):
+    # Prefer libyaml's C parser when PyYAML was built with it; it is several times
+    # faster than the pure-Python SafeLoader and accepts the same documents.
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+_NOT_DECODED = object()
+
+# Cassette file extensions: VCR YAML, and indexed cassettes (see pulse_mock.indexed)
+YAML_EXTENSIONS = ('.yaml', '.yml')
+INDEXED_EXTENSION = '.pulse'
+CASSETTE_EXTENSIONS = YAML_EXTENSIONS + (INDEXED_EXTENSION,)
+
+# Query parameters that change from request to request without changing the
+# response (cache busters), left out of request matching by default
+IGNORED_QUERY_PARAMS = frozenset({'_', 'cache_bust', 'cachebust', 'nocache', 'timestamp'})
+
+
+@lru_cache(maxsize=4096)
+def canonical_query(query: str, ignored: FrozenSet[str] = IGNORED_QUERY_PARAMS) -> str:
+    """
+    Canonicalize a query string for matching requests to recordings.
+    
+    Parameters are decoded, ignored parameters are left out, and the rest are
+    sorted (so their order does not matter) and re-encoded; blank values are
+    kept. Results are cached, as clients tend to repeat the same queries.
+    
+    Args:
+        query: Query string, without the leading '?'
+        ignored: Parameter names to leave out
+        
+    Returns:
+        The canonical query string ('' if no parameters remain)
+    """
+    return urlencode(sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                            if name not in ignored))
+
+
+def is_indexed(filename: str) -> bool:
+    """Check whether a cassette filename names an indexed cassette."""
+    return filename.endswith(INDEXED_EXTENSION)
+
+
+# Per thread: a stack with the set of URLs read by each derived value being built
+_building = threading.local()
+
+
+def _depends_on(url: str) -> None:
+    """Record that the derived value being built (if any) reads a URL."""
+    stack = getattr(_building, 'stack', None)
+    if stack:
+        stack[-1].add(url)
+
+
+def iter_records(records: Iterable[Dict[str, Any]], limit: Optional[int] = None, offset: int = 0,
+                 fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily paginate records and optionally project each one to a subset of fields.
+    
+    Records are produced one at a time, so only the record currently being
+    consumed is ever projected.
+    
+    Args:
+        records: Records to select from
+        limit: Maximum number of records to yield (None for no limit)
+        offset: Number of records to skip
+        fields: Top-level fields to keep in each record (None keeps every field)
+        
+    Returns:
+        Iterator over the selected records
+        
+    Raises:
+        ValueError: If limit or offset is negative
+    """
+    if (limit is not None and limit < 0) or offset < 0:
+        raise ValueError("limit and offset must be non-negative")
+    
+    stop = None if limit is None else offset + limit
+    page = islice(records, offset, stop) if (offset or stop is not None) else iter(records)
+    if fields is None:
+        return page
+    return ({field: record[field] for field in fields if field in record} for record in page)
+
+
+def select_records(records: Iterable[Dict[str, Any]], limit: Optional[int] = None, offset: int = 0,
+                   fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Paginate a list of records and optionally project each record to a subset of fields.
+    
+    Pagination is applied first, so only the records on the requested page are
+    projected; the full list is never copied.
+    
+    Args:
+        records: Records to select from
+        limit: Maximum number of records to return (None for no limit)
+        offset: Number of records to skip
+        fields: Top-level fields to keep in each record (None keeps every field)
+        
+    Returns:
+        The selected records. When no pagination or projection is requested
+        the input list itself is returned.
+        
+    Raises:
+        ValueError: If limit or offset is negative
+    """
+    if limit is None and offset == 0 and fields is None and isinstance(records, list):
+        return records
+    return list(iter_records(records, limit, offset, fields))
+
 
 class MockResponse:
     """A mock response object that mimics requests.Response."""
     
-    def __init__(self, status_code: int, headers: Dict[str, Any], content: str):
+    __slots__ = ('status_code', '_headers', '_body', '_content', '_decoded_bodies', '_etag')
+    
+    def __init__(self, status_code: int, headers: Union[Dict[str, Any], Headers], content: Any,
+                 decoded_bodies: Optional[Dict[str, Any]] = None, etag: Optional[Callable[[], str]] = None):
+        """
+        Initialize the MockResponse.
+        
+        Args:
+            status_code: HTTP status code
+            headers: Response headers, as a dictionary or as (name, value)
+                pairs that are turned into one on first access
+            content: Response body, either a string (the recorded body itself,
+                not a copy) or a SharedBody (see pulse_mock.shared) that is
+                only copied out when accessed
+            decoded_bodies: Optional cache of decoded bodies shared with the client.
+                When given, json() decodes each distinct body once and returns
+                the same read-only FrozenDict / FrozenList on every call.
+            etag: Optional function returning the (unquoted) entity tag of the
+                body, called to add an ETag header when the headers are first read
+        """
         self.status_code = status_code
-        self.headers = headers
-        self.content = content
-        self.text = content
+        self._headers = headers
+        self._body = content
+        self._content: Optional[str] = content if isinstance(content, str) else None
+        self._decoded_bodies = decoded_bodies
+        self._etag = etag
+    
+    @property
+    def headers(self) -> Dict[str, Any]:
+        """Response headers, with VCR-style list values."""
+        if isinstance(self._headers, tuple):
+            headers = {name: [value] for name, value in self._headers}
+            if self._etag is not None:
+                headers['ETag'] = [f'"{self._etag()}"']
+            self._headers = headers
+        return self._headers
+    
+    @headers.setter
+    def headers(self, headers: Dict[str, Any]) -> None:
+        self._headers = headers
+    
+    @property
+    def content(self) -> str:
+        """Response body."""
+        if self._content is None:
+            self._content = self._body.text()
+        return self._content
+    
+    @property
+    def text(self) -> str:
+        """Response body."""
+        return self.content
         
     def json(self) -> Dict[str, Any]:
         """Parse response content as JSON."""
+        if self._decoded_bodies is not None:
+            decoded = self._decoded_bodies.get(self._body, _NOT_DECODED)
+            if decoded is not _NOT_DECODED:
+                return decoded
         try:
-            return json.loads(self.content)
+            decoded = json.loads(self._body if isinstance(self._body, str) else self._body.bytes())
         except json.JSONDecodeError:
             raise ValueError("Response content is not valid JSON")
+        if self._decoded_bodies is not None:
+            decoded = self._decoded_bodies.setdefault(self._body, freeze_json(decoded))
+        return decoded
 
 
 class MockAPIClient:
@@ -42,30 +220,83 @@ class MockAPIClient:
         print(response.json())
     """
     
-    def __init__(self, cassette_dir: Optional[str] = None, auto_load_all: bool = False):
+    def __init__(self, cassette_dir: Optional[str] = None, auto_load_all: bool = False,
+                 use_cache: bool = True, shared_store: Optional['SharedCassetteStore'] = None,
+                 ignored_query_params: Iterable[str] = IGNORED_QUERY_PARAMS):
         """
         Initialize the MockAPIClient.
         
         Args:
             cassette_dir: Directory containing VCR cassette files. Defaults to cassettes/ subdirectory.
             auto_load_all: If True, automatically load all available cassettes on initialization.
+            use_cache: If True, reuse parsed cassettes from the compiled sidecar cache
+                (see pulse_mock.cache) and populate it when a cassette is parsed.
+            shared_store: Optional SharedCassetteStore (see pulse_mock.shared) built
+                by a parent process. The client serves its interactions directly
+                and never reads a cassette itself; cassette_dir and auto_load_all
+                are ignored.
+            ignored_query_params: Query parameters left out when matching a
+                request to a recording, for volatile parameters such as cache
+                busters. With a shared store, its index was built with the
+                defaults.
         """
+        if shared_store is not None:
+            cassette_dir = shared_store.cassette_dir
         if cassette_dir is None:
             # Default to cassettes/ subdirectory relative to the pulse_mock package
             current_dir = os.path.dirname(__file__)
             cassette_dir = os.path.join(current_dir, 'cassettes')
         self.cassette_dir = cassette_dir
-        self.interactions: List[Dict[str, Any]] = []
-        self.loaded_cassettes: List[str] = []
+        self.use_cache = use_cache
+        self.ignored_query_params = frozenset(ignored_query_params)
         self._available_cassettes: Optional[List[str]] = None
+        # Loaded interactions, their lookup index and derived values. Replaced
+        # as a whole (never modified) when cassettes load, so reads need no lock;
+        # loads are serialized by _write_lock. See pulse_mock.store.
+        self._store = InteractionStore()
+        self._write_lock = threading.RLock()
+        # Normalized URL -> cassettes recording it, built on first auto-load miss
+        self._manifest: Optional[Dict[str, List[str]]] = None
+        # Signatures of the cassette files the manifest reflects; None unless
+        # _build_manifest() built it from the whole directory, in which case it
+        # may be updated on reload and saved to the cache
+        self._manifest_signatures: Optional[Dict[str, List[int]]] = None
+        # Intern tables for the bodies and header sets of loaded interactions,
+        # so that a body recorded in several cassettes is kept once
+        self._bodies: Dict[str, str] = {}
+        self._header_sets: Dict[Headers, Headers] = {}
+        # Response body -> decoded, read-only JSON. Body strings cache their own
+        # hash, so lookups for an already-seen body are O(1).
+        self._decoded_bodies: Dict[str, Any] = {}
+        # (response body, content type) -> encoded Payload of the recorded body
+        self._payloads: Dict[Tuple[str, str], Payload] = {}
+        # How requests were matched (see pulse_mock.metrics)
+        self.match_counters = MatchCounters()
         
-        if auto_load_all:
+        if shared_store is not None:
+            # Everything the shared store knows is already loaded
+            self._store = shared_store.snapshot()
+            self._manifest = {}
+        elif auto_load_all:
             self.load_all_available_cassettes()
     
+    @property
+    def interactions(self) -> List[Interaction]:
+        """All loaded interactions, in load order (read-only)."""
+        return self._store.interactions
+    
+    @property
+    def loaded_cassettes(self) -> List[str]:
+        """Filenames of the loaded cassettes, in load order (read-only)."""
+        return self._store.loaded_cassettes
+    
     def discover_available_cassettes(self) -> List[str]:
         """
         Discover all available cassette files in the cassette directory.
         
+        A cassette converted to the indexed format replaces its YAML source
+        when both are present.
+        
         Returns:
             List of cassette filenames
         """
@@ -73,11 +304,23 @@ class MockAPIClient:
             cassettes = []
             if os.path.exists(self.cassette_dir):
                 for filename in os.listdir(self.cassette_dir):
-                    if filename.endswith(('.yaml', '.yml')):
+                    if filename.endswith(CASSETTE_EXTENSIONS):
                         cassettes.append(filename)
-            self._available_cassettes = sorted(cassettes)
+            indexed = {os.path.splitext(c)[0] for c in cassettes if is_indexed(c)}
+            self._available_cassettes = sorted(
+                c for c in cassettes if is_indexed(c) or os.path.splitext(c)[0] not in indexed)
         return self._available_cassettes
     
+    def rediscover_cassettes(self) -> List[str]:
+        """
+        Forget the cached list of available cassettes and scan the directory again.
+        
+        Returns:
+            List of cassette filenames
+        """
+        self._available_cassettes = None
+        return self.discover_available_cassettes()
+    
     def load_all_available_cassettes(self) -> None:
         """
         Load all available cassette files from the cassette directory.
@@ -101,62 +344,289 @@ class MockAPIClient:
         """
         # If we already have interactions that might match, don't load more
         normalized_url = self._normalize_url(url)
-        for interaction in self.interactions:
-            request = interaction.get('request', {})
-            interaction_url = self._normalize_url(request.get('url', ''))
-            if interaction_url == normalized_url:
+        if normalized_url in self._store.urls:
+            return True
+        
+        manifest = self.cassette_manifest()
+        with self._write_lock:
+            # Another thread may have loaded it while this one was waiting
+            if normalized_url in self._store.urls:
                 return True
+            
+            # Load only the cassettes the manifest says contain this URL
+            candidates = [c for c in manifest.get(normalized_url, []) if c not in self.loaded_cassettes]
+            for cassette in candidates:
+                try:
+                    self.load_cassette(cassette)
+                except (CassetteNotFoundError, InvalidCassetteError):
+                    continue
+                if normalized_url in self._store.urls:
+                    return True
         
-        # Try to load cassettes that haven't been loaded yet
-        available = self.discover_available_cassettes()
-        unloaded = [c for c in available if c not in self.loaded_cassettes]
+        return False
+    
+    def has_recording(self, url: str, method: str = 'GET') -> bool:
+        """
+        Check whether a request has a recording, without loading any cassette.
         
-        for cassette in unloaded:
-            try:
-                self.load_cassette(cassette)
-                # Check if this cassette contains our URL
-                for interaction in self.interactions:
-                    request = interaction.get('request', {})
-                    interaction_url = self._normalize_url(request.get('url', ''))
-                    if interaction_url == normalized_url:
-                        return True
-            except (CassetteNotFoundError, InvalidCassetteError):
-                continue
+        Args:
+            url: The request URL
+            method: HTTP method (default: GET)
+            
+        Returns:
+            True if a loaded or available cassette records the URL
+        """
+        normalized_url = self._normalize_url(url)
+        _depends_on(normalized_url)
+        if (method.upper(), normalized_url) in self._store.index:
+            return True
+        return normalized_url in self.cassette_manifest()
+    
+    def cassette_manifest(self) -> Dict[str, List[str]]:
+        """
+        Get the manifest mapping each recorded URL to the cassettes containing it.
         
-        return False
+        The manifest is read from the cassette directory's cache when it is still
+        valid for the current cassette files; otherwise it is built by reading
+        every available cassette once and, when caching is enabled, saved for
+        the next client.
         
-    def load_cassette(self, cassette_name: str) -> None:
+        Returns:
+            Dictionary mapping normalized URLs to cassette filenames
         """
-        Load a VCR cassette file.
+        if self._manifest is not None:
+            return self._manifest
+        with self._write_lock:
+            if self._manifest is None:
+                self._manifest = self._build_manifest()
+        return self._manifest
+    
+    def _build_manifest(self) -> Dict[str, List[str]]:
+        """Load the cached manifest if still valid, otherwise build (and cache) it."""
+        available = self.discover_available_cassettes()
+        signatures = cache.directory_signature(self.cassette_dir, available)
+        manifest = cache.load_manifest(self.cassette_dir, signatures) if self.use_cache else None
+        
+        if manifest is None:
+            manifest = {}
+            for cassette in available:
+                try:
+                    _, cassette_data = self._read_cassette(cassette)
+                except (CassetteNotFoundError, InvalidCassetteError):
+                    continue
+                for interaction in cassette_data['interactions'] or []:
+                    if isinstance(interaction, Interaction):
+                        url = self._normalize_url(interaction.url)
+                    else:
+                        url = self._normalize_url(interaction.get('request', {}).get('url', ''))
+                    cassettes = manifest.setdefault(url, [])
+                    if cassette not in cassettes:
+                        cassettes.append(cassette)
+            if self.use_cache:
+                cache.store_manifest(self.cassette_dir, signatures, manifest)
+        self._manifest_signatures = signatures
+        return manifest
+        
+    def _cassette_filename(self, cassette_name: str) -> str:
+        """Resolve a cassette name without an extension to its indexed or .yaml file."""
+        if cassette_name.endswith(CASSETTE_EXTENSIONS):
+            return cassette_name
+        indexed_name = cassette_name + INDEXED_EXTENSION
+        if os.path.exists(os.path.join(self.cassette_dir, indexed_name)):
+            return indexed_name
+        return cassette_name + '.yaml'
+    
+    def _read_cassette(self, cassette_name: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Read and validate a cassette file without loading it.
+        
+        The reader is picked by file extension: indexed cassettes (.pulse) are
+        memory-mapped and yield Interaction records whose bodies are read on
+        demand; YAML cassettes are parsed (or read from the compiled cache)
+        into VCR interaction dictionaries. A name without an extension refers
+        to the indexed cassette if there is one, and to the .yaml file otherwise.
         
         Args:
-            cassette_name: Name of the cassette file (with or without .yaml extension)
+            cassette_name: Name of the cassette file (with or without extension)
+            
+        Returns:
+            Tuple of (cassette filename, cassette data with its 'interactions')
             
         Raises:
             CassetteNotFoundError: If the cassette file cannot be found
             InvalidCassetteError: If the cassette file is malformed
         """
-        if not cassette_name.endswith('.yaml') and not cassette_name.endswith('.yml'):
-            cassette_name += '.yaml'
-            
+        cassette_name = self._cassette_filename(cassette_name)
         cassette_path = os.path.join(self.cassette_dir, cassette_name)
         
         if not os.path.exists(cassette_path):
             raise CassetteNotFoundError(f"Cassette file not found: {cassette_path}")
+        
+        if is_indexed(cassette_name):
+            from .indexed import open_cassette
+            try:
+                return cassette_name, {'interactions': open_cassette(cassette_path)}
+            except OSError as e:
+                raise InvalidCassetteError(f"Error reading cassette {cassette_name}: {e}")
             
-        try:
-            with open(cassette_path, 'r', encoding='utf-8') as f:
-                cassette_data = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise InvalidCassetteError(f"Invalid YAML in cassette {cassette_name}: {e}")
-        except Exception as e:
-            raise InvalidCassetteError(f"Error reading cassette {cassette_name}: {e}")
+        signature = None
+        cassette_data = None
+        if self.use_cache:
+            try:
+                signature = cache.cassette_signature(cassette_path)
+            except OSError:
+                signature = None
+            else:
+                cassette_data = cache.load_cached(cassette_path, signature)
+        
+        if cassette_data is None:
+            # PyYAML is imported only here: with a warm cache it is never needed
+            import yaml
+            try:
+                with open(cassette_path, 'r', encoding='utf-8') as f:
+                    cassette_data = yaml.load(f, Loader=_yaml_loader(yaml))
+            except yaml.YAMLError as e:
+                raise InvalidCassetteError(f"Invalid YAML in cassette {cassette_name}: {e}")
+            except Exception as e:
+                raise InvalidCassetteError(f"Error reading cassette {cassette_name}: {e}")
+                
+            if not isinstance(cassette_data, dict) or 'interactions' not in cassette_data:
+                raise InvalidCassetteError(f"Invalid cassette format in {cassette_name}")
             
-        if not isinstance(cassette_data, dict) or 'interactions' not in cassette_data:
-            raise InvalidCassetteError(f"Invalid cassette format in {cassette_name}")
+            if signature is not None:
+                cache.store_cached(cassette_path, signature, cassette_data)
+        
+        return cassette_name, cassette_data
+        
+    def load_cassette(self, cassette_name: str) -> None:
+        """
+        Load a VCR cassette file.
+        
+        Args:
+            cassette_name: Name of the cassette file (with or without extension)
             
-        self.interactions.extend(cassette_data['interactions'])
-        self.loaded_cassettes.append(cassette_name)
+        Raises:
+            CassetteNotFoundError: If the cassette file cannot be found
+            InvalidCassetteError: If the cassette file is malformed
+        """
+        self._add_cassette(*self._read_cassette(cassette_name))
+    
+    def _add_cassette(self, cassette_name: str, cassette_data: Dict[str, Any]) -> None:
+        """Publish a new store that includes a cassette read by _read_cassette()."""
+        with self._write_lock:
+            interactions, keys = self._records(cassette_data)
+            self._store = self._store.with_cassette(cassette_name, interactions, keys)
+    
+    def _records(self, cassette_data: Dict[str, Any]) -> Tuple[List[Interaction], List[InteractionKey]]:
+        """Turn cassette data read by _read_cassette() into interaction records and their keys."""
+        interactions = [data if isinstance(data, Interaction)
+                        else Interaction.from_vcr(data, self._bodies, self._header_sets)
+                        for data in cassette_data['interactions'] or []]
+        return interactions, [self._interaction_key(interaction) for interaction in interactions]
+    
+    def reload_cassette(self, cassette_name: str) -> bool:
+        """
+        Re-read a cassette that changed on disk.
+        
+        A loaded cassette is swapped out in place: a new snapshot replaces just
+        its interactions and the index entries for the requests it records,
+        and keeps every derived value that did not read one of those URLs.
+        The file is read before the write lock is taken, and requests keep
+        being served from the previous snapshot until the swap, so nothing
+        waits for the parse. A cassette that is not loaded only has its
+        manifest entry refreshed, so lazy loading finds its new URLs.
+        
+        Args:
+            cassette_name: Filename of the cassette
+            
+        Returns:
+            True if a loaded cassette was swapped, False if only the manifest was updated
+            
+        Raises:
+            CassetteNotFoundError: If the cassette file cannot be found
+            InvalidCassetteError: If the cassette file is malformed; the
+                previously loaded version stays in place
+        """
+        # Taken before reading, so a write during the read makes the saved
+        # manifest stale rather than wrongly valid
+        cassette_name = self._cassette_filename(cassette_name)
+        signature = cache.directory_signature(self.cassette_dir, [cassette_name])
+        cassette_name, cassette_data = self._read_cassette(cassette_name)
+        with self._write_lock:
+            interactions, keys = self._records(cassette_data)
+            swapped = cassette_name in self._store.cassettes
+            if swapped:
+                self._store = self._store.replacing_cassette(cassette_name, interactions, keys)
+                self._prune_caches()
+            self._update_manifest(cassette_name, [key[1] for key in keys], signature)
+        return swapped
+    
+    def unload_cassette(self, cassette_name: str) -> None:
+        """
+        Drop a loaded cassette (for example because its file was deleted).
+        
+        Args:
+            cassette_name: Filename of the cassette
+        """
+        with self._write_lock:
+            if cassette_name in self._store.cassettes:
+                self._store = self._store.replacing_cassette(cassette_name, None, None)
+                self._prune_caches()
+            self._update_manifest(cassette_name, [], {})
+    
+    def _prune_caches(self) -> None:
+        """Drop the interned and cached bodies that no loaded interaction uses any more."""
+        interactions = self._store.interactions
+        bodies = {interaction.body for interaction in interactions}
+        header_sets = {interaction.headers for interaction in interactions}
+        self._bodies = {body: body for body in self._bodies if body in bodies}
+        self._header_sets = {headers: headers for headers in self._header_sets if headers in header_sets}
+        self._decoded_bodies = {body: value for body, value in self._decoded_bodies.items() if body in bodies}
+        self._payloads = {key: payload for key, payload in self._payloads.items() if key[0] in bodies}
+    
+    def _update_manifest(self, cassette_name: str, urls: List[str], signature: Dict[str, List[int]]) -> None:
+        """
+        Point the manifest's entries for a cassette at its current URLs.
+        
+        Only a manifest built from the whole directory is updated (a client
+        serving a shared store has none). When it is saved, every other
+        cassette keeps the signature it had when the manifest last read it, so
+        files that changed since are still detected by the next client.
+        
+        Args:
+            cassette_name: Filename of the cassette
+            urls: Normalized URLs the cassette now records
+            signature: Signature of the cassette file as read ({} if it is gone)
+        """
+        if self._manifest is None or self._manifest_signatures is None:
+            return
+        manifest: Dict[str, List[str]] = {}
+        for url, cassettes in self._manifest.items():
+            cassettes = [c for c in cassettes if c != cassette_name]
+            if cassettes:
+                manifest[url] = cassettes
+        for url in urls:
+            cassettes = manifest.setdefault(url, [])
+            if cassette_name not in cassettes:
+                cassettes.append(cassette_name)
+        signatures = {name: value for name, value in self._manifest_signatures.items() if name != cassette_name}
+        signatures.update(signature)
+        self._manifest, self._manifest_signatures = manifest, signatures
+        if self.use_cache:
+            cache.store_manifest(self.cassette_dir, signatures, manifest)
+    
+    def _interaction_key(self, interaction: Interaction) -> InteractionKey:
+        """Get the lookup key for a recorded interaction."""
+        return self._request_key(interaction.method, interaction.url)
+    
+    def _request_key(self, method: str, url: str) -> InteractionKey:
+        """Get the (METHOD, normalized URL, canonical query) lookup key for a request."""
+        parsed = urlparse(url)
+        return (method.upper(), f"{parsed.scheme}://{parsed.netloc}{parsed.path}", self._canonical_query(parsed.query))
+    
+    def _canonical_query(self, query: str) -> str:
+        """Canonicalize a query string for matching (see canonical_query())."""
+        return canonical_query(query, self.ignored_query_params) if query else ''
         
     def load_cassettes(self, cassette_names: List[str]) -> None:
         """
@@ -179,78 +649,197 @@ class MockAPIClient:
             return {}
         return {k.lower(): str(v) for k, v in headers.items()}
         
-    def _match_request(self, method: str, url: str, headers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _match_request(self, method: str, url: str, headers: Optional[Dict[str, Any]] = None) -> Interaction:
         """
         Find a matching interaction for the given request.
         
+        A recording of the same query string (in any parameter order, ignored
+        parameters aside) is preferred; otherwise the first recording for the
+        URL with any query matches.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             url: Request URL
             headers: Request headers
             
         Returns:
-            Matching interaction dictionary
+            Matching Interaction
             
         Raises:
             RequestNotFoundError: If no matching interaction is found
         """
-        normalized_url = self._normalize_url(url)
-        normalized_headers = self._normalize_headers(headers)
-        method = method.upper()
+        key = self._request_key(method, url)
+        _depends_on(key[1])
         
         # First try: match against already loaded interactions
-        for interaction in self.interactions:
-            request = interaction.get('request', {})
-            
-            # Match method
-            if request.get('method', '').upper() != method:
-                continue
-                
-            # Match URL (normalized)
-            interaction_url = self._normalize_url(request.get('url', ''))
-            if interaction_url != normalized_url:
-                continue
-                
-            # If we get here, we have a match
+        interaction = self._lookup(key)
+        if interaction is not None:
+            self.match_counters.hits.inc()
             return interaction
         
         # Second try: attempt to auto-load cassettes for this URL
         if self.auto_load_cassette_for_url(url):
-            # Try matching again after loading new cassettes
-            for interaction in self.interactions:
-                request = interaction.get('request', {})
-                
-                # Match method
-                if request.get('method', '').upper() != method:
-                    continue
-                    
-                # Match URL (normalized)
-                interaction_url = self._normalize_url(request.get('url', ''))
-                if interaction_url != normalized_url:
-                    continue
-                    
-                # If we get here, we have a match
+            interaction = self._lookup(key)
+            if interaction is not None:
+                self.match_counters.auto_loaded.inc()
                 return interaction
             
+        self.match_counters.misses.inc()
         raise RequestNotFoundError(
-            f"No matching interaction found for {method} {url}. "
+            f"No matching interaction found for {key[0]} {url}. "
             f"Loaded {len(self.interactions)} interactions from cassettes: {', '.join(self.loaded_cassettes)}"
         )
         
-    def _create_response(self, interaction: Dict[str, Any]) -> MockResponse:
-        """Create a MockResponse from an interaction."""
-        response_data = interaction.get('response', {})
+    def _lookup(self, key: InteractionKey) -> Optional[Interaction]:
+        """Look up a request key, falling back to the URL recorded with any query."""
+        index = self._store.index
+        interaction = index.get(key)
+        if interaction is None:
+            interaction = index.get(key[:2])
+        return interaction
+    
+    def _create_response(self, interaction: Interaction) -> MockResponse:
+        """
+        Create a MockResponse from an interaction, sharing its recorded body.
+        
+        The ETag header is only computed (which encodes and hashes the body)
+        when the response headers are read.
+        """
+        return MockResponse(interaction.status_code, interaction.headers, interaction.body, self._decoded_bodies,
+                            lambda: self._payload_for(interaction).etag)
+    
+    def _etag_matches(self, if_none_match: str, etag: str) -> bool:
+        """Check an If-None-Match header value against an unquoted entity tag."""
+        for candidate in if_none_match.split(','):
+            candidate = candidate.strip()
+            if candidate == '*':
+                return True
+            if candidate.startswith('W/'):
+                candidate = candidate[2:]
+            if candidate.strip('"') == etag:
+                return True
+        return False
+    
+    def get_payload(self, url: str, method: str = 'GET') -> Payload:
+        """
+        Get the recorded response for a request as an encoded payload.
+        
+        The recorded body is passed through without being decoded, and the
+        encoded bytes are cached per body, so serving the same interaction
+        again costs only a lookup.
+        
+        Args:
+            url: Request URL
+            method: HTTP method (default: GET)
+            
+        Returns:
+            Payload with the recorded body, content type and status code
+            
+        Raises:
+            RequestNotFoundError: If no matching interaction is found
+        """
+        return self._payload_for(self._match_request(method, url))
+
+    def get_query_payload(self, url: str, method: str = 'GET') -> Optional[Payload]:
+        """
+        Get the response recorded for exactly this query string, if there is one.
+
+        Unlike get_payload(), this never falls back to a recording of the URL
+        with a different query, so callers can serve query-specific recordings
+        directly and compute any other response themselves.
+
+        Args:
+            url: Request URL, including its query string
+            method: HTTP method (default: GET)
+
+        Returns:
+            Payload with the recorded body, or None if the query was not recorded
+        """
+        key = self._request_key(method, url)
+        _depends_on(key[1])
+        interaction = self._store.index.get(key)
+        if interaction is None and self.auto_load_cassette_for_url(url):
+            interaction = self._store.index.get(key)
+        return None if interaction is None else self._payload_for(interaction)
+
+    def _payload_for(self, interaction: Interaction) -> Payload:
+        """Get the cached Payload for an interaction's recorded response."""
+        body = interaction.body
+        if not isinstance(body, str):
+            # Shared bodies carry their payload, already encoded and compressed
+            return body.payload
+        content_type = interaction.content_type
+        key = (body, content_type)
+        
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = Payload(body.encode('utf-8'), content_type, interaction.status_code)
+            # Concurrent requests for the same body all end up with one Payload
+            payload = self._payloads.setdefault(key, payload)
+        return payload
+    
+    def derived(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Get a value derived from the loaded interactions, building it on first use.
+        
+        Derived values are cached until the loaded cassettes change (a cassette
+        is loaded or the cassettes are cleared). Reloading a cassette only drops
+        the values whose build read one of its URLs; the URLs each value reads
+        through this client (including through other derived values) are
+        recorded while it is built. Build functions should return read-only
+        data, since the value is shared by every caller. If several threads
+        build the same value at once, they all get the first one stored.
+        
+        Args:
+            key: Hashable key identifying the derived value
+            build: Function computing the value
+            
+        Returns:
+            The cached or freshly built value
+        """
+        store = self._store
+        try:
+            value = store.derived[key]
+        except KeyError:
+            urls: Set[str] = set()
+            stack = getattr(_building, 'stack', None)
+            if stack is None:
+                stack = _building.stack = []
+            stack.append(urls)
+            try:
+                value = build()
+            finally:
+                stack.pop()
+            value = store.derived.setdefault(key, value)
+            store.dependencies.setdefault(key, frozenset(urls))
         
-        status_code = response_data.get('code', 200)
-        headers = response_data.get('headers', {})
-        body = response_data.get('body', '')
+        # A value used to build another one makes its URLs dependencies of that one too
+        stack = getattr(_building, 'stack', None)
+        if stack:
+            stack[-1].update(store.dependencies.get(key, (UNKNOWN_DEPENDENCY,)))
+        return value
+    
+    def derived_payload(self, key: Hashable, build: Callable[[], Any]) -> Payload:
+        """
+        Get a derived value encoded as a JSON payload, encoding it only once.
         
-        return MockResponse(status_code, headers, body)
+        Args:
+            key: Hashable key identifying the derived value
+            build: Function computing the JSON-serializable value
+            
+        Returns:
+            Cached Payload for the derived value
+        """
+        return self.derived(('payload', key), lambda: Payload.from_json(build()))
         
     def request(self, method: str, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
         """
         Make a mock request and return the corresponding response from cassettes.
         
+        Every response carries a strong ETag header. Sending that value back in
+        an If-None-Match header makes the request conditional: if the recorded
+        body is unchanged, a 304 response with an empty body is returned.
+        
         Args:
             method: HTTP method
             url: Request URL
@@ -261,6 +850,12 @@ class MockAPIClient:
             MockResponse object
         """
         interaction = self._match_request(method, url, headers)
+        
+        if_none_match = self._normalize_headers(headers).get('if-none-match')
+        if if_none_match:
+            etag = self._payload_for(interaction).etag
+            if self._etag_matches(if_none_match, etag):
+                return MockResponse(304, interaction.headers + (('ETag', f'"{etag}"'),), '')
         return self._create_response(interaction)
         
     def get(self, url: str, headers: Optional[Dict[str, Any]] = None, **kwargs) -> MockResponse:
@@ -285,15 +880,16 @@ class MockAPIClient:
         
     def clear_cassettes(self) -> None:
         """Clear all loaded cassettes and interactions."""
-        self.interactions.clear()
-        self.loaded_cassettes.clear()
+        with self._write_lock:
+            self._store = InteractionStore()
+            self._bodies = {}
+            self._header_sets = {}
+            self._decoded_bodies = {}
+            self._payloads = {}
         
     def list_interactions(self) -> List[str]:
         """Return a list of all loaded interactions as human-readable strings."""
-        return [
-            f"{interaction['request']['method']} {interaction['request']['url']}"
-            for interaction in self.interactions
-        ]
+        return [f"{interaction.method} {interaction.url}" for interaction in self.interactions]
 
 
 class NFLMockClient(MockAPIClient):
@@ -333,17 +929,54 @@ class NFLMockClient(MockAPIClient):
         all_players = client.get_all_players()
     """
     
-    def __init__(self, cassette_dir: Optional[str] = None, auto_load_all: bool = True):
+    def __init__(self, cassette_dir: Optional[str] = None, auto_load_all: bool = True,
+                 use_cache: bool = True, shared_store: Optional['SharedCassetteStore'] = None,
+                 ignored_query_params: Iterable[str] = IGNORED_QUERY_PARAMS):
         """
         Initialize the NFLMockClient.
         
         Args:
             cassette_dir: Directory containing VCR cassette files
             auto_load_all: Whether to automatically load all available cassettes on initialization
+            use_cache: Whether to use the compiled cassette cache
+            shared_store: Optional SharedCassetteStore to serve from (see MockAPIClient)
+            ignored_query_params: Query parameters left out when matching requests
         """
-        super().__init__(cassette_dir, auto_load_all=auto_load_all)
+        super().__init__(cassette_dir, auto_load_all=auto_load_all, use_cache=use_cache,
+                         shared_store=shared_store, ignored_query_params=ignored_query_params)
         self.base_url = "http://localhost:1339"
     
+    def get_path_payload(self, path: str) -> Payload:
+        """
+        Get the recorded response for an API path as an encoded payload.
+        
+        Args:
+            path: API path, e.g. "/v1/leagues/NFL/teams"
+            
+        Returns:
+            Payload with the recorded body
+        """
+        return self.get_payload(f"{self.base_url}{path}")
+    
+    def fetch_if_changed(self, path: str, etag: Optional[str] = None) -> Tuple[Optional[Any], str]:
+        """
+        Conditionally fetch an API path, for cheap polling.
+        
+        Args:
+            path: API path, e.g. "/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8"
+            etag: ETag returned by the previous call, if any
+            
+        Returns:
+            Tuple of (decoded data, etag). The data is None when the response
+            has not changed since ``etag`` was issued.
+        """
+        headers = {'If-None-Match': etag} if etag else None
+        response = self.get(f"{self.base_url}{path}", headers=headers)
+        new_etag = response.headers['ETag'][0]
+        if response.status_code == 304:
+            return None, new_etag
+        return response.json(), new_etag
+    
     def get_leagues(self) -> List[Dict[str, Any]]:
         """
         Get all available leagues.
@@ -355,19 +988,23 @@ class NFLMockClient(MockAPIClient):
         response = self.get(url)
         return response.json()
     
-    def get_teams(self, league: str = "NFL") -> List[Dict[str, Any]]:
+    def get_teams(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                  fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all teams in a league.
         
         Args:
             league: League identifier (default: "NFL")
+            limit: Maximum number of teams to return (default: all)
+            offset: Number of teams to skip (default: 0)
+            fields: Only include these fields in each team (default: all fields)
             
         Returns:
             List of team dictionaries
         """
         url = f"{self.base_url}/v1/leagues/{league}/teams"
         response = self.get(url)
-        return response.json()
+        return select_records(response.json(), limit, offset, fields)
     
     def get_team(self, team_id: str, league: str = "NFL") -> Dict[str, Any]:
         """
@@ -444,26 +1081,35 @@ class NFLMockClient(MockAPIClient):
         response = self.get(url)
         return response.json()
     
-    def get_all_games(self, league: str = "NFL") -> List[Dict[str, Any]]:
+    def get_all_games(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all games in a league.
         
         Args:
             league: League identifier (default: "NFL")
+            limit: Maximum number of games to return (default: all)
+            offset: Number of games to skip (default: 0)
+            fields: Only include these fields in each game (default: all fields)
             
         Returns:
             List of game dictionaries
         """
         url = f"{self.base_url}/v1/leagues/{league}/games"
         response = self.get(url)
-        return response.json()
+        return select_records(response.json(), limit, offset, fields)
     
-    def get_all_players(self, league: str = "NFL") -> List[Dict[str, Any]]:
+    def get_all_players(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                        fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all players in a league.
         
         Args:
             league: League identifier (default: "NFL")
+            limit: Maximum number of players to return (default: all)
+            offset: Number of players to skip (default: 0)
+            fields: Only include these fields in each player, e.g.
+                ["id", "first_name", "last_name", "position", "jersey_number"]
             
         Returns:
             List of player dictionaries
@@ -472,14 +1118,145 @@ class NFLMockClient(MockAPIClient):
         response = self.get(url)
         data = response.json()
         # The response contains {"players": [array_of_players]}, so extract just the players array
-        return data.get("players", [])
+        return select_records(data.get("players", []), limit, offset, fields)
+    
+    # Streaming iterators: yield one record at a time instead of building a list
+    
+    def iter_players(self, league: str = "NFL", position: Optional[str] = None, team_id: Optional[str] = None,
+                     limit: Optional[int] = None, offset: int = 0,
+                     fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over players in a league, optionally filtered by position and team.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            position: Optional player position to filter by (e.g., "QB")
+            team_id: Optional team identifier; only used together with position,
+                like get_players_by_position()
+            limit: Maximum number of players to yield (default: all)
+            offset: Number of players to skip (default: 0)
+            fields: Only include these fields in each player (default: all fields)
+            
+        Returns:
+            Iterator over player dictionaries
+            
+        Raises:
+            RequestNotFoundError: If team_id is given but is not part of the league
+        """
+        if position:
+            players = self._position_players(position, team_id, league)
+        else:
+            players = self.get_all_players(league)
+        return iter_records(players, limit, offset, fields)
+    
+    def iter_games(self, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                   fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all games in a league.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            limit: Maximum number of games to yield (default: all)
+            offset: Number of games to skip (default: 0)
+            fields: Only include these fields in each game (default: all fields)
+            
+        Returns:
+            Iterator over game dictionaries
+        """
+        return iter_records(self.get_all_games(league), limit, offset, fields)
+    
+    def iter_team_games(self, team_id: str, league: str = "NFL", limit: Optional[int] = None, offset: int = 0,
+                        fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all games for a specific team.
+        
+        Args:
+            team_id: Team identifier
+            league: League identifier (default: "NFL")
+            limit: Maximum number of games to yield (default: all)
+            offset: Number of games to skip (default: 0)
+            fields: Only include these fields in each game (default: all fields)
+            
+        Returns:
+            Iterator over game dictionaries
+        """
+        return iter_records(self.get_team_games(team_id, league), limit, offset, fields)
     
     # Convenience methods for filtering and searching
     
+    def team_index(self, league: str = "NFL") -> TeamIndex:
+        """
+        Get the name / market / abbreviation index over a league's teams.
+        
+        Like the other indexes, it is built on first use and reused until the
+        loaded cassettes change.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            TeamIndex for the league's teams
+        """
+        return self.derived(('team_index', league), lambda: TeamIndex(self.get_teams(league)))
+    
+    def position_index(self, league: str = "NFL") -> PositionIndex:
+        """
+        Get the position and team+position index over a league's players.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            PositionIndex built from the league roster
+        """
+        return self.derived(('position_index', league), lambda: PositionIndex(self.get_all_players(league)))
+    
+    def matchup_index(self, league: str = "NFL") -> MatchupIndex:
+        """
+        Get the team pair index over a league's games.
+        
+        The index covers the league games list plus every recorded team
+        schedule, which can reach further back than the league list.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            MatchupIndex over all known games
+        """
+        def build() -> MatchupIndex:
+            games = list(self.get_all_games(league))
+            for schedule in self.recorded_schedules(league).values():
+                games.extend(schedule)
+            return MatchupIndex(games)
+        return self.derived(('matchup_index', league), build)
+    
+    def recorded_schedules(self, league: str = "NFL") -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the schedule of every team whose games endpoint has a recording.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            Dictionary mapping team ids to their recorded game lists
+        """
+        def build() -> Dict[str, List[Dict[str, Any]]]:
+            schedules = {}
+            for team in self.get_teams(league):
+                url = f"{self.base_url}/v1/leagues/{league}/teams/{team['id']}/games"
+                if self.has_recording(url):
+                    schedules[team['id']] = self.get_team_games(team['id'], league)
+            return schedules
+        return self.derived(('recorded_schedules', league), build)
+    
     def find_team_by_name(self, team_name: str, league: str = "NFL") -> Optional[Dict[str, Any]]:
         """
         Find a team by name or market.
         
+        Exact name, market or abbreviation matches are preferred; otherwise the
+        first team whose name or market contains team_name is returned.
+        
         Args:
             team_name: Team name or market to search for
             league: League identifier (default: "NFL")
@@ -487,47 +1264,61 @@ class NFLMockClient(MockAPIClient):
         Returns:
             Team dictionary if found, None otherwise
         """
-        teams = self.get_teams(league)
-        team_name_lower = team_name.lower()
+        return self.team_index(league).find(team_name)
+    
+    def player_name_index(self, league: str = "NFL") -> PlayerNameIndex:
+        """
+        Get the name index over a league's players.
+        
+        The index is built on first use and reused until the loaded cassettes change.
         
-        for team in teams:
-            if (team_name_lower in team.get('name', '').lower() or
-                team_name_lower in team.get('market', '').lower() or
-                team_name_lower == team.get('abbreviation', '').lower()):
-                return team
-        return None
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            PlayerNameIndex for the league's players
+        """
+        return self.derived(('player_name_index', league), lambda: PlayerNameIndex(self.get_all_players(league)))
     
-    def find_player_by_name(self, player_name: str, league: str = "NFL") -> List[Dict[str, Any]]:
+    def find_player_by_name(self, player_name: str, league: str = "NFL",
+                            limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Find players by name (supports partial matching).
         
+        A player matches when the name appears anywhere in their first, last or
+        full name. Results are ranked best match first (see PlayerNameIndex.search).
+        
         Args:
             player_name: Player name to search for
             league: League identifier (default: "NFL")
+            limit: Maximum number of players to return (default: all matches)
             
         Returns:
             List of matching player dictionaries
         """
-        players = self.get_all_players(league)
-        player_name_lower = player_name.lower()
+        return self.player_name_index(league).search(player_name, limit)
+    
+    def autocomplete_players(self, prefix: str, league: str = "NFL", limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Suggest players whose first, last or full name starts with a prefix.
         
-        matching_players = []
-        for player in players:
-            first_name = player.get('first_name', '').lower()
-            last_name = player.get('last_name', '').lower()
-            full_name = f"{first_name} {last_name}".strip()
+        Args:
+            prefix: Text typed so far
+            league: League identifier (default: "NFL")
+            limit: Maximum number of suggestions (default: 10)
             
-            if (player_name_lower in first_name or
-                player_name_lower in last_name or
-                player_name_lower in full_name):
-                matching_players.append(player)
-        
-        return matching_players
+        Returns:
+            List of player dictionaries, ordered by last name then first name
+        """
+        return self.player_name_index(league).autocomplete(prefix, limit)
     
     def get_games_between_teams(self, team1_id: str, team2_id: str, league: str = "NFL") -> List[Dict[str, Any]]:
         """
         Get all games between two specific teams.
         
+        Home and away are interchangeable: games are found whichever team was
+        at home, across the league games list and all recorded team schedules.
+        
         Args:
             team1_id: First team identifier
             team2_id: Second team identifier
@@ -536,39 +1327,56 @@ class NFLMockClient(MockAPIClient):
         Returns:
             List of game dictionaries
         """
-        # Get games for team1 and filter for games against team2
-        team1_games = self.get_team_games(team1_id, league)
-        
-        matching_games = []
-        for game in team1_games:
-            home_team_id = game.get('home_team', {}).get('id')
-            away_team_id = game.get('away_team', {}).get('id')
-            
-            if ((home_team_id == team1_id and away_team_id == team2_id) or
-                (home_team_id == team2_id and away_team_id == team1_id)):
-                matching_games.append(game)
-        
-        return matching_games
+        return self.matchup_index(league).games(team1_id, team2_id)
     
-    def get_players_by_position(self, position: str, team_id: Optional[str] = None, league: str = "NFL") -> List[Dict[str, Any]]:
+    def get_players_by_position(self, position: str, team_id: Optional[str] = None, league: str = "NFL",
+                                limit: Optional[int] = None, offset: int = 0,
+                                fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Get players by position, optionally filtered by team.
         
+        Both filters are answered from the league roster's position index.
+        
         Args:
             position: Player position (e.g., "QB", "RB", "WR")
             team_id: Optional team identifier to filter by
             league: League identifier (default: "NFL")
+            limit: Maximum number of players to return (default: all)
+            offset: Number of matching players to skip (default: 0)
+            fields: Only include these fields in each player (default: all fields)
             
         Returns:
             List of player dictionaries
+            
+        Raises:
+            RequestNotFoundError: If team_id is given but is not part of the league
         """
-        if team_id:
-            players = self.get_team_players(team_id, league)
-        else:
-            players = self.get_all_players(league)
+        players = self._position_players(position, team_id, league)
+        return select_records(players, limit, offset, fields)
+    
+    def _position_players(self, position: str, team_id: Optional[str], league: str) -> List[Dict[str, Any]]:
+        # An unknown team has no players at any position; report it rather than answering []
+        if team_id and self.team_index(league).get(team_id) is None:
+            raise RequestNotFoundError(f"No team {team_id} in league {league}")
+        return self.position_index(league).players(position, team_id)
+    
+    def league_statistics(self, league: str = "NFL") -> LeagueStats:
+        """
+        Get the precomputed statistics for every team in a league.
         
-        position_upper = position.upper()
-        return [p for p in players if p.get('position', '').upper() == position_upper]
+        The statistics are computed in one pass on first use and reused until
+        the loaded cassettes change. Teams with a recorded schedule are counted
+        from it; other teams from the league games list.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            LeagueStats for the league
+        """
+        return self.derived(('league_statistics', league), lambda: LeagueStats(
+            league, self.get_teams(league), self.get_all_players(league),
+            self.get_all_games(league), self.recorded_schedules(league)))
     
     def get_team_statistics(self, team_id: str, league: str = "NFL") -> Dict[str, Any]:
         """
@@ -580,27 +1388,24 @@ class NFLMockClient(MockAPIClient):
             
         Returns:
             Dictionary with team stats including player count, games count, etc.
+            
+        Raises:
+            RequestNotFoundError: If the team is not part of the league
+        """
+        stats = self.league_statistics(league).team(team_id)
+        if stats is None:
+            raise RequestNotFoundError(f"No team {team_id} in league {league}")
+        return stats
+    
+    def get_league_statistics(self, league: str = "NFL") -> Dict[str, Any]:
+        """
+        Get league-wide statistics with a per-team breakdown.
+        
+        Args:
+            league: League identifier (default: "NFL")
+            
+        Returns:
+            Dictionary with league totals, players by position, games by status
+            and a summary entry for every team
         """
-        team = self.get_team(team_id, league)
-        players = self.get_team_players(team_id, league)
-        games = self.get_team_games(team_id, league)
-        
-        # Count players by position
-        position_counts = {}
-        for player in players:
-            pos = player.get('position', 'Unknown')
-            position_counts[pos] = position_counts.get(pos, 0) + 1
-        
-        # Count games by status
-        game_status_counts = {}
-        for game in games:
-            status = game.get('status', 'Unknown')
-            game_status_counts[status] = game_status_counts.get(status, 0) + 1
-        
-        return {
-            'team_info': team,
-            'total_players': len(players),
-            'total_games': len(games),
-            'players_by_position': position_counts,
-            'games_by_status': game_status_counts
-        }
+        return self.league_statistics(league).summary()
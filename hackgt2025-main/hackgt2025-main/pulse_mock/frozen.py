@@ -0,0 +1,101 @@
+"""
+Read-only JSON containers for decoded response bodies.
+
+Decoded cassette bodies are cached and shared between every caller, so they
+are handed out as FrozenDict / FrozenList instances. These are real ``dict``
+and ``list`` subclasses - they serialize with ``json`` and ``jsonify``, and
+``isinstance`` checks keep working - but every in-place mutation raises
+TypeError. Callers that need to modify data take a mutable copy first:
+
+    players = client.get_all_players()
+    players.append(...)             # TypeError
+    players = players.copy()        # plain list (shallow)
+    players = copy.deepcopy(players)  # plain lists/dicts all the way down
+"""
+
+import copy
+from typing import Any
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(
+        f"{type(self).__name__} is a shared, read-only response body; "
+        f"use .copy() or copy.deepcopy() to get a mutable copy"
+    )
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified in place."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def copy(self) -> dict:
+        """Return a shallow, mutable copy as a plain dict."""
+        return dict(self)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+    def __deepcopy__(self, memo) -> dict:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+class FrozenList(list):
+    """A list that cannot be modified in place."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    clear = _read_only
+    sort = _read_only
+    reverse = _read_only
+
+    def copy(self) -> list:
+        """Return a shallow, mutable copy as a plain list."""
+        return list(self)
+
+    def __reduce__(self):
+        return (type(self), (list(self),))
+
+    def __deepcopy__(self, memo) -> list:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list.__repr__(self)})"
+
+
+def freeze_json(value: Any) -> Any:
+    """
+    Recursively convert decoded JSON into read-only containers.
+
+    Args:
+        value: Result of json.loads()
+
+    Returns:
+        The same data with every dict and list replaced by FrozenDict / FrozenList
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze_json(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze_json(item) for item in value)
+    return value
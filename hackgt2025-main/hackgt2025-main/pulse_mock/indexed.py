@@ -0,0 +1,203 @@
+"""
+Indexed, memory-mapped cassette files.
+
+A VCR YAML cassette has to be parsed as a whole before any of its responses
+can be served - for the league-wide players cassette that means reading and
+holding two megabytes to answer a request for one player. An indexed cassette
+(``.pulse``) stores the same interactions as a small header, which indexes
+every recorded request, followed by the raw response bodies:
+
+    magic      8 bytes   b'PULSEIDX'
+    version    uint32    little-endian
+    header     uint32    length of the header in bytes
+    header     JSON      {"interactions": [[method, url, status, headers,
+                                            etag, offset, length], ...]}
+    bodies     bytes     UTF-8 response bodies; offsets are relative to here
+
+Opening a file parses only the header and maps the file with mmap. Each
+body stays on disk (in the page cache) until a request for it is served, and
+then only that slice of the mapping is read. Entity tags are stored in the
+header, so conditional requests never touch the body at all.
+
+MockAPIClient picks the reader by file extension: ``.pulse`` files are opened
+with open_cassette(), ``.yaml``/``.yml`` files are parsed as before. Convert
+cassettes with:
+
+    python -m pulse_mock.indexed pulse_mock/cassettes/*.yaml
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .client import INDEXED_EXTENSION, _yaml_loader
+from .exceptions import InvalidCassetteError
+from .payload import Payload
+from .store import Headers, Interaction
+
+if TYPE_CHECKING:
+    from .shared import SharedBody
+
+MAGIC = b'PULSEIDX'
+FORMAT_VERSION = 1
+
+# magic, version, header length
+_PREAMBLE = struct.Struct('<8sII')
+
+
+def write_cassette(path: str, interactions: List[Interaction]) -> int:
+    """
+    Write interactions to an indexed cassette file.
+
+    Identical bodies are written once. The file is written to a temporary
+    name and renamed into place, so readers never see a partial file.
+
+    Args:
+        path: Destination file
+        interactions: Interactions to store, in recording order
+
+    Returns:
+        Size of the written file in bytes
+    """
+    entries = []
+    bodies: List[bytes] = []
+    offsets: Dict[bytes, Tuple[int, int]] = {}
+    size = 0
+    for interaction in interactions:
+        body = interaction.body if isinstance(interaction.body, str) else interaction.body.text()
+        data = body.encode('utf-8')
+        if data not in offsets:
+            offsets[data] = (size, len(data))
+            bodies.append(data)
+            size += len(data)
+        offset, length = offsets[data]
+        entries.append([interaction.method, interaction.url, interaction.status_code,
+                        [list(header) for header in interaction.headers], Payload(data).etag, offset, length])
+
+    header = json.dumps({'interactions': entries}, separators=(',', ':')).encode('utf-8')
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for data in bodies:
+            f.write(data)
+    os.replace(temp_path, path)
+    return _PREAMBLE.size + len(header) + size
+
+
+def open_cassette(path: str) -> List[Interaction]:
+    """
+    Open an indexed cassette and get its interactions.
+
+    The bodies of the returned interactions are SharedBody slices of a
+    read-only mapping of the file; nothing but the header is read here.
+
+    Args:
+        path: Path to the indexed cassette
+
+    Returns:
+        The recorded interactions, in recording order
+
+    Raises:
+        InvalidCassetteError: If the file is not a valid indexed cassette
+    """
+    from .shared import SharedBody, SharedPayload
+
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise InvalidCassetteError(f"Truncated indexed cassette: {path}")
+        magic, version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise InvalidCassetteError(f"Not an indexed cassette: {path}")
+        if version != FORMAT_VERSION:
+            raise InvalidCassetteError(f"Unsupported indexed cassette version {version}: {path}")
+        try:
+            header = json.loads(f.read(header_length))
+            entries = header['interactions']
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCassetteError(f"Invalid indexed cassette header in {path}: {e}")
+        size = os.fstat(f.fileno()).st_size
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    start = _PREAMBLE.size + header_length
+    interactions = []
+    # Interactions recorded with the same body and response share one body object
+    bodies: Dict[Tuple[int, int, str, int], 'SharedBody'] = {}
+    for entry in entries:
+        try:
+            method, url, status_code, headers, etag, offset, length = entry
+        except (TypeError, ValueError):
+            raise InvalidCassetteError(f"Invalid indexed cassette entry in {path}: {entry!r}")
+        if not isinstance(offset, int) or not isinstance(length, int) or offset < 0 or length < 0 \
+                or start + offset + length > size:
+            raise InvalidCassetteError(f"Body of {method} {url} lies outside {path}")
+        interaction = Interaction(method, url, status_code, tuple((name, value) for name, value in headers), '')
+        key = (offset, length, interaction.content_type, status_code)
+        body = bodies.get(key)
+        if body is None:
+            body = bodies[key] = SharedBody(buffer, start + offset, length)
+            body.payload = SharedPayload(body, interaction.content_type, status_code, etag, {})
+        interaction.body = body
+        interactions.append(interaction)
+    return interactions
+
+
+def convert_cassette(source: str, destination: Optional[str] = None) -> str:
+    """
+    Convert a VCR YAML cassette to an indexed cassette.
+
+    Args:
+        source: Path to the YAML cassette
+        destination: Path of the indexed cassette (default: next to the
+            source, with the .pulse extension)
+
+    Returns:
+        Path of the written indexed cassette
+
+    Raises:
+        InvalidCassetteError: If the YAML cassette is malformed
+    """
+    import yaml
+
+    if destination is None:
+        destination = os.path.splitext(source)[0] + INDEXED_EXTENSION
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            cassette_data = yaml.load(f, Loader=_yaml_loader(yaml))
+    except yaml.YAMLError as e:
+        raise InvalidCassetteError(f"Invalid YAML in cassette {source}: {e}")
+    if not isinstance(cassette_data, dict) or 'interactions' not in cassette_data:
+        raise InvalidCassetteError(f"Invalid cassette format in {source}")
+
+    bodies: Dict[str, str] = {}
+    header_sets: Dict[Headers, Headers] = {}
+    interactions = [Interaction.from_vcr(data, bodies, header_sets)
+                    for data in cassette_data['interactions'] or []]
+    write_cassette(destination, interactions)
+    return destination
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Convert YAML cassettes from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Convert VCR YAML cassettes to indexed .pulse cassettes')
+    parser.add_argument('cassettes', nargs='+', help='YAML cassette files')
+    parser.add_argument('--output-dir', help='Directory for the indexed cassettes (default: next to each source)')
+    args = parser.parse_args(argv)
+
+    for source in args.cassettes:
+        destination = None
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            name = os.path.splitext(os.path.basename(source))[0] + INDEXED_EXTENSION
+            destination = os.path.join(args.output_dir, name)
+        destination = convert_cassette(source, destination)
+        print(f"{source} -> {destination} ({os.path.getsize(destination):,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
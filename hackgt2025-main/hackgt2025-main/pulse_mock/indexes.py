@@ -0,0 +1,200 @@
+"""
+Secondary indexes over a league's teams, players and games.
+
+Each index is built in one pass over data the client has already loaded and
+turns a list scan into a dictionary lookup. NFLMockClient builds them on first
+use and keeps them until the loaded cassettes change, so repeated lookups
+never re-fetch or re-filter the underlying lists.
+
+Lists handed out by the indexes are FrozenList instances, since they are
+shared by every caller.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .frozen import FrozenList
+
+_EMPTY = FrozenList()
+
+
+def _freeze_groups(groups: Dict[Any, List[Dict[str, Any]]]) -> Dict[Any, FrozenList]:
+    return {key: FrozenList(records) for key, records in groups.items()}
+
+
+class TeamIndex:
+    """
+    Team lookup by id, or by name, market or abbreviation.
+
+    Example:
+        index = TeamIndex(client.get_teams())
+        index.find("eagles")
+        index.get(team_id)
+    """
+
+    def __init__(self, teams: List[Dict[str, Any]]):
+        """
+        Build the index.
+
+        Args:
+            teams: Team dictionaries with name / market / abbreviation fields
+        """
+        self.teams = teams
+        self._by_id: Dict[str, Dict[str, Any]] = {team['id']: team for team in teams if team.get('id')}
+        self._exact: Dict[str, Dict[str, Any]] = {}
+        self._searchable: List[Tuple[str, str, Dict[str, Any]]] = []
+
+        for team in teams:
+            name = (team.get('name') or '').lower()
+            market = (team.get('market') or '').lower()
+            abbreviation = (team.get('abbreviation') or '').lower()
+            # The first team in list order wins, as it would in a linear scan
+            for key in (name, market, abbreviation, f"{market} {name}".strip()):
+                if key:
+                    self._exact.setdefault(key, team)
+            self._searchable.append((name, market, team))
+
+    def get(self, team_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a team by id.
+
+        Args:
+            team_id: Team identifier
+
+        Returns:
+            Team dictionary if the team is in the index, None otherwise
+        """
+        return self._by_id.get(team_id)
+
+    def find(self, team_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a team by name, market or abbreviation.
+
+        An exact (case-insensitive) match on the name, market, abbreviation or
+        "market name" is a single dictionary lookup. Otherwise the first team
+        whose name or market contains the query is returned.
+
+        Args:
+            team_name: Team name, market or abbreviation to search for
+
+        Returns:
+            Team dictionary if found, None otherwise
+        """
+        query = team_name.lower()
+        team = self._exact.get(query)
+        if team is not None:
+            return team
+
+        for name, market, team in self._searchable:
+            if query in name or query in market:
+                return team
+        return None
+
+
+class PositionIndex:
+    """
+    Player lookup by position, league-wide or within a team.
+
+    Example:
+        index = PositionIndex(client.get_all_players())
+        index.players("QB")
+        index.players("QB", team_id)
+    """
+
+    def __init__(self, players: List[Dict[str, Any]]):
+        """
+        Build the index.
+
+        Args:
+            players: Player dictionaries with position and team fields
+        """
+        by_position: Dict[str, List[Dict[str, Any]]] = {}
+        by_team_position: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        by_team: Dict[str, List[Dict[str, Any]]] = {}
+
+        for player in players:
+            position = (player.get('position') or '').upper()
+            team_id = (player.get('team') or {}).get('id')
+            by_position.setdefault(position, []).append(player)
+            if team_id:
+                by_team_position.setdefault((team_id, position), []).append(player)
+                by_team.setdefault(team_id, []).append(player)
+
+        self._by_position = _freeze_groups(by_position)
+        self._by_team_position = _freeze_groups(by_team_position)
+        self._by_team = _freeze_groups(by_team)
+
+    def players(self, position: str, team_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get players at a position, optionally restricted to one team.
+
+        Args:
+            position: Player position (case-insensitive, e.g. "QB")
+            team_id: Optional team identifier
+
+        Returns:
+            List of player dictionaries in roster order
+        """
+        position = position.upper()
+        if team_id:
+            return self._by_team_position.get((team_id, position), _EMPTY)
+        return self._by_position.get(position, _EMPTY)
+
+    def team_players(self, team_id: str) -> List[Dict[str, Any]]:
+        """
+        Get every player on a team.
+
+        Args:
+            team_id: Team identifier
+
+        Returns:
+            List of player dictionaries in roster order
+        """
+        return self._by_team.get(team_id, _EMPTY)
+
+
+class MatchupIndex:
+    """
+    Game lookup by the (unordered) pair of teams playing.
+
+    Example:
+        index = MatchupIndex(client.get_all_games())
+        index.games(team1_id, team2_id)
+    """
+
+    def __init__(self, games: Iterable[Dict[str, Any]]):
+        """
+        Build the index.
+
+        Games that appear more than once (for example in both the league and
+        a team's schedule) are indexed once, at their first occurrence.
+
+        Args:
+            games: Game dictionaries with home_team / away_team fields
+        """
+        seen = set()
+        by_pair: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+
+        for game in games:
+            game_id = game.get('id')
+            if game_id in seen:
+                continue
+            seen.add(game_id)
+            home_team_id = (game.get('home_team') or {}).get('id')
+            away_team_id = (game.get('away_team') or {}).get('id')
+            if home_team_id and away_team_id:
+                by_pair.setdefault(frozenset((home_team_id, away_team_id)), []).append(game)
+
+        self._by_pair = _freeze_groups(by_pair)
+
+    def games(self, team1_id: str, team2_id: str) -> List[Dict[str, Any]]:
+        """
+        Get all games between two teams, regardless of home and away.
+
+        Args:
+            team1_id: First team identifier
+            team2_id: Second team identifier
+
+        Returns:
+            List of game dictionaries
+        """
+        return self._by_pair.get(frozenset((team1_id, team2_id)), _EMPTY)
@@ -0,0 +1,331 @@
+"""
+Server-Sent Events fan-out for live game state.
+
+Instead of every connected device polling a game on a timer, devices open
+``/v1/leagues/<league>/games/<game_id>/stream`` once and a LiveHub pushes the
+game state to them whenever it changes. One producer thread per hub polls the
+recorded game by ETag (a string comparison per game while nothing changes),
+and anything else - a simulation, a hot-reloaded cassette - can broadcast a
+new state with LiveHub.publish().
+
+Each update is encoded as an SSE frame once and the same bytes object is
+handed to every subscriber. Subscribers each have a small bounded queue;
+when a slow client falls behind, its oldest frames are dropped (every frame
+carries the full game state, so only the newest one matters) and everyone
+else carries on.
+
+A subscription can be consumed either as a blocking iterator (Werkzeug's
+development server, one thread per client) or as an async iterator, which
+the asyncio front end (pulse_mock.aioserver) uses to hold thousands of
+subscribers on one event loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from .exceptions import RequestNotFoundError
+from .payload import Payload
+
+# Frames kept for a subscriber that has not caught up yet
+MAX_QUEUE = 8
+
+# Seconds between checks of the recorded game state
+POLL_INTERVAL = 1.0
+
+# Seconds without updates after which a comment line is sent, so that
+# proxies keep the connection open and dead clients are noticed
+HEARTBEAT_INTERVAL = 15.0
+
+HEARTBEAT_FRAME = b': keep-alive\n\n'
+
+# (league, game id) identifying a stream
+TopicKey = Tuple[str, str]
+
+
+def encode_event(data: bytes, event: str = 'message', event_id: Optional[str] = None) -> bytes:
+    """
+    Encode one Server-Sent Events frame.
+
+    Args:
+        data: Event data; multi-line data is sent as several data lines
+        event: Event type
+        event_id: Optional event id, sent back by reconnecting clients as Last-Event-ID
+
+    Returns:
+        The encoded frame, ending with a blank line
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(b'id: ' + event_id.encode('utf-8'))
+    lines.append(b'event: ' + event.encode('utf-8'))
+    lines.extend(b'data: ' + line for line in (data.splitlines() or [b'']))
+    return b'\n'.join(lines) + b'\n\n'
+
+
+class Subscription:
+    """
+    One client's view of a stream: a bounded queue of encoded frames.
+
+    Iterate it (blocking) or async-iterate it to receive frames; close() it
+    when the client goes away. Both iterators yield a heartbeat comment after
+    HEARTBEAT_INTERVAL seconds without frames.
+    """
+
+    def __init__(self, hub: 'LiveHub', key: TopicKey, max_queue: int = MAX_QUEUE):
+        """
+        Initialize the Subscription. Use LiveHub.subscribe() instead.
+
+        Args:
+            hub: Hub the subscription belongs to
+            key: (league, game id) of the stream
+            max_queue: Number of frames kept before the oldest are dropped
+        """
+        self.hub = hub
+        self.key = key
+        self.dropped = 0
+        self.closed = False
+        self._frames: Deque[bytes] = deque(maxlen=max_queue)
+        self._event = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def push(self, frame: bytes) -> None:
+        """Queue a frame, dropping the oldest one if the queue is full."""
+        if len(self._frames) == self._frames.maxlen:
+            self.dropped += 1
+        self._frames.append(frame)
+        self._event.set()
+
+    def pending(self) -> bytes:
+        """Take every queued frame, joined into one chunk."""
+        frames = []
+        while self._frames:
+            frames.append(self._frames.popleft())
+        return b''.join(frames)
+
+    def close(self) -> None:
+        """Stop receiving frames and end any iteration in progress."""
+        if not self.closed:
+            self.closed = True
+            self.hub._unsubscribe(self)
+            self._event.set()
+            if self._loop is not None:
+                self.hub._wake({self._loop: [self._ready]})
+
+    def __iter__(self) -> Iterator[bytes]:
+        while not self.closed:
+            self._event.wait(self.hub.heartbeat_interval)
+            self._event.clear()
+            chunk = self.pending()
+            if self.closed:
+                break
+            yield chunk or HEARTBEAT_FRAME
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if self._frames:
+            self._ready.set()
+        while not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), self.hub.heartbeat_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._ready.clear()
+            chunk = self.pending()
+            if self.closed:
+                break
+            yield chunk or HEARTBEAT_FRAME
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.key[0]}/{self.key[1]}, {len(self._frames)} queued, {self.dropped} dropped)"
+
+
+class _Topic:
+    """The subscribers and latest state of one stream."""
+
+    __slots__ = ('subscribers', 'frame', 'etag', 'recorded_etag')
+
+    def __init__(self):
+        self.subscribers: Set[Subscription] = set()
+        self.frame: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self.recorded_etag: Optional[str] = None
+
+
+class LiveHub:
+    """
+    Broadcasts game state changes from one producer to many subscribers.
+
+    Example:
+        hub = LiveHub(client.get_path_payload)
+        subscription = hub.subscribe('NFL', game_id)
+        for chunk in subscription:
+            ...
+        hub.publish('NFL', game_id, {'status': 'inprogress', 'home_points': 7})
+    """
+
+    def __init__(self, fetch: Callable[[str], Payload], poll_interval: float = POLL_INTERVAL,
+                 max_queue: int = MAX_QUEUE, heartbeat_interval: float = HEARTBEAT_INTERVAL):
+        """
+        Initialize the LiveHub.
+
+        Args:
+            fetch: Function returning the current Payload for an API path,
+                e.g. NFLMockClient.get_path_payload
+            poll_interval: Seconds between checks of the recorded game state
+            max_queue: Frames kept per subscriber before the oldest are dropped
+            heartbeat_interval: Seconds without frames before a heartbeat is sent
+        """
+        self.fetch = fetch
+        self.poll_interval = poll_interval
+        self.max_queue = max_queue
+        self.heartbeat_interval = heartbeat_interval
+        self._topics: Dict[TopicKey, _Topic] = {}
+        self._lock = threading.Lock()
+        self._producer: Optional[threading.Thread] = None
+
+    @staticmethod
+    def game_path(league: str, game_id: str) -> str:
+        """API path of the game a stream follows."""
+        return f'/v1/leagues/{league}/games/{game_id}'
+
+    def subscribe(self, league: str, game_id: str, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to a game's state.
+
+        The current state is queued right away, unless the client reconnects
+        with the id of the state it already has.
+
+        Args:
+            league: League identifier
+            game_id: Game identifier
+            last_event_id: Last-Event-ID sent by a reconnecting client
+
+        Returns:
+            The Subscription
+
+        Raises:
+            RequestNotFoundError: If no recording exists for the game
+        """
+        key = (league, game_id)
+        payload = self.fetch(self.game_path(league, game_id))
+        subscription = Subscription(self, key, self.max_queue)
+        with self._lock:
+            topic = self._topics.get(key)
+            if topic is None:
+                topic = self._topics[key] = _Topic()
+            if topic.recorded_etag is None:
+                topic.recorded_etag = payload.etag
+                topic.etag = payload.etag
+                topic.frame = encode_event(payload.data, 'game', payload.etag)
+            topic.subscribers.add(subscription)
+            if topic.etag != last_event_id:
+                subscription.push(topic.frame)
+            if self._producer is None:
+                self._producer = threading.Thread(target=self._run, name='pulse-mock-live', daemon=True)
+                self._producer.start()
+        return subscription
+
+    def publish(self, league: str, game_id: str, state: Any) -> int:
+        """
+        Broadcast a new game state to a stream's subscribers.
+
+        Args:
+            league: League identifier
+            game_id: Game identifier
+            state: JSON-serializable game state, or an already encoded Payload
+
+        Returns:
+            Number of subscribers the state was queued for
+        """
+        payload = state if isinstance(state, Payload) else Payload.from_json(state)
+        return self._broadcast((league, game_id), payload)
+
+    def subscriber_count(self, league: Optional[str] = None, game_id: Optional[str] = None) -> int:
+        """
+        Count subscribers, in total or for one stream.
+
+        Args:
+            league: League identifier, to count one stream only
+            game_id: Game identifier, to count one stream only
+
+        Returns:
+            Number of open subscriptions
+        """
+        with self._lock:
+            if league is not None and game_id is not None:
+                topic = self._topics.get((league, game_id))
+                return len(topic.subscribers) if topic else 0
+            return sum(len(topic.subscribers) for topic in self._topics.values())
+
+    def poll(self) -> None:
+        """Check every followed game once and broadcast the ones whose recording changed."""
+        with self._lock:
+            keys = list(self._topics)
+        for key in keys:
+            try:
+                payload = self.fetch(self.game_path(*key))
+            except RequestNotFoundError:
+                continue
+            with self._lock:
+                topic = self._topics.get(key)
+                if topic is None or topic.recorded_etag == payload.etag:
+                    continue
+                topic.recorded_etag = payload.etag
+            self._broadcast(key, payload)
+
+    def _broadcast(self, key: TopicKey, payload: Payload) -> int:
+        """Encode a state once and queue it for every subscriber of a stream."""
+        frame = encode_event(payload.data, 'game', payload.etag)
+        with self._lock:
+            topic = self._topics.get(key)
+            if topic is None:
+                return 0
+            topic.frame = frame
+            topic.etag = payload.etag
+            subscribers = list(topic.subscribers)
+
+        waiting: Dict[asyncio.AbstractEventLoop, List[asyncio.Event]] = {}
+        for subscription in subscribers:
+            subscription.push(frame)
+            if subscription._loop is not None:
+                waiting.setdefault(subscription._loop, []).append(subscription._ready)
+        self._wake(waiting)
+        return len(subscribers)
+
+    @staticmethod
+    def _wake(waiting: Dict[asyncio.AbstractEventLoop, List[asyncio.Event]]) -> None:
+        """Wake async subscribers, with one call into each event loop."""
+        for loop, events in waiting.items():
+            try:
+                loop.call_soon_threadsafe(_set_all, events)
+            except RuntimeError:
+                # The loop has been closed; its subscribers are gone
+                pass
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            topic = self._topics.get(subscription.key)
+            if topic is not None:
+                topic.subscribers.discard(subscription)
+                if not topic.subscribers:
+                    del self._topics[subscription.key]
+
+    def _run(self) -> None:
+        """Producer thread: poll the followed games until nobody is subscribed."""
+        while True:
+            time.sleep(self.poll_interval)
+            with self._lock:
+                if not self._topics:
+                    self._producer = None
+                    return
+            self.poll()
+
+
+def _set_all(events: List[asyncio.Event]) -> None:
+    for event in events:
+        event.set()
@@ -0,0 +1,101 @@
+"""
+Encoded response payloads.
+
+A Payload is a response body that is already encoded and can be written to
+the wire as-is. Recorded cassette bodies become payloads without being
+decoded, and derived results (filtered or transformed data) are encoded once
+and reused for as long as the cassettes they came from stay loaded.
+
+Each payload carries a strong ETag derived from its bytes. It is computed on
+first use and then cached with the payload, so conditional requests cost a
+string comparison rather than a hash of the body.
+
+Compressed variants (gzip and deflate) are produced on demand and kept with
+the payload as well, so a body is compressed at most once per encoding no
+matter how many requests ask for it.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Dict, Optional
+
+# Content codings a payload can be served with, mapped to zlib window bits
+# (31 = gzip container, 15 = zlib container, which is HTTP "deflate").
+SUPPORTED_ENCODINGS = {'gzip': 31, 'deflate': 15}
+
+COMPRESSION_LEVEL = 6
+
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_SIZE = 1024
+
+
+class Payload:
+    """An encoded response body together with its content type and status."""
+
+    __slots__ = ('data', 'content_type', 'status_code', '_etag', '_encoded')
+
+    def __init__(self, data: bytes, content_type: str = 'application/json', status_code: int = 200):
+        """
+        Initialize the Payload.
+
+        Args:
+            data: Encoded response body
+            content_type: Value for the Content-Type header
+            status_code: HTTP status code
+        """
+        self.data = data
+        self.content_type = content_type
+        self.status_code = status_code
+        self._etag = None
+        self._encoded: Optional[Dict[str, bytes]] = None
+
+    @classmethod
+    def from_json(cls, value: Any, status_code: int = 200) -> 'Payload':
+        """
+        Encode a JSON-serializable value as a compact application/json payload.
+
+        Args:
+            value: Data to encode
+            status_code: HTTP status code
+
+        Returns:
+            Payload containing the UTF-8 encoded JSON document
+        """
+        data = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        return cls(data, 'application/json', status_code)
+
+    @property
+    def etag(self) -> str:
+        """Strong entity tag for the payload bytes (unquoted)."""
+        if self._etag is None:
+            self._etag = hashlib.blake2b(self.data, digest_size=16).hexdigest()
+        return self._etag
+
+    def encoded(self, encoding: str) -> bytes:
+        """
+        Get the payload compressed with a content coding, compressing it only once.
+
+        The output is deterministic (gzip headers carry no timestamp), so the
+        same payload always yields identical bytes.
+
+        Args:
+            encoding: One of SUPPORTED_ENCODINGS ("gzip" or "deflate")
+
+        Returns:
+            Compressed payload bytes
+        """
+        if self._encoded is None:
+            self._encoded = {}
+        data = self._encoded.get(encoding)
+        if data is None:
+            compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, SUPPORTED_ENCODINGS[encoding])
+            data = compressor.compress(self.data) + compressor.flush()
+            self._encoded[encoding] = data
+        return data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"Payload({self.status_code}, {self.content_type!r}, {len(self.data)} bytes)"
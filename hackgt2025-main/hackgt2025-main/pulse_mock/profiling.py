@@ -0,0 +1,236 @@
+"""
+On-demand and sampled request profiling for the mock server.
+
+create_app() wraps the application in a RequestProfiler, which does nothing
+until profiling is switched on in the app config:
+
+    app = create_app()
+    app.config['PROFILING'] = True            # or: python -m pulse_mock.server --profile
+
+Then any request sent with an ``X-Profile: 1`` header or a ``profile=1``
+query parameter runs under cProfile, and the response is replaced by a JSON
+report of the request (status, duration, response size) and its top frames:
+
+    curl 'http://localhost:1339/v1/leagues/NFL/teams/<team_id>/stats?profile=1'
+
+``PROFILE_SAMPLE_EVERY = N`` additionally profiles every Nth request in the
+background; those requests get their normal response. Every report is kept
+in memory (RequestProfiler.reports, newest last) and, when ``PROFILE_DIR`` is
+set, written there as JSON together with the raw cProfile statistics
+(``.prof``, readable with pstats or snakeviz).
+
+The profile covers the whole request - routing, hooks, the view and building
+the response body - except for event streams, whose body never ends; for
+those only the call that opens the stream is profiled.
+"""
+
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs
+
+# Config keys read by RequestProfiler, with their defaults
+DEFAULT_CONFIG = {
+    # Master switch; nothing is profiled while it is off
+    'PROFILING': False,
+    # Profile every Nth request in the background (0: on demand only)
+    'PROFILE_SAMPLE_EVERY': 0,
+    # Directory to write reports to (None: keep them in memory only)
+    'PROFILE_DIR': None,
+    # Number of frames in a report
+    'PROFILE_TOP': 30,
+    # Frame order: cumulative, tottime or calls
+    'PROFILE_SORT': 'cumulative',
+}
+
+# Request header and query parameter that ask for a profile
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+
+# Reports kept in memory
+MAX_REPORTS = 100
+
+SORT_KEYS = ('cumulative', 'tottime', 'calls')
+
+# WSGI application callable
+WSGIApp = Callable[[Dict[str, Any], Callable], Iterable[bytes]]
+
+
+def _truthy(value: Optional[str]) -> bool:
+    return value is not None and value.lower() not in ('', '0', 'false', 'no', 'off')
+
+
+def top_frames(stats: pstats.Stats, limit: int = 30, sort: str = 'cumulative') -> List[Dict[str, Any]]:
+    """
+    Get the most expensive frames of a profile.
+
+    Args:
+        stats: Profile statistics
+        limit: Maximum number of frames
+        sort: Order: 'cumulative' (time including callees), 'tottime'
+            (time in the function itself) or 'calls'
+
+    Returns:
+        One dict per frame with its function, call counts and times in milliseconds
+
+    Raises:
+        ValueError: If sort is not a supported order
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Invalid sort order: {sort} (expected one of {', '.join(SORT_KEYS)})")
+    column = {'cumulative': 3, 'tottime': 2, 'calls': 1}[sort]
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+    frames = []
+    for (filename, line, name), (primitive_calls, calls, tottime, cumtime, _) in rows[:limit]:
+        frames.append({
+            'function': f'{filename}:{line}({name})' if line else name,
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'own_ms': round(tottime * 1000, 3),
+            'cumulative_ms': round(cumtime * 1000, 3),
+        })
+    return frames
+
+
+class RequestProfiler:
+    """
+    WSGI middleware that profiles requests on demand or by sampling.
+
+    Example:
+        app.wsgi_app = RequestProfiler(app.wsgi_app, app.config)
+        app.config['PROFILING'] = True
+    """
+
+    def __init__(self, wsgi_app: WSGIApp, config: Mapping[str, Any], max_reports: int = MAX_REPORTS):
+        """
+        Initialize the RequestProfiler.
+
+        Args:
+            wsgi_app: WSGI application to wrap
+            config: Configuration read on every request (normally the Flask
+                app config), so that profiling can be switched at run time;
+                see DEFAULT_CONFIG for the keys
+            max_reports: Number of reports kept in memory
+        """
+        self.wsgi_app = wsgi_app
+        self.config = config
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self._requests = itertools.count(1)
+        # One profile at a time: cProfile cannot always run in several threads at once
+        self._lock = threading.Lock()
+
+    def _setting(self, name: str) -> Any:
+        return self.config.get(name, DEFAULT_CONFIG[name])
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if not self._setting('PROFILING'):
+            return self.wsgi_app(environ, start_response)
+
+        if self.requested(environ):
+            with self._lock:
+                return self._profile(environ, start_response, sampled=False)
+
+        every = self._setting('PROFILE_SAMPLE_EVERY')
+        if every and next(self._requests) % every == 0 and self._lock.acquire(blocking=False):
+            try:
+                return self._profile(environ, start_response, sampled=True)
+            finally:
+                self._lock.release()
+        return self.wsgi_app(environ, start_response)
+
+    @staticmethod
+    def requested(environ: Dict[str, Any]) -> bool:
+        """Check whether a request asked to be profiled by header or query parameter."""
+        if _truthy(environ.get(PROFILE_HEADER)):
+            return True
+        query = environ.get('QUERY_STRING', '')
+        if PROFILE_PARAM not in query:
+            return False
+        values = parse_qs(query, keep_blank_values=True).get(PROFILE_PARAM)
+        return values is not None and _truthy(values[-1] or '1')
+
+    def _profile(self, environ: Dict[str, Any], start_response: Callable, sampled: bool) -> Iterable[bytes]:
+        """Run one request under the profiler and report or pass on its response."""
+        captured: List[Any] = [None, None, None]
+
+        def capture(status: str, headers: List[Tuple[str, str]], exc_info=None):
+            captured[0], captured[1], captured[2] = status, headers, exc_info
+            return body.append
+
+        body: List[bytes] = []
+        streaming = False
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            result = self.wsgi_app(environ, capture)
+            streaming = any(name.lower() == 'content-type' and value.startswith('text/event-stream')
+                            for name, value in captured[1] or ())
+            if not streaming:
+                try:
+                    body.extend(result)
+                finally:
+                    if hasattr(result, 'close'):
+                        result.close()
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - start
+
+        report = self._report(environ, captured[0], b''.join(body) if not streaming else None,
+                              duration, profiler, sampled)
+        self.reports.append(report)
+        directory = self._setting('PROFILE_DIR')
+        if directory:
+            report['files'] = self._write(directory, report, profiler)
+
+        if sampled or streaming:
+            # Pass the response on as the application produced it
+            write = start_response(captured[0], captured[1], captured[2])
+            if streaming:
+                for chunk in body:
+                    write(chunk)
+                return result
+            return body
+
+        data = json.dumps(report, indent=2).encode('utf-8')
+        start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(data))),
+                                  ('Cache-Control', 'no-store')])
+        return [data]
+
+    def _report(self, environ: Dict[str, Any], status: Optional[str], body: Optional[bytes],
+                duration: float, profiler: cProfile.Profile, sampled: bool) -> Dict[str, Any]:
+        """Build the JSON-serializable report of one profiled request."""
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        return {
+            'method': environ.get('REQUEST_METHOD'),
+            'path': environ.get('PATH_INFO'),
+            'query': environ.get('QUERY_STRING', ''),
+            'status': int(status.split(' ', 1)[0]) if status else None,
+            'response_bytes': len(body) if body is not None else None,
+            'duration_ms': round(duration * 1000, 3),
+            'sampled': sampled,
+            'timestamp': time.time(),
+            'total_calls': stats.total_calls,
+            'frames': top_frames(stats, self._setting('PROFILE_TOP'), self._setting('PROFILE_SORT')),
+        }
+
+    @staticmethod
+    def _write(directory: str, report: Dict[str, Any], profiler: cProfile.Profile) -> List[str]:
+        """Write a report and its raw statistics to a directory and return the file paths."""
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', report['path'] or '').strip('_')[:80] or 'root'
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(report['timestamp']))
+        base = os.path.join(directory, f"{stamp}-{int(report['timestamp'] * 1e6) % 1000000:06d}-"
+                                       f"{report['method']}-{slug}")
+        profiler.dump_stats(base + '.prof')
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return [base + '.json', base + '.prof']
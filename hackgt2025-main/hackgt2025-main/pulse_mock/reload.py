@@ -0,0 +1,151 @@
+"""
+Hot reload of cassettes that change on disk.
+
+A CassetteWatcher polls a client's cassette directory: every interval it
+stats the cassette files (one scandir, no file is opened) and compares their
+modification times and sizes with the previous poll. Then, for each change:
+
+    * a loaded cassette that changed is re-read and swapped in with
+      MockAPIClient.reload_cassette(), which replaces only its interactions,
+      its index entries and the derived values built from its URLs
+    * a deleted cassette (or a YAML cassette superseded by a new indexed
+      one) is unloaded
+    * a new cassette is loaded, or only added to the manifest for clients
+      that load cassettes on demand
+
+Unchanged files are never read again. Requests keep being served from the
+current snapshot while a changed file is parsed. Live game streams (see
+pulse_mock.live) pick up reloaded games on their next poll, since their
+payloads get new ETags.
+
+Usage:
+    watcher = CassetteWatcher(client, interval=1.0)
+    watcher.start()
+
+or ``python -m pulse_mock.server --watch``.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .client import CASSETTE_EXTENSIONS, MockAPIClient
+from .exceptions import CassetteNotFoundError, InvalidCassetteError
+
+# Seconds between polls of the cassette directory
+POLL_INTERVAL = 1.0
+
+# (mtime in nanoseconds, size in bytes) of a cassette file
+FileSignature = Tuple[int, int]
+
+
+class CassetteWatcher:
+    """
+    Polls a client's cassette directory and hot-reloads the cassettes that change.
+
+    Example:
+        watcher = CassetteWatcher(client)
+        watcher.start()
+        ...
+        watcher.stop()
+    """
+
+    def __init__(self, client: MockAPIClient, interval: float = POLL_INTERVAL, load_new: bool = True):
+        """
+        Initialize the CassetteWatcher. The current files are taken as the
+        starting point; only later changes are acted upon.
+
+        Args:
+            client: Client whose cassette directory is watched
+            interval: Seconds between polls
+            load_new: Load cassettes that appear in the directory; if False they
+                are only added to the manifest, for clients that load on demand
+        """
+        self.client = client
+        self.interval = interval
+        self.load_new = load_new
+        self._signatures = self.scan()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def scan(self) -> Dict[str, FileSignature]:
+        """Get the signature of every cassette file in the directory."""
+        signatures = {}
+        try:
+            with os.scandir(self.client.cassette_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(CASSETTE_EXTENSIONS):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return signatures
+
+    def poll(self) -> Dict[str, List[str]]:
+        """
+        Check the directory once and apply the changes.
+
+        A cassette that fails to load keeps its previous version (if any) and
+        is tried again when its file changes next.
+
+        Returns:
+            Cassette filenames by what happened to them: 'reloaded', 'loaded',
+            'unloaded', and 'failed'
+        """
+        previous, current = self._signatures, self.scan()
+        self._signatures = current
+        result: Dict[str, List[str]] = {'reloaded': [], 'loaded': [], 'unloaded': [], 'failed': []}
+        changed = [name for name, signature in current.items() if previous.get(name) != signature]
+        if not changed and previous.keys() == current.keys():
+            return result
+
+        client = self.client
+        available = set(client.rediscover_cassettes())
+        loaded = set(client.loaded_cassettes)
+        # Deleted or superseded cassettes leave the store and the manifest
+        for name in sorted((previous.keys() | loaded) - available):
+            client.unload_cassette(name)
+            if name in loaded:
+                result['unloaded'].append(name)
+
+        for name in sorted(changed):
+            if name not in available:
+                continue
+            try:
+                if name in loaded:
+                    client.reload_cassette(name)
+                    result['reloaded'].append(name)
+                elif self.load_new:
+                    client.load_cassette(name)
+                    result['loaded'].append(name)
+                else:
+                    client.reload_cassette(name)
+            except (CassetteNotFoundError, InvalidCassetteError) as e:
+                print(f"Warning: Could not reload cassette {name}: {e}")
+                result['failed'].append(name)
+        return result
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='pulse-mock-watcher', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                # Keep watching; the next poll starts from the files as they are now
+                print(f"Warning: Cassette watcher poll failed: {e}")
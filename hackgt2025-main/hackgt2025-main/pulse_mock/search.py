@@ -0,0 +1,200 @@
+"""
+Name index for fast, ranked player search and autocomplete.
+
+PlayerNameIndex is built once per loaded players list and answers two kinds
+of queries without scanning the roster:
+
+    * search(): substring matches (the same matches as a case-insensitive
+      ``query in "first last"`` check), ranked best first. Candidates come
+      from n-gram postings, so only players sharing every trigram of the
+      query are ever looked at.
+    * autocomplete(): prefix matches on first name, last name or full name,
+      answered by walking a prefix trie whose nodes already hold their
+      players in rank order, so the top-k results are a slice. Small subtrees
+      are collapsed into leaf buckets (a burst trie) to keep the index compact.
+"""
+
+import heapq
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Postings are kept for every n-gram up to this length, so queries of up to
+# this many characters are answered from a single posting list.
+MAX_GRAM = 3
+
+# Each trie node keeps at most this many players; autocomplete requests for
+# more suggestions than this are capped.
+MAX_SUGGESTIONS = 50
+
+# Subtrees with at most this many (token, player) entries become leaf buckets
+# that are filtered with startswith() instead of being expanded further.
+BUCKET_SIZE = 16
+
+# Rank tiers for search() results (lower is better)
+_EXACT, _FULL_PREFIX, _WORD_PREFIX, _SUBSTRING = range(4)
+
+
+class _TrieNode:
+    __slots__ = ('children', 'ids', 'bucket')
+
+    def __init__(self, entries: List[Tuple[str, int]], depth: int = 0):
+        """
+        Build a (sub)trie from (token, player id) entries given in rank order.
+
+        Args:
+            entries: Entries whose tokens share the first ``depth`` characters
+            depth: Length of the prefix this node represents
+        """
+        self.ids = _unique_ids(entries, MAX_SUGGESTIONS)
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.bucket: Optional[List[Tuple[str, int]]] = None
+
+        if len(entries) <= BUCKET_SIZE:
+            self.bucket = entries
+            return
+
+        groups: Dict[str, List[Tuple[str, int]]] = {}
+        for entry in entries:
+            if len(entry[0]) > depth:
+                groups.setdefault(entry[0][depth], []).append(entry)
+        for char, group in groups.items():
+            self.children[char] = _TrieNode(group, depth + 1)
+
+
+def _unique_ids(entries: List[Tuple[str, int]], limit: int) -> List[int]:
+    """Return the distinct player ids of entries, in order, up to limit."""
+    seen: Set[int] = set()
+    ids = []
+    for _, player_id in entries:
+        if player_id not in seen:
+            seen.add(player_id)
+            ids.append(player_id)
+            if len(ids) >= limit:
+                break
+    return ids
+
+
+class PlayerNameIndex:
+    """
+    Prefix trie plus n-gram postings over player names.
+
+    Example:
+        index = PlayerNameIndex(client.get_all_players())
+        index.search("hurt", limit=5)
+        index.autocomplete("ja", limit=10)
+    """
+
+    def __init__(self, players: List[Dict[str, Any]]):
+        """
+        Build the index.
+
+        Args:
+            players: Player dictionaries with first_name / last_name fields
+        """
+        self.players = players
+        self._full_names: List[str] = []
+        self._last_names: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for player_id, player in enumerate(players):
+            first_name = (player.get('first_name') or '').lower()
+            last_name = (player.get('last_name') or '').lower()
+            full_name = f"{first_name} {last_name}".strip()
+            self._full_names.append(full_name)
+            self._last_names.append(last_name)
+
+            # Player ids are visited in increasing order, so each posting list
+            # stays sorted and a duplicate can only be its last element.
+            for n in range(1, MAX_GRAM + 1):
+                for start in range(len(full_name) - n + 1):
+                    posting = self._postings.setdefault(full_name[start:start + n], [])
+                    if not posting or posting[-1] != player_id:
+                        posting.append(player_id)
+
+        # Build the trie from entries in rank order (last name, then first name),
+        # so each node's ids are already sorted for autocomplete.
+        order = sorted(range(len(players)), key=lambda i: (self._last_names[i], self._full_names[i]))
+        entries = [
+            (token, player_id)
+            for player_id in order
+            for token in dict.fromkeys([self._full_names[player_id], *self._full_names[player_id].split()])
+        ]
+        self._trie = _TrieNode(entries)
+
+    def _rank(self, player_id: int, query: str) -> tuple:
+        full_name = self._full_names[player_id]
+        if full_name == query:
+            tier = _EXACT
+        elif full_name.startswith(query):
+            tier = _FULL_PREFIX
+        elif self._last_names[player_id].startswith(query) or f" {query}" in full_name:
+            tier = _WORD_PREFIX
+        else:
+            tier = _SUBSTRING
+        return (tier, len(full_name), self._last_names[player_id], full_name, player_id)
+
+    def _candidates(self, query: str) -> List[int]:
+        if len(query) <= MAX_GRAM:
+            return self._postings.get(query, [])
+
+        grams = {query[i:i + MAX_GRAM] for i in range(len(query) - MAX_GRAM + 1)}
+        postings = sorted((self._postings.get(gram, []) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return [i for i in candidates if query in self._full_names[i]]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find players whose name contains the query, best matches first.
+
+        Matches are ranked: exact full name, then full names starting with the
+        query, then a last name (or any name word) starting with it, then any
+        other substring match; shorter names rank higher within a tier.
+
+        Args:
+            query: Text to search for (case-insensitive)
+            limit: Maximum number of players to return (default: all matches)
+
+        Returns:
+            List of matching player dictionaries
+        """
+        query = query.lower()
+        if not query:
+            return list(self.players if limit is None else self.players[:limit])
+
+        candidates = self._candidates(query)
+        if limit is None:
+            ranked = sorted(candidates, key=lambda i: self._rank(i, query))
+        else:
+            ranked = heapq.nsmallest(limit, candidates, key=lambda i: self._rank(i, query))
+        return [self.players[i] for i in ranked]
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Suggest players whose first, last or full name starts with a prefix.
+
+        Suggestions are ordered by last name, then first name.
+
+        Args:
+            prefix: Text typed so far (case-insensitive)
+            limit: Maximum number of suggestions (capped at MAX_SUGGESTIONS)
+
+        Returns:
+            List of player dictionaries
+        """
+        prefix = prefix.lower().lstrip()
+        if not prefix or limit <= 0:
+            return []
+
+        node = self._trie
+        for char in prefix:
+            if node.bucket is not None:
+                # Leaf bucket: filter the remaining entries directly
+                matching = [entry for entry in node.bucket if entry[0].startswith(prefix)]
+                return [self.players[i] for i in _unique_ids(matching, min(limit, MAX_SUGGESTIONS))]
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.players[i] for i in node.ids[:limit]]
@@ -12,22 +12,168 @@ Usage:
 
 Or run directly:
     python -m pulse_mock.server
+
+Add ``--server asyncio`` to serve from an asyncio event loop with keep-alive
+instead of Werkzeug's development server (see pulse_mock.aioserver), and
+``--profile`` to profile requests sent with ``X-Profile: 1`` or ``?profile=1``
+(see pulse_mock.profiling). With ``--watch``, cassettes that change on disk
+are reloaded while the server runs (see pulse_mock.reload).
 """
 
-from flask import Flask, jsonify, request
-from typing import Dict, Any, Optional
+from flask import Flask, Response, g, jsonify, request
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+import json
+import time
 import traceback
 
-from .client import NFLMockClient
+from .client import IGNORED_QUERY_PARAMS, NFLMockClient, canonical_query, select_records
 from .exceptions import CassetteNotFoundError, RequestNotFoundError, InvalidCassetteError
+from .payload import MIN_COMPRESS_SIZE, SUPPORTED_ENCODINGS, Payload
+from .aioserver import serve_asyncio
+from .live import LiveHub
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, RequestMetrics
+from .profiling import DEFAULT_CONFIG as PROFILING_CONFIG, RequestProfiler
+from .search import MAX_SUGGESTIONS
+from .reload import CassetteWatcher
+from .shared import SharedCassetteStore, serve_prefork
+
+
+def parse_list_params(args) -> Optional[Dict[str, Any]]:
+    """
+    Parse the pagination and projection query parameters shared by list endpoints.
+    
+    Supported parameters are ``limit``, ``offset`` and ``fields`` (a
+    comma-separated list of top-level fields to keep in each record).
+    
+    Args:
+        args: Request query arguments
+        
+    Returns:
+        Keyword arguments for select_records(), or None if none were given
+        
+    Raises:
+        ValueError: If a parameter is malformed
+    """
+    if not any(name in args for name in ('limit', 'offset', 'fields')):
+        return None
+    
+    params: Dict[str, Any] = {'limit': None, 'offset': 0, 'fields': None}
+    for name in ('limit', 'offset'):
+        value = args.get(name)
+        if value is None or value == '':
+            continue
+        try:
+            params[name] = int(value)
+        except ValueError:
+            raise ValueError(f"Invalid parameter: {name} must be an integer")
+        if params[name] < 0:
+            raise ValueError(f"Invalid parameter: {name} must be non-negative")
+    
+    fields = args.get('fields')
+    if fields:
+        params['fields'] = [field.strip() for field in fields.split(',') if field.strip()]
+    return params
+
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def _unwrap_players(body: Any) -> Any:
+    # Recorded as {"players": [...], "pagination": {...}}; the route serves the list
+    return body.get('players', []) if isinstance(body, dict) else body
 
 
-def create_app(cassette_dir: Optional[str] = None) -> Flask:
+# Endpoints that answer a recorded query string straight from its recording,
+# with the function that turns the recorded body into the route's response
+# (None: the body is sent as recorded). Other endpoints compute their
+# response from the recorded data whatever the query.
+RECORDED_QUERY_ENDPOINTS: Dict[str, Optional[Callable[[Any], Any]]] = {
+    'get_leagues': None,
+    'get_teams': None,
+    'get_team': None,
+    'get_team_players': None,
+    'get_team_games': None,
+    'get_players': _unwrap_players,
+    'get_player': None,
+    'get_games': None,
+    'get_game': None,
+}
+
+
+def players_payload(client: NFLMockClient, league: str) -> Payload:
+    """
+    Get the encoded players list of a league.
+
+    The recorded body wraps the list as {"players": [...]}; the unwrapped list
+    is encoded once and reused until the cassettes change.
+    """
+    return client.derived_payload(('players', league), lambda: client.get_all_players(league))
+
+
+def team_statistics_payload(client: NFLMockClient, team_id: str, league: str) -> Payload:
+    """Get the encoded statistics of a team."""
+    return client.derived_payload(('team_statistics', league, team_id),
+                                  lambda: client.get_team_statistics(team_id, league))
+
+
+def league_statistics_payload(client: NFLMockClient, league: str) -> Payload:
+    """Get the encoded league-wide statistics."""
+    return client.derived_payload(('league_statistics', league),
+                                  lambda: client.get_league_statistics(league))
+
+
+def precompute_payloads(client: NFLMockClient) -> None:
+    """
+    Build the derived payloads of every league with recorded data.
+
+    Used before forking server workers, so that the unwrapped players list and
+    the statistics are computed once and end up in the shared store instead of
+    being rebuilt in each worker.
+
+    Args:
+        client: NFLMockClient with its cassettes loaded
+    """
+    for league in client.get_leagues():
+        try:
+            players_payload(client, league['id'])
+            league_statistics_payload(client, league['id'])
+            for team in client.get_teams(league['id']):
+                team_statistics_payload(client, team['id'], league['id'])
+        except RequestNotFoundError:
+            continue
+
+
+def wants_ndjson() -> bool:
+    """Check whether the current request asked for a newline-delimited JSON stream."""
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def ndjson_lines(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode records one at a time as newline-delimited JSON."""
+    for record in records:
+        yield json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def create_app(cassette_dir: Optional[str] = None, use_cache: bool = True, lazy: bool = False,
+               shared_store: Optional[SharedCassetteStore] = None,
+               watch_interval: Optional[float] = None,
+               ignored_query_params: Iterable[str] = IGNORED_QUERY_PARAMS) -> Flask:
     """
     Create and configure the Flask application.
     
     Args:
         cassette_dir: Directory containing VCR cassette files
+        use_cache: Whether to use the compiled cassette cache for faster start-up
+        lazy: If True, load each cassette on demand (routed by the cassette
+            manifest) instead of loading all cassettes at start-up
+        shared_store: Serve from a SharedCassetteStore built by a parent
+            process instead of loading cassettes (see pulse_mock.shared)
+        watch_interval: If set, poll the cassette directory every this many
+            seconds and hot-reload the cassettes that change (see pulse_mock.reload)
+        ignored_query_params: Query parameters left out when matching a request
+            to a recording (see MockAPIClient)
         
     Returns:
         Configured Flask application
@@ -35,7 +181,128 @@ def create_app(cassette_dir: Optional[str] = None) -> Flask:
     app = Flask(__name__)
     
     # Initialize the NFLMockClient
-    client = NFLMockClient(cassette_dir=cassette_dir, auto_load_all=True)
+    client = NFLMockClient(cassette_dir=cassette_dir, auto_load_all=not lazy, use_cache=use_cache,
+                           shared_store=shared_store, ignored_query_params=ignored_query_params)
+    
+    # Live game streams; available to the application as app.extensions['live_hub']
+    # so that simulations can publish game states
+    hub = LiveHub(client.get_path_payload)
+    app.extensions['live_hub'] = hub
+    
+    # Per-route request metrics, served on /metrics
+    metrics = RequestMetrics()
+    app.extensions['metrics'] = metrics
+    
+    # Request profiling, off until app.config['PROFILING'] is set
+    app.config.from_mapping(PROFILING_CONFIG)
+    profiler = RequestProfiler(app.wsgi_app, app.config)
+    app.wsgi_app = profiler
+    app.extensions['profiler'] = profiler
+    
+    # Hot reload; the watcher is available as app.extensions['cassette_watcher']
+    if watch_interval is not None:
+        watcher = CassetteWatcher(client, interval=watch_interval, load_new=not lazy)
+        watcher.start()
+        app.extensions['cassette_watcher'] = watcher
+    
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+    
+    # Registered first so that it runs last, after the response is final
+    @app.after_request
+    def record_metrics(response: Response) -> Response:
+        start = g.get('request_start')
+        if start is not None:
+            rule = request.url_rule
+            metrics.observe(rule.rule if rule is not None else None, request.method, response.status_code,
+                            time.perf_counter() - start, response.content_length)
+        return response
+    
+    def send_payload(payload: Payload) -> Response:
+        """
+        Send an already encoded payload without decoding or re-encoding it.
+        
+        Large payloads are sent gzip- or deflate-compressed when the client
+        accepts it. Compressed variants are cached on the payload, and each
+        variant gets its own strong ETag.
+        """
+        if len(payload) < MIN_COMPRESS_SIZE:
+            response = Response(payload.data, status=payload.status_code, content_type=payload.content_type)
+            response.set_etag(payload.etag)
+            return response
+        
+        encoding = request.accept_encodings.best_match(list(SUPPORTED_ENCODINGS))
+        if encoding:
+            response = Response(payload.encoded(encoding), status=payload.status_code,
+                                content_type=payload.content_type)
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f"{payload.etag}-{encoding}")
+        else:
+            response = Response(payload.data, status=payload.status_code, content_type=payload.content_type)
+            response.set_etag(payload.etag)
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    def send_recorded(path: str) -> Response:
+        """Send the recorded response body for an API path as-is."""
+        return send_payload(client.get_path_payload(path))
+    
+    @app.before_request
+    def send_recorded_query():
+        """
+        Serve a query string that was recorded, without filtering.
+        
+        The recording is reshaped like the route reshapes its bare-path
+        recording (see RECORDED_QUERY_ENDPOINTS), so the response has the same
+        shape however the query is written. Requests whose query was not
+        recorded go on to their route, which computes the response from the
+        recorded data.
+        """
+        if (request.method not in ('GET', 'HEAD') or not request.query_string
+                or request.endpoint not in RECORDED_QUERY_ENDPOINTS or wants_ndjson()):
+            return None
+        url = f"{client.base_url}{request.full_path}"
+        payload = client.get_query_payload(url)
+        if payload is None:
+            return None
+        reshape = RECORDED_QUERY_ENDPOINTS[request.endpoint]
+        if reshape is not None:
+            query = canonical_query(request.query_string.decode('latin-1'), client.ignored_query_params)
+            payload = client.derived_payload(('recorded_query', request.endpoint, request.path, query),
+                                             lambda: reshape(client.get(url).json()))
+        return send_payload(payload)
+    
+    def send_records(records: List[Dict[str, Any]], page: Optional[Dict[str, Any]]) -> Response:
+        """Send a page of records, with the unpaginated total in X-Total-Count."""
+        if page is None:
+            return jsonify(records)
+        response = jsonify(select_records(records, **page))
+        response.headers['X-Total-Count'] = str(len(records))
+        return response
+    
+    def send_ndjson(records: Iterator[Dict[str, Any]]) -> Response:
+        """Stream records as application/x-ndjson, one line per record."""
+        return Response(ndjson_lines(records), mimetype=NDJSON_MIMETYPE)
+    
+    def bad_request(e: ValueError):
+        """Build the 400 response for a malformed query parameter."""
+        return jsonify({'error': str(e)}), 400
+    
+    @app.after_request
+    def conditional_response(response: Response) -> Response:
+        """
+        Tag successful read responses and answer If-None-Match with 304.
+        
+        Payload responses already carry their cached ETag; other responses
+        (filtered and search results) are hashed here.
+        """
+        if (request.method in ('GET', 'HEAD') and response.status_code == 200
+                and not response.is_streamed):
+            if response.get_etag()[0] is None:
+                response.add_etag()
+            response.make_conditional(request)
+        return response
     
     @app.errorhandler(RequestNotFoundError)
     def handle_request_not_found(e):
@@ -67,6 +334,16 @@ def create_app(cassette_dir: Optional[str] = None) -> Flask:
             'total_interactions': len(client.interactions)
         })
     
+    @app.route('/metrics')
+    def get_metrics():
+        """Request metrics in the Prometheus text format."""
+        text = metrics.render(client.match_counters, [
+            ('loaded_cassettes', 'Cassettes loaded by the client.', len(client.loaded_cassettes)),
+            ('interactions', 'Recorded interactions loaded by the client.', len(client.interactions)),
+            ('live_subscribers', 'Open live game stream subscriptions.', hub.subscriber_count()),
+        ])
+        return Response(text, content_type=METRICS_CONTENT_TYPE)
+    
     # API Info endpoint
     @app.route('/v1')
     def api_info():
@@ -82,13 +359,20 @@ def create_app(cassette_dir: Optional[str] = None) -> Flask:
                 'team_players': '/v1/leagues/{league}/teams/{team_id}/players',
                 'team_games': '/v1/leagues/{league}/teams/{team_id}/games',
                 'team_stats': '/v1/leagues/{league}/teams/{team_id}/stats',
+                'league_stats': '/v1/leagues/{league}/stats',
                 'players': '/v1/leagues/{league}/players',
                 'player_details': '/v1/leagues/{league}/players/{player_id}',
                 'games': '/v1/leagues/{league}/games',
                 'game_details': '/v1/leagues/{league}/games/{game_id}',
+                'game_stream': '/v1/leagues/{league}/games/{game_id}/stream (Server-Sent Events)',
+                'metrics': '/metrics (Prometheus text format)',
                 'search_teams': '/v1/leagues/{league}/teams/search?name={name}',
-                'search_players': '/v1/leagues/{league}/players/search?name={name}',
-                'filter_players': '/v1/leagues/{league}/players?position={position}&team_id={team_id}'
+                'search_players': '/v1/leagues/{league}/players/search?name={name}&limit={limit}',
+                'autocomplete_players': '/v1/leagues/{league}/players/autocomplete?q={prefix}&limit={limit}'
+                                        f'&offset={{offset}} (offset + limit <= {MAX_SUGGESTIONS})',
+                'filter_players': '/v1/leagues/{league}/players?position={position}&team_id={team_id}',
+                'paginate': '{list endpoint}?limit={limit}&offset={offset}&fields={field1,field2}',
+                'stream': '{players|games|team games endpoint}?format=ndjson (or Accept: application/x-ndjson)'
             },
             'loaded_cassettes': client.loaded_cassettes,
             'total_interactions': len(client.interactions)
@@ -98,13 +382,19 @@ def create_app(cassette_dir: Optional[str] = None) -> Flask:
     @app.route('/v1/leagues')
     def get_leagues():
         """Get all available leagues."""
-        return jsonify(client.get_leagues())
+        return send_recorded('/v1/leagues')
     
     # Team endpoints
     @app.route('/v1/leagues/<league>/teams')
     def get_teams(league: str):
-        """Get all teams in a league."""
-        return jsonify(client.get_teams(league))
+        """Get all teams in a league, with optional pagination and field projection."""
+        try:
+            page = parse_list_params(request.args)
+        except ValueError as e:
+            return bad_request(e)
+        if page is None:
+            return send_recorded(f'/v1/leagues/{league}/teams')
+        return send_records(client.get_teams(league), page)
     
     @app.route('/v1/leagues/<league>/teams/search')
     def search_teams(league: str):
@@ -122,60 +412,131 @@ def create_app(cassette_dir: Optional[str] = None) -> Flask:
     @app.route('/v1/leagues/<league>/teams/<team_id>')
     def get_team(league: str, team_id: str):
         """Get a specific team by ID."""
-        return jsonify(client.get_team(team_id, league))
+        return send_recorded(f'/v1/leagues/{league}/teams/{team_id}')
     
     @app.route('/v1/leagues/<league>/teams/<team_id>/players')
     def get_team_players(league: str, team_id: str):
         """Get all players for a specific team."""
-        return jsonify(client.get_team_players(team_id, league))
+        return send_recorded(f'/v1/leagues/{league}/teams/{team_id}/players')
     
     @app.route('/v1/leagues/<league>/teams/<team_id>/games')
     def get_team_games(league: str, team_id: str):
-        """Get all games for a specific team."""
-        return jsonify(client.get_team_games(team_id, league))
+        """Get all games for a specific team (streamed as NDJSON on request)."""
+        if wants_ndjson():
+            try:
+                page = parse_list_params(request.args) or {}
+            except ValueError as e:
+                return bad_request(e)
+            return send_ndjson(client.iter_team_games(team_id, league, **page))
+        return send_recorded(f'/v1/leagues/{league}/teams/{team_id}/games')
     
     @app.route('/v1/leagues/<league>/teams/<team_id>/stats')
     def get_team_stats(league: str, team_id: str):
         """Get statistics for a specific team."""
-        return jsonify(client.get_team_statistics(team_id, league))
+        return send_payload(team_statistics_payload(client, team_id, league))
+    
+    @app.route('/v1/leagues/<league>/stats')
+    def get_league_stats(league: str):
+        """Get league-wide statistics with a per-team breakdown."""
+        return send_payload(league_statistics_payload(client, league))
     
     # Player endpoints
     @app.route('/v1/leagues/<league>/players')
     def get_players(league: str):
-        """Get all players in a league, with optional filtering."""
+        """Get all players in a league, with optional filtering, pagination and field projection."""
         position = request.args.get('position')
         team_id = request.args.get('team_id')
+        try:
+            page = parse_list_params(request.args)
+        except ValueError as e:
+            return bad_request(e)
         
+        if wants_ndjson():
+            return send_ndjson(client.iter_players(league, position, team_id, **(page or {})))
         if position:
-            return jsonify(client.get_players_by_position(position, team_id, league))
+            return send_records(client.get_players_by_position(position, team_id, league), page)
+        elif page is not None:
+            return send_records(client.get_all_players(league), page)
         else:
-            return jsonify(client.get_all_players(league))
+            return send_payload(players_payload(client, league))
     
     @app.route('/v1/leagues/<league>/players/search')
     def search_players(league: str):
-        """Search for players by name."""
+        """Search for players by name, best matches first."""
         name = request.args.get('name')
         if not name:
             return jsonify({'error': 'Missing required parameter: name'}), 400
+        try:
+            page = parse_list_params(request.args) or {}
+        except ValueError as e:
+            return bad_request(e)
         
-        players = client.find_player_by_name(name, league)
-        return jsonify(players)
+        # The index ranks only as many matches as the requested page reaches
+        limit, offset = page.get('limit'), page.get('offset', 0)
+        players = client.find_player_by_name(name, league, limit=None if limit is None else offset + limit)
+        return jsonify(select_records(players, offset=offset, fields=page.get('fields')))
+    
+    @app.route('/v1/leagues/<league>/players/autocomplete')
+    def autocomplete_players(league: str):
+        """
+        Suggest players whose first, last or full name starts with the typed prefix.
+        
+        At most MAX_SUGGESTIONS suggestions are ranked, so a page reaching
+        past them (offset + limit) is rejected with 400.
+        """
+        prefix = request.args.get('q')
+        if not prefix:
+            return jsonify({'error': 'Missing required parameter: q'}), 400
+        try:
+            page = parse_list_params(request.args) or {}
+        except ValueError as e:
+            return bad_request(e)
+        
+        limit, offset = page.get('limit'), page.get('offset', 0)
+        end = offset + (10 if limit is None else limit)
+        if end > MAX_SUGGESTIONS:
+            return bad_request(ValueError(f"Invalid parameters: offset + limit must be at most {MAX_SUGGESTIONS}"))
+        players = client.autocomplete_players(prefix, league, limit=end)
+        return jsonify(select_records(players, offset=offset, fields=page.get('fields')))
     
     @app.route('/v1/leagues/<league>/players/<player_id>')
     def get_player(league: str, player_id: str):
         """Get a specific player by ID."""
-        return jsonify(client.get_player(player_id, league))
+        return send_recorded(f'/v1/leagues/{league}/players/{player_id}')
     
     # Game endpoints
     @app.route('/v1/leagues/<league>/games')
     def get_games(league: str):
-        """Get all games in a league."""
-        return jsonify(client.get_all_games(league))
+        """Get all games in a league, with optional pagination and field projection."""
+        try:
+            page = parse_list_params(request.args)
+        except ValueError as e:
+            return bad_request(e)
+        if wants_ndjson():
+            return send_ndjson(client.iter_games(league, **(page or {})))
+        if page is None:
+            return send_recorded(f'/v1/leagues/{league}/games')
+        return send_records(client.get_all_games(league), page)
     
     @app.route('/v1/leagues/<league>/games/<game_id>')
     def get_game(league: str, game_id: str):
         """Get a specific game by ID."""
-        return jsonify(client.get_game(game_id, league))
+        return send_recorded(f'/v1/leagues/{league}/games/{game_id}')
+    
+    @app.route('/v1/leagues/<league>/games/<game_id>/stream')
+    def stream_game(league: str, game_id: str):
+        """Stream a game's state as Server-Sent Events, starting with the current state."""
+        if request.method == 'HEAD':
+            client.get_path_payload(LiveHub.game_path(league, game_id))
+            subscription = []
+        else:
+            subscription = hub.subscribe(league, game_id, request.headers.get('Last-Event-ID'))
+        # Pass the subscription through to the server unwrapped, so that the
+        # asyncio front end can iterate it asynchronously
+        response = Response(subscription, mimetype='text/event-stream', direct_passthrough=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
     
     # Special endpoints for game relationships
     @app.route('/v1/leagues/<league>/teams/<team1_id>/vs/<team2_id>')
@@ -196,18 +557,57 @@ def main():
     parser.add_argument('--port', type=int, default=1339, help='Port to bind to (default: 1339)')
     parser.add_argument('--debug', action='store_true', help='Run in debug mode')
     parser.add_argument('--cassette-dir', help='Directory containing VCR cassette files')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always parse cassette YAML instead of using the compiled cache')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Load cassettes on demand instead of all at start-up')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of pre-forked worker processes sharing one cassette store (default: 1)')
+    parser.add_argument('--server', choices=['werkzeug', 'asyncio'], default='werkzeug',
+                        help='HTTP server: werkzeug (Flask development server) or asyncio '
+                             '(event loop with keep-alive) (default: werkzeug)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile requests sent with an X-Profile: 1 header or profile=1 query parameter')
+    parser.add_argument('--profile-every', type=int, default=0, metavar='N',
+                        help='With --profile, also profile every Nth request in the background')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help='With --profile, write profile reports to this directory')
+    parser.add_argument('--watch', action='store_true',
+                        help='Reload cassettes that change on disk while the server runs')
+    parser.add_argument('--watch-interval', type=float, default=1.0, metavar='SECONDS',
+                        help='With --watch, seconds between checks of the cassette directory (default: 1.0)')
     
     args = parser.parse_args()
+    watch_interval = args.watch_interval if args.watch else None
+    
+    def configure(app: Flask) -> Flask:
+        app.config.update(PROFILING=args.profile, PROFILE_SAMPLE_EVERY=args.profile_every,
+                          PROFILE_DIR=args.profile_dir)
+        return app
+    
+    if args.workers > 1:
+        print(f"Starting NFL Mock API server on http://{args.host}:{args.port} with {args.workers} workers")
+        store = SharedCassetteStore.build(args.cassette_dir, use_cache=not args.no_cache,
+                                          precompute=precompute_payloads)
+        serve_prefork(lambda shared_store: configure(create_app(shared_store=shared_store,
+                                                                watch_interval=watch_interval)),
+                      store, args.host, args.port, args.workers, server=args.server)
+        return
     
     # Create the Flask app
-    app = create_app(cassette_dir=args.cassette_dir)
+    app = configure(create_app(cassette_dir=args.cassette_dir, use_cache=not args.no_cache, lazy=args.lazy,
+                               watch_interval=watch_interval))
     
     print(f"Starting NFL Mock API server on http://{args.host}:{args.port}")
     print(f"API documentation available at: http://{args.host}:{args.port}/v1")
     print(f"Health check available at: http://{args.host}:{args.port}/health")
     
     try:
-        app.run(host=args.host, port=args.port, debug=args.debug)
+        if args.server == 'asyncio':
+            app.debug = args.debug
+            serve_asyncio(app, args.host, args.port)
+        else:
+            app.run(host=args.host, port=args.port, debug=args.debug)
     except KeyboardInterrupt:
         print("\nServer stopped by user")
     except Exception as e:
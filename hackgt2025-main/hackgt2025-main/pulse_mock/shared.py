@@ -0,0 +1,357 @@
+"""
+Shared, memory-mapped cassette store for pre-forked server workers.
+
+Running several server processes normally means every process parses every
+cassette and keeps its own copy of the resulting object graph. With a
+SharedCassetteStore the parent process does that work once: it loads the
+cassettes, encodes every distinct recorded body (plus its gzip and deflate
+variants) into one anonymous shared memory map, and keeps only a small table
+of interactions pointing into it. Forked workers inherit the mapping and the
+table, so starting a worker parses nothing, and the bodies exist exactly once
+in physical memory however many workers are running.
+
+Payloads derived from the recordings (for example the unwrapped players list
+or the statistics endpoints) can be built in the parent as well and are laid
+out in the same map. Workers copy a body out of the map only while sending
+it, and decode JSON only when an endpoint needs the data itself (filters,
+search), and only for the bodies that endpoint uses.
+
+Usage:
+    store = SharedCassetteStore.build(precompute=precompute_payloads)
+    app = create_app(shared_store=store)    # in each forked worker
+
+or let serve_prefork() do the forking:
+    python -m pulse_mock.server --workers 4
+"""
+
+import gc
+import mmap
+import os
+import signal
+import socket
+import sys
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from .payload import MIN_COMPRESS_SIZE, SUPPORTED_ENCODINGS, Payload
+from .store import CassetteEntry, Interaction, InteractionKey, InteractionStore, PathKey
+
+
+class SharedBody:
+    """
+    A recorded response body stored in a memory map: a SharedCassetteStore's,
+    or an indexed cassette file's (see pulse_mock.indexed).
+    """
+
+    __slots__ = ('_buffer', 'offset', 'length', 'payload')
+
+    def __init__(self, buffer: mmap.mmap, offset: int, length: int):
+        """
+        Initialize the SharedBody.
+
+        Args:
+            buffer: Memory map holding the body
+            offset: Start of the UTF-8 encoded body in the map
+            length: Length of the encoded body in bytes
+        """
+        self._buffer = buffer
+        self.offset = offset
+        self.length = length
+        self.payload: Optional['SharedPayload'] = None
+
+    def bytes(self) -> bytes:
+        """Copy the encoded body out of the memory map."""
+        return self._buffer[self.offset:self.offset + self.length]
+
+    def text(self) -> str:
+        """Copy the body out of the memory map as a string."""
+        return self.bytes().decode('utf-8')
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"SharedBody({self.offset}, {self.length} bytes)"
+
+
+class SharedPayload(Payload):
+    """A Payload whose bytes and compressed variants live in a shared memory map."""
+
+    __slots__ = ('_body', '_variants')
+
+    def __init__(self, body: SharedBody, content_type: str, status_code: int, etag: str,
+                 variants: Dict[str, Tuple[int, int]]):
+        """
+        Initialize the SharedPayload.
+
+        Args:
+            body: The body in the memory map
+            content_type: Value for the Content-Type header
+            status_code: HTTP status code
+            etag: Precomputed entity tag of the body
+            variants: Compressed variants by encoding, as (offset, length) in the map
+        """
+        self._body = body
+        self.content_type = content_type
+        self.status_code = status_code
+        self._etag = etag
+        self._encoded = None
+        self._variants = variants
+
+    @property
+    def data(self) -> bytes:
+        return self._body.bytes()
+
+    def encoded(self, encoding: str) -> bytes:
+        """Copy a precompressed variant out of the memory map."""
+        variant = self._variants.get(encoding)
+        if variant is None:
+            return super().encoded(encoding)
+        offset, length = variant
+        return self._body._buffer[offset:offset + length]
+
+    def __len__(self) -> int:
+        return self._body.length
+
+
+class _Layout:
+    """Collects payloads and their compressed variants for one memory map."""
+
+    def __init__(self):
+        self.blobs: List[bytes] = []
+        self.entries: List[Tuple[Payload, int, Dict[str, Tuple[int, int]]]] = []
+        self.size = 0
+
+    def _append(self, data: bytes) -> Tuple[int, int]:
+        offset = self.size
+        self.blobs.append(data)
+        self.size += len(data)
+        return offset, len(data)
+
+    def add(self, payload: Payload) -> int:
+        """Reserve space for a payload; returns its slot number."""
+        offset, _ = self._append(payload.data)
+        variants = {}
+        if len(payload) >= MIN_COMPRESS_SIZE:
+            for encoding in SUPPORTED_ENCODINGS:
+                variants[encoding] = self._append(payload.encoded(encoding))
+        self.entries.append((payload, offset, variants))
+        return len(self.entries) - 1
+
+    def write(self) -> mmap.mmap:
+        """Copy everything into a new anonymous shared memory map."""
+        buffer = mmap.mmap(-1, max(self.size, 1))
+        for blob in self.blobs:
+            buffer.write(blob)
+        self.blobs = []
+        return buffer
+
+    def body(self, buffer: mmap.mmap, slot: int) -> SharedBody:
+        """Get the SharedBody (with its SharedPayload) for a slot."""
+        payload, offset, variants = self.entries[slot]
+        body = SharedBody(buffer, offset, len(payload))
+        body.payload = SharedPayload(body, payload.content_type, payload.status_code, payload.etag, variants)
+        return body
+
+
+class SharedCassetteStore:
+    """
+    Every loaded interaction, with bodies held in one read-only shared memory map.
+
+    Build the store before forking; workers then pass it to create_app() or
+    NFLMockClient(shared_store=...).
+    """
+
+    def __init__(self, cassette_dir: str, buffer: mmap.mmap, loaded_cassettes: List[str],
+                 interactions: List[Interaction], index: Dict[Union[InteractionKey, PathKey], Interaction],
+                 payloads: Optional[Dict[Hashable, SharedPayload]] = None,
+                 cassettes: Optional[Dict[str, CassetteEntry]] = None):
+        """
+        Initialize the SharedCassetteStore. Use build() or from_client() instead.
+
+        Args:
+            cassette_dir: Directory the cassettes were loaded from
+            buffer: Memory map holding every body and compressed variant
+            loaded_cassettes: Filenames of the cassettes in the store
+            interactions: Interactions whose response bodies are SharedBody instances
+            index: Request key and (METHOD, normalized URL) -> interaction lookup index
+            payloads: Precomputed derived payloads by derived-value key
+            cassettes: Interactions and their request keys, by cassette filename
+        """
+        self.cassette_dir = cassette_dir
+        self.buffer = buffer
+        self.loaded_cassettes = loaded_cassettes
+        self.interactions = interactions
+        self.index = index
+        self.payloads = payloads or {}
+        self.cassettes = cassettes or {}
+
+    @classmethod
+    def build(cls, cassette_dir: Optional[str] = None, use_cache: bool = True,
+              precompute: Optional[Callable[[Any], None]] = None) -> 'SharedCassetteStore':
+        """
+        Load every available cassette and move it into a shared store.
+
+        Args:
+            cassette_dir: Directory containing VCR cassette files
+            use_cache: Whether to use the compiled cassette cache
+            precompute: Optional function called with the loading NFLMockClient
+                to build derived payloads (client.derived_payload()) that
+                should be shared too, e.g. server.precompute_payloads
+
+        Returns:
+            The SharedCassetteStore
+        """
+        from .client import NFLMockClient
+
+        client = NFLMockClient(cassette_dir, auto_load_all=True, use_cache=use_cache)
+        if precompute is not None:
+            precompute(client)
+        return cls.from_client(client)
+
+    @classmethod
+    def from_client(cls, client) -> 'SharedCassetteStore':
+        """
+        Copy a client's loaded cassettes and derived payloads into a shared store.
+
+        Args:
+            client: MockAPIClient with the cassettes to share already loaded
+
+        Returns:
+            The SharedCassetteStore
+        """
+        # Lay out each distinct (body, content type, status) once, followed by
+        # its compressed variants when it is large enough to be served compressed
+        layout = _Layout()
+        body_slots: Dict[Tuple[str, str, int], int] = {}
+        for interaction in client.interactions:
+            key = cls._body_key(interaction)
+            if key not in body_slots:
+                body_slots[key] = layout.add(client._payload_for(interaction))
+        derived_slots = {
+            key: layout.add(value) for key, value in client._store.derived.items()
+            if isinstance(key, tuple) and key[:1] == ('payload',) and isinstance(value, Payload)
+        }
+
+        buffer = layout.write()
+        bodies = {key: layout.body(buffer, slot) for key, slot in body_slots.items()}
+        payloads = {key: layout.body(buffer, slot).payload for key, slot in derived_slots.items()}
+
+        shared: Dict[int, Interaction] = {}
+        interactions = []
+        for interaction in client.interactions:
+            light = Interaction(interaction.method, interaction.url, interaction.status_code,
+                                interaction.headers, bodies[cls._body_key(interaction)])
+            shared[id(interaction)] = light
+            interactions.append(light)
+        index = {key: shared[id(interaction)] for key, interaction in client._store.index.items()}
+        cassettes = {
+            name: ([shared[id(interaction)] for interaction in entry_interactions], list(keys))
+            for name, (entry_interactions, keys) in client._store.cassettes.items()
+        }
+
+        return cls(client.cassette_dir, buffer, list(client.loaded_cassettes), interactions, index, payloads,
+                   cassettes)
+
+    @staticmethod
+    def _body_key(interaction: Interaction) -> Tuple[str, str, int]:
+        return (interaction.body, interaction.content_type, interaction.status_code)
+
+    def snapshot(self) -> InteractionStore:
+        """
+        Create an interaction snapshot for a client attached to this store.
+
+        Every snapshot shares the interactions and index, but gets its own
+        derived-value cache, which starts out holding the shared payloads.
+        """
+        urls = frozenset(key[1] for key in self.index)
+        store = InteractionStore(self.loaded_cassettes, self.interactions, self.index, urls, self.cassettes)
+        store.derived.update(self.payloads)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+
+def serve_prefork(app_factory: Callable[['SharedCassetteStore'], Any], store: 'SharedCassetteStore',
+                  host: str, port: int, workers: int, server: str = 'werkzeug') -> None:
+    """
+    Serve an app from several forked worker processes sharing one cassette store.
+
+    The parent opens the listening socket and forks the workers; each builds
+    its app from the shared store and
+    accepts connections on the inherited socket. The parent waits until it is
+    interrupted (or sent SIGTERM) and then stops the workers.
+
+    Args:
+        app_factory: Function building a WSGI app from the shared store,
+            e.g. ``lambda store: create_app(shared_store=store)``
+        store: The SharedCassetteStore, built in this (parent) process
+        host: Host to bind to
+        port: Port to bind to
+        workers: Number of worker processes
+        server: HTTP server each worker runs: 'werkzeug' or 'asyncio'
+
+    Raises:
+        RuntimeError: If the platform cannot fork
+    """
+    from werkzeug.serving import make_server
+
+    from .aioserver import serve_asyncio
+
+    if not hasattr(os, 'fork'):
+        raise RuntimeError("Pre-forked workers need os.fork(), which this platform does not support")
+
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(128)
+    listener.set_inheritable(True)
+
+    # Objects created so far are shared with the workers; keep the garbage
+    # collector from touching (and so copying) their pages in each worker.
+    gc.collect()
+    gc.freeze()
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            status = 0
+            try:
+                app = app_factory(store)
+                if server == 'asyncio':
+                    serve_asyncio(app, sock=listener)
+                else:
+                    make_server(host, port, app, threaded=True, fd=listener.fileno()).serve_forever()
+            except KeyboardInterrupt:
+                pass
+            except Exception as e:
+                print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+                status = 1
+            finally:
+                os._exit(status)
+        children.append(pid)
+
+    print(f"Started {workers} workers sharing {len(store) / 1024 / 1024:.1f} MB of cassette data")
+    # Stop the workers too when the parent is asked to terminate
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while children:
+            pid, _ = os.wait()
+            if pid in children:
+                children.remove(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        listener.close()
@@ -0,0 +1,130 @@
+"""
+Precomputed team and league statistics.
+
+LeagueStats aggregates a league's roster and schedule for every team in a
+single pass, so answering a statistics request is a dictionary lookup rather
+than three requests, three decoded bodies and a fresh count. NFLMockClient
+builds it once per league and rebuilds it only when the loaded cassettes
+change.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from .frozen import FrozenDict, FrozenList
+
+
+def count_by(records: Iterable[Dict[str, Any]], field: str) -> Dict[str, int]:
+    """
+    Count records by the value of a field.
+
+    Args:
+        records: Dictionaries to count
+        field: Field to group by; records without it are counted as "Unknown"
+
+    Returns:
+        Dictionary mapping each field value to its number of records
+    """
+    counts: Dict[str, int] = {}
+    for record in records:
+        value = record.get(field, 'Unknown')
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _team_summary(team: Dict[str, Any], stats: Dict[str, Any]) -> FrozenDict:
+    """Build a team's entry in the league-wide breakdown."""
+    return FrozenDict({
+        'id': team['id'],
+        'name': team.get('name'),
+        'market': team.get('market'),
+        'abbreviation': team.get('abbreviation'),
+        'total_players': stats['total_players'],
+        'total_games': stats['total_games'],
+        'players_by_position': stats['players_by_position'],
+        'games_by_status': stats['games_by_status'],
+    })
+
+
+class LeagueStats:
+    """
+    Statistics for every team in a league, plus league-wide totals.
+
+    Example:
+        stats = LeagueStats('NFL', teams, players, games)
+        stats.team(team_id)['players_by_position']
+        stats.summary()['games_by_status']
+    """
+
+    def __init__(self, league: str, teams: List[Dict[str, Any]], players: List[Dict[str, Any]],
+                 games: List[Dict[str, Any]], schedules: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        """
+        Compute the statistics.
+
+        Args:
+            league: League identifier
+            teams: Team dictionaries for the league
+            players: League roster; players are assigned to teams by ``team.id``
+            games: League games; games are assigned to both the home and away team
+            schedules: Optional recorded schedules by team id, used instead of
+                the league games for those teams (they can reach further back)
+        """
+        schedules = schedules or {}
+        team_players: Dict[str, List[Dict[str, Any]]] = {team['id']: [] for team in teams}
+        team_games: Dict[str, List[Dict[str, Any]]] = {team['id']: [] for team in teams}
+
+        for player in players:
+            team_id = (player.get('team') or {}).get('id')
+            if team_id in team_players:
+                team_players[team_id].append(player)
+
+        for game in games:
+            for side in ('home_team', 'away_team'):
+                team_id = (game.get(side) or {}).get('id')
+                if team_id in team_games and team_id not in schedules:
+                    team_games[team_id].append(game)
+        for team_id, schedule in schedules.items():
+            if team_id in team_games:
+                team_games[team_id] = schedule
+
+        self._teams: Dict[str, FrozenDict] = {}
+        for team in teams:
+            self._teams[team['id']] = FrozenDict({
+                'team_info': team,
+                'total_players': len(team_players[team['id']]),
+                'total_games': len(team_games[team['id']]),
+                'players_by_position': FrozenDict(count_by(team_players[team['id']], 'position')),
+                'games_by_status': FrozenDict(count_by(team_games[team['id']], 'status')),
+            })
+
+        self._summary = FrozenDict({
+            'league': league,
+            'total_teams': len(teams),
+            'total_players': len(players),
+            'total_games': len(games),
+            'players_by_position': FrozenDict(count_by(players, 'position')),
+            'games_by_status': FrozenDict(count_by(games, 'status')),
+            'teams': FrozenList(_team_summary(team, self._teams[team['id']]) for team in teams),
+        })
+
+    def team(self, team_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the statistics for one team.
+
+        Args:
+            team_id: Team identifier
+
+        Returns:
+            Dictionary with team_info, total_players, total_games,
+            players_by_position and games_by_status, or None for unknown teams
+        """
+        return self._teams.get(team_id)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get the league-wide statistics.
+
+        Returns:
+            Dictionary with league totals, position and status counts, and a
+            per-team breakdown under "teams"
+        """
+        return self._summary
@@ -0,0 +1,256 @@
+"""
+Immutable snapshots of the interactions a client has loaded.
+
+A MockAPIClient keeps everything it knows about its loaded cassettes - the
+interactions, the request lookup index and the values derived from them
+- in a single InteractionStore. A store is never modified once it is
+published: loading a cassette builds a new store from the current one and
+swaps it in with a single attribute assignment. Request handlers read
+``client._store`` once and work with that snapshot, so reads need no lock and
+always see a consistent set of cassettes, however many threads are loading
+cassettes at the same time.
+
+The one mutable part of a store is its ``derived`` cache. Derived values
+belong to the snapshot they were computed from, so a value built just before
+a swap can never leak into the next snapshot. Each derived value records the
+URLs it was built from (``dependencies``); when a cassette is reloaded, the
+values that read none of its URLs are carried over to the new snapshot and
+only the others are rebuilt.
+
+Interactions are kept as compact Interaction records rather than the
+dictionaries VCR cassettes are parsed into: only the request method and URL
+and the response status, headers and body survive loading. Records built by
+the same client share identical bodies and header sets.
+
+Requests are looked up by their method, URL and canonical query string (see
+MockAPIClient for how queries are canonicalized). The index also maps each
+(method, URL) pair to the first interaction recorded for it with any query,
+so a request whose query string was never recorded falls back to that one.
+"""
+
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple, Union
+
+# (HTTP method, normalized URL, canonical query string) identifying a recorded request
+InteractionKey = Tuple[str, str, str]
+
+# (HTTP method, normalized URL) identifying the requests for a URL with any query
+PathKey = Tuple[str, str]
+
+# Response headers as (name, value) pairs
+Headers = Tuple[Tuple[str, str], ...]
+
+# Dependency of a derived value whose URLs are not known; such values are
+# rebuilt whenever any cassette is reloaded
+UNKNOWN_DEPENDENCY = '*'
+
+# A loaded cassette's interactions and their request keys
+CassetteEntry = Tuple[List['Interaction'], List[InteractionKey]]
+
+# Recorded response headers that describe the recording rather than the
+# response, dropped when an interaction is loaded
+DROPPED_HEADERS = frozenset({'date'})
+
+
+class Interaction:
+    """
+    One recorded request and its response.
+
+    Supports ``interaction['request']`` / ``interaction['response']`` (and
+    get()) for code written against the VCR dictionaries; those rebuild the
+    dictionaries on every call, so use the attributes instead.
+    """
+
+    __slots__ = ('method', 'url', 'status_code', 'headers', 'body')
+
+    def __init__(self, method: str, url: str, status_code: int, headers: Headers, body: Union[str, Any]):
+        """
+        Initialize the Interaction.
+
+        Args:
+            method: Recorded request method
+            url: Recorded request URL, including any query string
+            status_code: Response status code
+            headers: Response headers as (name, value) pairs
+            body: Response body, a string or a SharedBody (see pulse_mock.shared)
+        """
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    @classmethod
+    def from_vcr(cls, data: Dict[str, Any], bodies: Dict[str, str],
+                 header_sets: Dict[Headers, Headers]) -> 'Interaction':
+        """
+        Build a record from a VCR interaction dictionary.
+
+        Args:
+            data: Interaction as parsed from a cassette
+            bodies: Body intern table; an equal body already in it is reused
+            header_sets: Header intern table; an equal header set already in it is reused
+
+        Returns:
+            The Interaction
+        """
+        request = data.get('request') or {}
+        response = data.get('response') or {}
+        headers = tuple(
+            (name, ', '.join(str(v) for v in value) if isinstance(value, list) else str(value))
+            for name, value in (response.get('headers') or {}).items()
+            if name.lower() not in DROPPED_HEADERS
+        )
+        body = response.get('body') or ''
+        return cls(
+            request.get('method', ''),
+            request.get('url', ''),
+            response.get('code', 200),
+            header_sets.setdefault(headers, headers),
+            bodies.setdefault(body, body) if isinstance(body, str) else body,
+        )
+
+    def header(self, name: str, default: str = '') -> str:
+        """Get a response header value (case-insensitive)."""
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    @property
+    def content_type(self) -> str:
+        """Response content type (JSON if none was recorded)."""
+        return self.header('Content-Type', 'application/json')
+
+    def to_vcr(self) -> Dict[str, Any]:
+        """Rebuild the interaction as a VCR dictionary (headers as single-value lists)."""
+        body = self.body if isinstance(self.body, str) else self.body.text()
+        return {
+            'request': {'method': self.method, 'url': self.url},
+            'response': {'code': self.status_code, 'headers': {name: [value] for name, value in self.headers},
+                         'body': body},
+        }
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self.to_vcr()[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a part of the VCR dictionary ('request' or 'response')."""
+        return self.to_vcr().get(key, default)
+
+    def __repr__(self) -> str:
+        return f"Interaction({self.method} {self.url} -> {self.status_code})"
+
+
+class InteractionStore:
+    """An immutable snapshot of loaded cassettes and their lookup index."""
+
+    __slots__ = ('loaded_cassettes', 'interactions', 'index', 'urls', 'cassettes', 'derived', 'dependencies')
+
+    def __init__(self, loaded_cassettes: Optional[List[str]] = None,
+                 interactions: Optional[List[Interaction]] = None,
+                 index: Optional[Dict[Union[InteractionKey, PathKey], Interaction]] = None,
+                 urls: FrozenSet[str] = frozenset(),
+                 cassettes: Optional[Dict[str, CassetteEntry]] = None):
+        """
+        Initialize the InteractionStore. Callers normally start from an empty
+        store and use with_cassette() rather than passing these directly.
+
+        Args:
+            loaded_cassettes: Cassette filenames, in load order
+            interactions: All interactions, in load order
+            index: Lookup index mapping each request key, and each (method, URL)
+                pair, to its first recorded interaction
+            urls: Every normalized URL with at least one recorded interaction
+            cassettes: Interactions and their request keys, by cassette filename
+        """
+        self.loaded_cassettes: List[str] = loaded_cassettes if loaded_cassettes is not None else []
+        self.interactions: List[Interaction] = interactions if interactions is not None else []
+        self.index: Dict[Union[InteractionKey, PathKey], Interaction] = index if index is not None else {}
+        self.urls = urls
+        self.cassettes: Dict[str, CassetteEntry] = cassettes if cassettes is not None else {}
+        self.derived: Dict[Hashable, Any] = {}
+        # Derived-value key -> normalized URLs the value was built from
+        self.dependencies: Dict[Hashable, FrozenSet[str]] = {}
+
+    def with_cassette(self, cassette_name: str, interactions: List[Interaction],
+                      keys: List[InteractionKey]) -> 'InteractionStore':
+        """
+        Build the store that results from loading one more cassette.
+
+        The first recorded interaction for a request wins, matching the order
+        in which a linear scan over the interactions would find it.
+
+        Args:
+            cassette_name: Filename of the cassette being loaded
+            interactions: The cassette's interactions
+            keys: Request key of each interaction, in the same order
+
+        Returns:
+            A new InteractionStore; this one is left unchanged
+        """
+        index = dict(self.index)
+        for key, interaction in zip(keys, interactions):
+            index.setdefault(key, interaction)
+            index.setdefault(key[:2], interaction)
+        cassettes = dict(self.cassettes)
+        cassettes[cassette_name] = (list(interactions), list(keys))
+        return InteractionStore(
+            self.loaded_cassettes + [cassette_name],
+            self.interactions + list(interactions),
+            index,
+            self.urls.union(key[1] for key in keys),
+            cassettes,
+        )
+
+    def replacing_cassette(self, cassette_name: str, interactions: Optional[List[Interaction]],
+                           keys: Optional[List[InteractionKey]]) -> 'InteractionStore':
+        """
+        Build the store that results from reloading (or unloading) one cassette.
+
+        The cassette keeps its place in the load order. Only the index entries
+        for requests the old or new version records are recomputed, and derived
+        values built without reading any of those URLs are carried over.
+
+        Args:
+            cassette_name: Filename of a loaded cassette
+            interactions: The cassette's new interactions, or None to unload it
+            keys: Request key of each new interaction, in the same order
+
+        Returns:
+            A new InteractionStore; this one is left unchanged
+        """
+        _, old_keys = self.cassettes.get(cassette_name, ([], []))
+        cassettes = dict(self.cassettes)
+        if interactions is None:
+            cassettes.pop(cassette_name, None)
+            loaded = [name for name in self.loaded_cassettes if name != cassette_name]
+            keys = []
+        else:
+            cassettes[cassette_name] = (list(interactions), list(keys))
+            loaded = list(self.loaded_cassettes)
+
+        # Recompute the winner of every affected request key and (method, URL)
+        # pair, in load order
+        affected: Set[Union[InteractionKey, PathKey]] = set(old_keys).union(keys)
+        affected.update([key[:2] for key in affected])
+        index = {key: interaction for key, interaction in self.index.items() if key not in affected}
+        all_interactions: List[Interaction] = []
+        for name in loaded:
+            entry_interactions, entry_keys = cassettes.get(name, ([], []))
+            all_interactions.extend(entry_interactions)
+            for key, interaction in zip(entry_keys, entry_interactions):
+                if key in affected:
+                    index.setdefault(key, interaction)
+                if key[:2] in affected:
+                    index.setdefault(key[:2], interaction)
+
+        store = InteractionStore(loaded, all_interactions, index, frozenset(key[1] for key in index), cassettes)
+        changed = frozenset(key[1] for key in affected)
+        for key, value in list(self.derived.items()):
+            dependencies = self.dependencies.get(key)
+            if dependencies is not None and UNKNOWN_DEPENDENCY not in dependencies \
+                    and dependencies.isdisjoint(changed):
+                store.derived[key] = value
+                store.dependencies[key] = dependencies
+        return store
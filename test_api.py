@@ -1,6 +1,25 @@
+import asyncio
 import unittest
-from pulse_mock import NFLMockClient, MockAPIClient, RequestNotFoundError
+from pulse_mock import NFLMockClient, MockAPIClient, RequestNotFoundError, InvalidCassetteError
+from pulse_mock import AsyncMockAPIClient, AsyncNFLMockClient
+from pulse_mock import cache, create_app, FrozenList
+from pulse_mock import benchmark, indexed
+import pulse_mock
+from pulse_mock.aioserver import AsyncHTTPServer
+from pulse_mock.reload import CassetteWatcher
+from pulse_mock.server import precompute_payloads
+from pulse_mock.shared import SharedCassetteStore
+import copy
+import gzip
+import http.client
 import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 class TestNFLAPI(unittest.TestCase):
     @classmethod
@@ -13,6 +32,14 @@ class TestNFLAPI(unittest.TestCase):
         """Set up test fixtures before each test"""
         pass
 
+    def _copy_cassettes(self, *names):
+        """Copy the named bundled cassettes into a temporary directory removed after the test"""
+        cassette_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cassette_dir)
+        for name in names:
+            shutil.copy(os.path.join(self.mock_client.cassette_dir, name + '.yaml'), cassette_dir)
+        return cassette_dir
+
     def test_health_check(self):
         """Test the API health check endpoint"""
         # Skip health check as it's not part of the mock API
@@ -83,6 +110,16 @@ class TestNFLAPI(unittest.TestCase):
         stats = self.nfl_client.get_team_statistics(eagles['id'])
         self.assertIn('total_players', stats)
         self.assertGreater(stats['total_players'], 0)
+        self.assertEqual(stats['total_games'], len(self.nfl_client.get_team_games(eagles['id'])))
+        self.assertEqual(sum(stats['players_by_position'].values()), stats['total_players'])
+
+        # Statistics are precomputed once and shared until the cassettes change
+        self.assertIs(self.nfl_client.get_team_statistics(eagles['id']), stats)
+        league_stats = self.nfl_client.get_league_statistics()
+        self.assertEqual(league_stats['total_teams'], 32)
+        self.assertEqual(league_stats['total_players'], len(self.nfl_client.get_all_players()))
+        with self.assertRaises(RequestNotFoundError):
+            self.nfl_client.get_team_statistics("non_existent_team_id")
 
     def test_error_handling(self):
         """Test error handling for non-existent resources"""
@@ -128,5 +165,698 @@ class TestNFLAPI(unittest.TestCase):
         team_details = response.json()
         self.assertEqual(team_details['name'], 'Eagles')
 
+    def test_interaction_index(self):
+        """Test indexed matching stays in sync with loaded cassettes"""
+        client = MockAPIClient()
+        client.load_cassette('NFL_teams_list')
+        response = client.get('http://localhost:1339/v1/leagues/NFL/teams?ignored=1')
+        self.assertEqual(len(response.json()), 32)
+
+        # Clearing drops the index; the next request auto-loads again
+        client.clear_cassettes()
+        self.assertEqual(client.loaded_cassettes, [])
+        response = client.get('http://localhost:1339/v1/leagues/NFL/teams')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('NFL_teams_list.yaml', client.loaded_cassettes)
+
+    def test_compact_interactions(self):
+        """Test interactions are compact records sharing identical bodies"""
+        client = MockAPIClient(auto_load_all=True)
+        leagues = [i for i in client.interactions if i.url == 'http://localhost:1339/v1/leagues']
+        self.assertGreater(len(leagues), 1)
+        self.assertTrue(all(i.body is leagues[0].body for i in leagues))
+        self.assertTrue(all(i.headers is leagues[0].headers for i in leagues))
+        self.assertEqual(leagues[0].header('content-type'), 'application/json')
+        self.assertEqual(leagues[0].header('Date'), '')
+        self.assertFalse(hasattr(leagues[0], '__dict__'))
+        # VCR-style access still works
+        self.assertEqual(leagues[0]['request']['method'], 'GET')
+        self.assertEqual(leagues[0].get('response')['body'], leagues[0].body)
+
+        response = client.get('http://localhost:1339/v1/leagues')
+        self.assertFalse(hasattr(response, '__dict__'))
+        self.assertIs(response.text, leagues[0].body)
+        self.assertEqual(response.headers['Content-Type'], ['application/json'])
+        self.assertIn('ETag', response.headers)
+
+    def test_compiled_cassette_cache(self):
+        """Test the compiled cache is written, reused and rebuilt on change"""
+        source = os.path.join(self.mock_client.cassette_dir, 'NFL_team_by_id.yaml')
+        with tempfile.TemporaryDirectory() as tmp:
+            cassette_path = os.path.join(tmp, 'NFL_team_by_id.yaml')
+            shutil.copy(source, cassette_path)
+
+            MockAPIClient(cassette_dir=tmp).load_cassette('NFL_team_by_id')
+            self.assertTrue(os.path.exists(cache.cache_path_for(cassette_path)))
+
+            # Edit the cassette; the stale cache entry must not be used
+            with open(cassette_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            with open(cassette_path, 'w', encoding='utf-8') as f:
+                f.write(content.replace('"Eagles"', '"Birds"'))
+
+            client = MockAPIClient(cassette_dir=tmp)
+            client.load_cassette('NFL_team_by_id')
+            team = client.get('http://localhost:1339/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH').json()
+            self.assertEqual(team['name'], 'Birds')
+
+    def test_manifest_routes_lazy_loading(self):
+        """Test a lazy client loads only the cassette a request needs"""
+        client = MockAPIClient()
+        game = client.get('http://localhost:1339/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8').json()
+        self.assertEqual(game['id'], 'NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8')
+        self.assertEqual(client.loaded_cassettes, ['NFL_game_by_id.yaml'])
+
+        # Unrecorded URLs are answered from the manifest without loading anything
+        with self.assertRaises(RequestNotFoundError):
+            client.get('http://localhost:1339/v1/leagues/NFL/games/unknown_game')
+        self.assertEqual(client.loaded_cassettes, ['NFL_game_by_id.yaml'])
+
+    def test_indexed_cassettes(self):
+        """Test indexed cassettes serve the same responses from a memory-mapped file"""
+        cassette_dir = self._copy_cassettes('NFL_teams_list', 'NFL_players_by_league', 'NFL_team_by_id')
+        for name in ('NFL_teams_list', 'NFL_players_by_league'):
+            indexed.convert_cassette(os.path.join(cassette_dir, name + '.yaml'))
+
+        client = MockAPIClient(cassette_dir=cassette_dir)
+        # A converted cassette replaces its YAML source
+        self.assertEqual(client.discover_available_cassettes(),
+                         ['NFL_players_by_league.pulse', 'NFL_team_by_id.yaml', 'NFL_teams_list.pulse'])
+        for path in ('/v1/leagues/NFL/teams', '/v1/leagues/NFL/players',
+                     '/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH'):
+            expected = self.mock_client.get('http://localhost:1339' + path)
+            response = client.get('http://localhost:1339' + path)
+            self.assertEqual(response.text, expected.text, path)
+            self.assertEqual(response.headers['ETag'], expected.headers['ETag'], path)
+        self.assertIn('NFL_players_by_league.pulse', client.loaded_cassettes)
+        players = client._match_request('GET', 'http://localhost:1339/v1/leagues/NFL/players')
+        self.assertNotIsInstance(players.body, str)
+
+        # The reader is picked by extension; a bare name prefers the indexed file
+        client = MockAPIClient(cassette_dir=cassette_dir)
+        client.load_cassette('NFL_teams_list')
+        client.load_cassette('NFL_teams_list.yaml')
+        self.assertEqual(client.loaded_cassettes, ['NFL_teams_list.pulse', 'NFL_teams_list.yaml'])
+
+        with open(os.path.join(cassette_dir, 'broken.pulse'), 'wb') as f:
+            f.write(b'not a cassette')
+        with self.assertRaises(InvalidCassetteError):
+            client.load_cassette('broken.pulse')
+
+    def test_hot_reload(self):
+        """Test changed cassettes are reloaded without rebuilding unrelated derived data"""
+        cassette_dir = self._copy_cassettes('NFL_teams_list', 'NFL_players_by_league', 'NFL_team_by_id')
+        client = NFLMockClient(cassette_dir=cassette_dir)
+        watcher = CassetteWatcher(client)
+        team_index = client.team_index()
+        position_index = client.position_index()
+        self.assertEqual(client.get_team('NFL_team_ram7VKb86QoDRToIZOIN8rH')['name'], 'Eagles')
+        self.assertEqual(watcher.poll()['reloaded'], [])
+
+        path = os.path.join(cassette_dir, 'NFL_team_by_id.yaml')
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content.replace('"name":"Eagles"', '"name":"Birds"'))
+        mtime = os.stat(path).st_mtime + 1
+        os.utime(path, (mtime, mtime))
+        self.assertEqual(watcher.poll()['reloaded'], ['NFL_team_by_id.yaml'])
+        self.assertEqual(client.get_team('NFL_team_ram7VKb86QoDRToIZOIN8rH')['name'], 'Birds')
+        # Derived data built from other cassettes is kept
+        self.assertIs(client.team_index(), team_index)
+        self.assertIs(client.position_index(), position_index)
+
+        # Rewriting the players cassette drops only what was built from it
+        path = os.path.join(cassette_dir, 'NFL_players_by_league.yaml')
+        os.utime(path, (mtime, mtime))
+        self.assertEqual(watcher.poll()['reloaded'], ['NFL_players_by_league.yaml'])
+        self.assertIs(client.team_index(), team_index)
+        self.assertIsNot(client.position_index(), position_index)
+
+        # Deleted cassettes are unloaded, new ones loaded
+        os.remove(path)
+        shutil.copy(os.path.join(self.mock_client.cassette_dir, 'NFL_games_list.yaml'), cassette_dir)
+        result = watcher.poll()
+        self.assertEqual(result['unloaded'], ['NFL_players_by_league.yaml'])
+        self.assertEqual(result['loaded'], ['NFL_games_list.yaml'])
+        self.assertFalse(client.has_recording('http://localhost:1339/v1/leagues/NFL/players'))
+        self.assertTrue(client.get_all_games())
+
+    def test_reload_keeps_cached_manifest_valid(self):
+        """Test reloads never save a manifest that misses URLs or hides changed files"""
+        cassette_dir = self._copy_cassettes('NFL_teams_list', 'NFL_team_by_id', 'NFL_games_list')
+        teams_url = 'http://localhost:1339/v1/leagues/NFL/teams'
+        MockAPIClient(cassette_dir=cassette_dir).cassette_manifest()
+
+        # A client serving a shared store has no manifest of its own to save
+        store = SharedCassetteStore.build(cassette_dir)
+        NFLMockClient(shared_store=store).reload_cassette('NFL_team_by_id.yaml')
+        self.assertEqual(MockAPIClient(cassette_dir=cassette_dir).get(teams_url).status_code, 200)
+
+        # A file changed on disk but not yet reloaded keeps its old signature
+        client = MockAPIClient(cassette_dir=cassette_dir)
+        client.cassette_manifest()
+        path = os.path.join(cassette_dir, 'NFL_games_list.yaml')
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content.replace('/v1/leagues/NFL/games', '/v1/leagues/NFL/schedule'))
+        client.reload_cassette('NFL_team_by_id.yaml')
+        fresh = MockAPIClient(cassette_dir=cassette_dir)
+        self.assertIn('http://localhost:1339/v1/leagues/NFL/schedule', fresh.cassette_manifest())
+        self.assertEqual(fresh.get(teams_url).status_code, 200)
+
+    def test_query_matching(self):
+        """Test recordings that differ only by query string are matched by their query"""
+        cassette_dir = self._copy_cassettes()
+        url = 'http://localhost:1339/v1/leagues/NFL/games'
+        interactions = [
+            {'request': {'method': 'GET', 'url': url + query},
+             'response': {'code': 200, 'headers': {'Content-Type': ['application/json']}, 'body': body}}
+            for query, body in (('?season=2024&week=1', '[{"id":"week1"}]'), ('?season=2024&week=2', '[{"id":"week2"}]'),
+                                ('', '[{"id":"all"}]'))
+        ]
+        # JSON is valid YAML
+        with open(os.path.join(cassette_dir, 'NFL_games_by_week.yaml'), 'w', encoding='utf-8') as f:
+            json.dump({'interactions': interactions}, f)
+
+        client = MockAPIClient(cassette_dir=cassette_dir)
+        self.assertEqual(client.get(url + '?week=2&season=2024').json(), [{'id': 'week2'}])
+        self.assertEqual(client.get(url + '?season=2024&week=1&_=1700000000').json(), [{'id': 'week1'}])
+        self.assertEqual(client.get(url).json(), [{'id': 'all'}])
+        # An unrecorded query falls back to the first recording of the URL
+        self.assertEqual(client.get(url + '?season=2023').json(), [{'id': 'week1'}])
+        self.assertIsNone(client.get_query_payload(url + '?season=2023'))
+
+        client = MockAPIClient(cassette_dir=cassette_dir, ignored_query_params=())
+        self.assertEqual(client.get(url + '?season=2024&week=2&_=1').json(), [{'id': 'week1'}])
+        client = AsyncMockAPIClient(cassette_dir=cassette_dir, ignored_query_params=())
+        self.assertEqual(asyncio.run(client.get(url + '?season=2024&week=2&_=1')).json(), [{'id': 'week1'}])
+
+        # The server serves recorded queries as-is
+        http = create_app(cassette_dir=cassette_dir).test_client()
+        self.assertEqual(http.get('/v1/leagues/NFL/games?season=2024&week=2').get_json(), [{'id': 'week2'}])
+
+    def test_decoded_body_cache(self):
+        """Test decoded bodies are shared and protected from mutation"""
+        players = self.nfl_client.get_all_players()
+        self.assertIs(players, self.nfl_client.get_all_players())
+        self.assertIsInstance(players, FrozenList)
+
+        with self.assertRaises(TypeError):
+            players.append({})
+        with self.assertRaises(TypeError):
+            players[0]['position'] = 'K'
+
+        # Copies are ordinary, mutable containers
+        player = copy.deepcopy(players[0])
+        player['position'] = 'K'
+        self.assertNotEqual(self.nfl_client.get_all_players()[0].get('position'), 'K')
+
+    def test_pagination_and_projection(self):
+        """Test limit/offset pagination and field projection"""
+        all_players = self.nfl_client.get_all_players()
+        fields = ['id', 'first_name', 'last_name', 'position', 'jersey_number']
+        page = self.nfl_client.get_all_players(limit=5, offset=10, fields=fields)
+        self.assertEqual(len(page), 5)
+        self.assertEqual([p['id'] for p in page], [p['id'] for p in all_players[10:15]])
+        self.assertTrue(all(set(p) <= set(fields) for p in page))
+
+        self.assertEqual(len(self.nfl_client.get_teams(offset=30)), 2)
+        self.assertEqual(len(self.nfl_client.get_players_by_position('QB', limit=3)), 3)
+        with self.assertRaises(ValueError):
+            self.nfl_client.get_all_games(limit=-1)
+
+    def test_record_iterators(self):
+        """Test the streaming iterator API"""
+        players = self.nfl_client.iter_players(position='QB', fields=['id', 'position'])
+        self.assertNotIsInstance(players, list)
+        first = next(players)
+        self.assertEqual(first['position'], 'QB')
+        self.assertEqual(set(first), {'id', 'position'})
+
+        games = list(self.nfl_client.iter_games(limit=10))
+        self.assertEqual(games, self.nfl_client.get_all_games()[:10])
+
+    def test_conditional_requests(self):
+        """Test ETag / If-None-Match support in the client"""
+        game_path = '/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8'
+        game, etag = self.nfl_client.fetch_if_changed(game_path)
+        self.assertEqual(game['id'], 'NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8')
+
+        unchanged, same_etag = self.nfl_client.fetch_if_changed(game_path, etag)
+        self.assertIsNone(unchanged)
+        self.assertEqual(same_etag, etag)
+
+        response = self.mock_client.get('http://localhost:1339' + game_path, headers={'If-None-Match': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+        # The ETag is only computed (and the encoded body cached) once headers are read
+        client = MockAPIClient()
+        response = client.get('http://localhost:1339' + game_path)
+        self.assertEqual(client._payloads, {})
+        self.assertEqual(response.headers['ETag'], [etag])
+        self.assertEqual(len(client._payloads), 1)
+
+
+    def test_player_name_search(self):
+        """Test ranked name search and autocomplete"""
+        players = self.nfl_client.get_all_players()
+        matches = self.nfl_client.find_player_by_name("son")
+        expected = [p for p in players if "son" in f"{p['first_name']} {p['last_name']}".lower()]
+        self.assertCountEqual([p['id'] for p in matches], [p['id'] for p in expected])
+        self.assertEqual(len(self.nfl_client.find_player_by_name("son", limit=3)), 3)
+        self.assertEqual(self.nfl_client.find_player_by_name("jalen hurts")[0]['last_name'], 'Hurts')
+
+        suggestions = self.nfl_client.autocomplete_players("Hu", limit=5)
+        self.assertEqual(len(suggestions), 5)
+        for player in suggestions:
+            words = f"{player['first_name']} {player['last_name']}".lower().split()
+            self.assertTrue(any(word.startswith("hu") for word in words))
+        self.assertEqual(self.nfl_client.autocomplete_players("zzzz"), [])
+
+    def test_secondary_indexes(self):
+        """Test index-backed team, position and head-to-head lookups"""
+        self.assertEqual(self.nfl_client.find_team_by_name("PHI")['name'], 'Eagles')
+        self.assertEqual(self.nfl_client.find_team_by_name("NE")['name'], 'Patriots')
+        self.assertEqual(self.nfl_client.find_team_by_name("eagl")['name'], 'Eagles')
+        self.assertIsNone(self.nfl_client.find_team_by_name("nonexistent"))
+
+        eagles_id = 'NFL_team_ram7VKb86QoDRToIZOIN8rH'
+        team_qbs = self.nfl_client.get_players_by_position('qb', team_id=eagles_id)
+        roster_qbs = [p for p in self.nfl_client.get_team_players(eagles_id) if p['position'] == 'QB']
+        self.assertCountEqual([p['id'] for p in team_qbs], [p['id'] for p in roster_qbs])
+        with self.assertRaises(RequestNotFoundError):
+            self.nfl_client.get_players_by_position('QB', team_id='bogus')
+
+        # Head-to-head results do not depend on which team is passed first
+        game = self.nfl_client.get_all_games()[0]
+        home_id, away_id = game['home_team']['id'], game['away_team']['id']
+        games = self.nfl_client.get_games_between_teams(away_id, home_id)
+        self.assertIn(game['id'], [g['id'] for g in games])
+        self.assertEqual(games, self.nfl_client.get_games_between_teams(home_id, away_id))
+
+
+    def test_lazy_imports(self):
+        """Test importing the client leaves Flask and asyncio unimported until they are used"""
+        script = ("import sys, pulse_mock; loaded = [m for m in ('flask', 'asyncio') if m in sys.modules]; "
+                  "pulse_mock.create_app; print(loaded, 'flask' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(pulse_mock.__file__))).stdout
+        self.assertEqual(output.strip(), '[] True')
+
+class TestAsyncClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.nfl_client = NFLMockClient()
+
+    def test_async_nfl_client(self):
+        """Test awaitable helpers and bulk fetching match the synchronous client"""
+        eagles_id = 'NFL_team_ram7VKb86QoDRToIZOIN8rH'
+
+        async def fetch():
+            client = AsyncNFLMockClient()
+            return await client.fetch_all(
+                teams=client.get_teams(),
+                stats=client.get_team_statistics(eagles_id),
+                qbs=client.get_players_by_position('QB', eagles_id),
+                missing=client.get_team('non_existent_team_id'),
+                return_exceptions=True,
+            )
+
+        screen = asyncio.run(fetch())
+        self.assertEqual(screen['teams'], self.nfl_client.get_teams())
+        self.assertEqual(screen['stats'], self.nfl_client.get_team_statistics(eagles_id))
+        self.assertEqual(screen['qbs'], self.nfl_client.get_players_by_position('QB', eagles_id))
+        self.assertIsInstance(screen['missing'], RequestNotFoundError)
+
+    def test_async_lazy_loading(self):
+        """Test concurrent requests load each needed cassette once"""
+        async def fetch():
+            client = AsyncMockAPIClient()
+            url = 'http://localhost:1339/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8'
+            responses = await asyncio.gather(*(client.get(url) for _ in range(10)))
+            return client, responses
+
+        client, responses = asyncio.run(fetch())
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        self.assertEqual(len(client.loaded_cassettes), 1)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_and_compare(self):
+        """Test the benchmark suite runs and compares against a saved baseline"""
+        suite = benchmark.build_suite(repeats=5)
+        names = [name for name, _, _ in suite]
+        self.assertIn('load/NFL_teams_list.yaml', names)
+        self.assertIn('serve/team_stats', names)
+
+        results = benchmark.run_suite(suite, name_filter='match/')
+        self.assertEqual(set(results), {name for name in names if name.startswith('match/')})
+        for result in results.values():
+            self.assertLessEqual(result['p50'], result['p99'])
+            self.assertIn('peak_kb', result)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'baseline.json')
+            benchmark.save_baseline(results, path)
+            baseline = benchmark.load_baseline(path)
+        self.assertFalse(any(c['regression'] for c in benchmark.compare(results, baseline)))
+
+        slower = {name: dict(result, p50=result['p50'] * 2 + 100) for name, result in results.items()}
+        self.assertTrue(all(c['regression'] for c in benchmark.compare(slower, baseline)))
+
+
+class TestMockServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Create one server app shared by all server tests"""
+        cls.app = create_app()
+        cls.http = cls.app.test_client()
+        cls.nfl_client = NFLMockClient()
+
+    def test_recorded_body_passthrough(self):
+        """Test unfiltered endpoints serve the recorded body bytes unchanged"""
+        response = self.http.get('/v1/leagues/NFL/teams')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content_type, 'application/json')
+        recorded = self.nfl_client.get('http://localhost:1339/v1/leagues/NFL/teams')
+        self.assertEqual(response.data, recorded.content.encode('utf-8'))
+
+        # The players endpoint unwraps {"players": [...]} into a plain list
+        response = self.http.get('/v1/leagues/NFL/players')
+        self.assertEqual(response.get_json(), self.nfl_client.get_all_players())
+
+        response = self.http.get('/v1/leagues/NFL/teams/non_existent_team_id')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json()['error'], 'Not found')
+
+    def test_recorded_query_shape(self):
+        """Test recorded queries are served in the same shape as their route's other responses"""
+        players = self.http.get('/v1/leagues/NFL/players').get_json()
+        for query in ('cursor=&per_page=2500', 'per_page=2500&cursor=', 'per_page=2500'):
+            response = self.http.get(f'/v1/leagues/NFL/players?{query}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json(), players, query)
+
+        # Routes that send their recording unchanged send a recorded query's body unchanged too
+        url = 'http://localhost:1339/v1/leagues/NFL/games?from_date=2025-09-05&to_date=2026-01-04'
+        response = self.http.get(url[len('http://localhost:1339'):])
+        self.assertEqual(response.data, self.nfl_client.get(url).content.encode('utf-8'))
+
+    def test_conditional_responses(self):
+        """Test read endpoints answer If-None-Match with 304 Not Modified"""
+        for path in ['/v1/leagues/NFL/games', '/v1/leagues/NFL/players?position=QB']:
+            response = self.http.get(path)
+            etag = response.headers['ETag']
+            response = self.http.get(path, headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.data, b'')
+
+    def test_compressed_responses(self):
+        """Test Accept-Encoding negotiation serves cached gzip/deflate variants"""
+        plain = self.http.get('/v1/leagues/NFL/games')
+        compressed = self.http.get('/v1/leagues/NFL/games', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed.headers['Vary'])
+        self.assertLess(len(compressed.data), len(plain.data))
+        self.assertEqual(gzip.decompress(compressed.data), plain.data)
+        self.assertNotEqual(compressed.headers['ETag'], plain.headers['ETag'])
+
+        deflated = self.http.get('/v1/leagues/NFL/games', headers={'Accept-Encoding': 'deflate'})
+        self.assertEqual(deflated.headers['Content-Encoding'], 'deflate')
+
+    def test_paginated_list_endpoints(self):
+        """Test limit/offset/fields query parameters on list endpoints"""
+        response = self.http.get('/v1/leagues/NFL/players?limit=2&fields=id,last_name')
+        self.assertEqual(response.status_code, 200)
+        players = response.get_json()
+        self.assertEqual(len(players), 2)
+        self.assertEqual(set(players[0]), {'id', 'last_name'})
+        self.assertEqual(int(response.headers['X-Total-Count']), len(self.nfl_client.get_all_players()))
+
+        response = self.http.get('/v1/leagues/NFL/games?limit=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson_streaming(self):
+        """Test list endpoints stream one JSON record per line on request"""
+        response = self.http.get('/v1/leagues/NFL/games?format=ndjson')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertTrue(response.is_streamed)
+        lines = response.data.decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.nfl_client.get_all_games())
+
+        response = self.http.get('/v1/leagues/NFL/players?position=QB&limit=5',
+                                 headers={'Accept': 'application/x-ndjson'})
+        lines = response.data.decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(json.loads(line)['position'] == 'QB' for line in lines))
+
+    def test_statistics_endpoints(self):
+        """Test the team and league statistics endpoints"""
+        response = self.http.get('/v1/leagues/NFL/stats')
+        self.assertEqual(response.status_code, 200)
+        stats = response.get_json()
+        self.assertEqual(len(stats['teams']), stats['total_teams'])
+        self.assertEqual(sum(stats['games_by_status'].values()), stats['total_games'])
+
+        team_id = stats['teams'][0]['id']
+        response = self.http.get(f'/v1/leagues/NFL/teams/{team_id}/stats')
+        self.assertEqual(response.get_json()['total_players'], stats['teams'][0]['total_players'])
+        self.assertEqual(self.http.get('/v1/leagues/NFL/teams/unknown/stats').status_code, 404)
+        self.assertEqual(self.http.get('/v1/leagues/NFL/players?position=QB&team_id=bogus').status_code, 404)
+
+    def test_player_autocomplete_endpoint(self):
+        """Test the player autocomplete endpoint"""
+        response = self.http.get('/v1/leagues/NFL/players/autocomplete?q=jal&limit=3&fields=id,first_name')
+        self.assertEqual(response.status_code, 200)
+        players = response.get_json()
+        self.assertEqual(len(players), 3)
+        self.assertTrue(all(p['first_name'].lower().startswith('jal') for p in players))
+
+        response = self.http.get('/v1/leagues/NFL/players/autocomplete')
+        self.assertEqual(response.status_code, 400)
+
+        # offset pages through the ranked results of both name endpoints
+        for path in ('/v1/leagues/NFL/players/autocomplete?q=jo', '/v1/leagues/NFL/players/search?name=jo'):
+            ranked = self.http.get(f'{path}&limit=6').get_json()
+            self.assertEqual(self.http.get(f'{path}&limit=3&offset=3').get_json(), ranked[3:], path)
+
+        # Suggestions are capped, so pages reaching past the cap are rejected rather than cut short
+        response = self.http.get('/v1/leagues/NFL/players/autocomplete?q=j&limit=10&offset=45')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.http.get('/v1/leagues/NFL/players/autocomplete?q=j&limit=10&offset=40').get_json()),
+                         10)
+
+    def test_concurrent_requests(self):
+        """Test many threads hitting a lazily loading server at once"""
+        eagles_id = 'NFL_team_ram7VKb86QoDRToIZOIN8rH'
+        paths = [
+            '/v1/leagues',
+            '/v1/leagues/NFL/teams',
+            f'/v1/leagues/NFL/teams/{eagles_id}',
+            f'/v1/leagues/NFL/teams/{eagles_id}/players',
+            f'/v1/leagues/NFL/teams/{eagles_id}/games',
+            f'/v1/leagues/NFL/teams/{eagles_id}/stats',
+            '/v1/leagues/NFL/players?position=QB',
+            '/v1/leagues/NFL/players/search?name=hurts',
+            '/v1/leagues/NFL/games?limit=10',
+            '/v1/leagues/NFL/games/NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8',
+            '/v1/leagues/NFL/players/NFL_player_SyWsd7T30Oev84KlU0vKvQrU',
+            '/v1/leagues/NFL/stats',
+        ]
+        expected = {path: self.http.get(path).get_json() for path in paths}
+
+        app = create_app(lazy=True)
+        threads = 16
+        start = threading.Barrier(threads)
+
+        def worker(offset):
+            http = app.test_client()
+            start.wait()
+            results = []
+            for i in range(3 * len(paths)):
+                path = paths[(offset + i) % len(paths)]
+                response = http.get(path)
+                results.append((path, response.status_code, response.get_json()))
+            return results
+
+        with ThreadPoolExecutor(threads) as pool:
+            for results in pool.map(worker, range(threads)):
+                for path, status, body in results:
+                    self.assertEqual(status, 200, path)
+                    self.assertEqual(body, expected[path], path)
+
+        loaded = app.test_client().get('/health').get_json()['loaded_cassettes']
+        self.assertEqual(len(loaded), len(set(loaded)))
+
+    def test_shared_store(self):
+        """Test a server attached to a shared store answers like a normal one"""
+        store = SharedCassetteStore.build(precompute=precompute_payloads)
+        self.assertIn(('payload', ('players', 'NFL')), store.payloads)
+        http = create_app(shared_store=store).test_client()
+
+        eagles_id = 'NFL_team_ram7VKb86QoDRToIZOIN8rH'
+        for path in ['/v1/leagues/NFL/teams', '/v1/leagues/NFL/players', f'/v1/leagues/NFL/teams/{eagles_id}/stats',
+                     '/v1/leagues/NFL/players?position=QB', '/v1/leagues/NFL/players/search?name=hurts']:
+            for headers in ({}, {'Accept-Encoding': 'gzip'}):
+                expected = self.http.get(path, headers=headers)
+                response = http.get(path, headers=headers)
+                self.assertEqual(response.status_code, 200, path)
+                self.assertEqual(response.data, expected.data, path)
+                self.assertEqual(response.headers.get('ETag'), expected.headers.get('ETag'), path)
+                self.assertEqual(response.headers.get('Content-Encoding'),
+                                 expected.headers.get('Content-Encoding'), path)
+
+        self.assertEqual(http.get('/v1/leagues/NFL/teams/non_existent_team_id/stats').status_code, 404)
+
+    def test_metrics_endpoint(self):
+        """Test per-route request metrics are served in the Prometheus text format"""
+        app = create_app()
+        http = app.test_client()
+        for _ in range(3):
+            http.get('/v1/leagues/NFL/teams')
+        http.get('/v1/leagues/NFL/teams/unknown_team')
+
+        response = http.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        text = response.get_data(as_text=True)
+        self.assertIn('pulse_mock_requests_total{route="/v1/leagues/<league>/teams",method="GET",status="200"} 3', text)
+        self.assertIn('route="/v1/leagues/<league>/teams/<team_id>",method="GET",status="404"} 1', text)
+        self.assertIn('pulse_mock_request_duration_seconds_bucket{route="/v1/leagues/<league>/teams",'
+                      'method="GET",le="+Inf"} 3', text)
+        self.assertIn('pulse_mock_response_size_bytes_count{route="/v1/leagues/<league>/teams",method="GET"} 3',
+                      text)
+        self.assertRegex(text, r'pulse_mock_client_matches_total\{result="hit"\} [1-9]')
+        self.assertIn('# TYPE pulse_mock_live_subscribers gauge', text)
+
+    def test_request_profiling(self):
+        """Test requests are profiled on demand and by sampling once profiling is enabled"""
+        app = create_app()
+        http = app.test_client()
+        path = '/v1/leagues/NFL/teams/NFL_team_ram7VKb86QoDRToIZOIN8rH/stats'
+        # Off by default: the parameter is ignored
+        self.assertNotIn('frames', http.get(path + '?profile=1').get_json())
+
+        app.config['PROFILING'] = True
+        report = http.get(path + '?profile=1').get_json()
+        self.assertEqual(report['path'], path)
+        self.assertEqual(report['status'], 200)
+        self.assertGreater(report['response_bytes'], 0)
+        self.assertTrue(report['frames'])
+        self.assertTrue({'function', 'calls', 'own_ms', 'cumulative_ms'} <= set(report['frames'][0]))
+        report = http.get('/v1/leagues/NFL/players/search?name=hurts', headers={'X-Profile': '1'}).get_json()
+        self.assertEqual(report['path'], '/v1/leagues/NFL/players/search')
+
+        # Sampled requests keep their response; reports go to the directory
+        report_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, report_dir)
+        app.config.update(PROFILE_SAMPLE_EVERY=2, PROFILE_DIR=report_dir)
+        profiler = app.extensions['profiler']
+        reports = len(profiler.reports)
+        for _ in range(4):
+            self.assertIsInstance(http.get('/v1/leagues/NFL/teams').get_json(), list)
+        self.assertEqual(len(profiler.reports), reports + 2)
+        self.assertTrue(profiler.reports[-1]['sampled'])
+        self.assertEqual(sorted(name.rsplit('.', 1)[1] for name in os.listdir(report_dir)),
+                         ['json', 'json', 'prof', 'prof'])
+
+    def test_game_stream(self):
+        """Test game states are pushed to stream subscribers as Server-Sent Events"""
+        app = create_app()
+        hub = app.extensions['live_hub']
+        http = app.test_client()
+        game_id = 'NFL_game_s7NlrGA1L1RaSOZNtJ8HHSj8'
+        path = f'/v1/leagues/NFL/games/{game_id}/stream'
+
+        response = http.get(path, buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        frames = iter(response.response)
+        first = next(frames)
+        self.assertTrue(first.startswith(b'id: '))
+        self.assertIn(b'event: game\n', first)
+        self.assertIn(game_id.encode('utf-8'), first)
+        self.assertEqual(hub.subscriber_count('NFL', game_id), 1)
+
+        self.assertEqual(hub.publish('NFL', game_id, {'id': game_id, 'home_points': 7}), 1)
+        self.assertIn(b'"home_points":7', next(frames))
+        response.close()
+        self.assertEqual(hub.subscriber_count(), 0)
+
+        # A slow subscriber keeps only the newest frames
+        subscription = hub.subscribe('NFL', game_id)
+        for points in range(20):
+            hub.publish('NFL', game_id, {'home_points': points})
+        self.assertGreater(subscription.dropped, 0)
+        self.assertTrue(subscription.pending().endswith(b'data: {"home_points":19}\n\n'))
+
+        # Async subscribers are woken by states published from other threads
+        async def receive():
+            async for chunk in subscription:
+                return chunk
+        loop = asyncio.new_event_loop()
+        threading.Timer(0.05, hub.publish, ('NFL', game_id, {'home_points': 21})).start()
+        self.assertIn(b'"home_points":21', loop.run_until_complete(receive()))
+        loop.close()
+        subscription.close()
+
+        # Reconnecting with the current state's id skips the initial frame
+        event_id = first.split(b'\n')[0][4:].decode('utf-8')
+        subscription = hub.subscribe('NFL', game_id, event_id)
+        self.assertEqual(subscription.pending(), b'')
+        subscription.close()
+        self.assertEqual(http.get('/v1/leagues/NFL/games/unknown_game/stream').status_code, 404)
+
+    def test_asyncio_front_end(self):
+        """Test the asyncio front end serves the app's responses over one keep-alive connection"""
+        server = AsyncHTTPServer(self.app, '127.0.0.1', 0)
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        async def shutdown():
+            server.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        conn = http.client.HTTPConnection(*server.address, timeout=10)
+        try:
+            conn.request('GET', '/v1/leagues')
+            conn.getresponse().read()
+            sock = conn.sock
+
+            for path in ['/v1/leagues/NFL/teams', '/v1/leagues/NFL/players?position=QB&limit=3',
+                         '/v1/leagues/NFL/players/search?name=hurts', '/v1/leagues/NFL/teams/non_existent_team_id',
+                         '/v1/leagues/NFL/players/autocomplete']:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                expected = self.http.get(path)
+                self.assertEqual(response.status, expected.status_code, path)
+                self.assertEqual(response.read(), expected.data, path)
+                self.assertEqual(response.getheader('ETag'), expected.headers.get('ETag'), path)
+
+            # Streamed responses use chunked encoding on the same connection
+            conn.request('GET', '/v1/leagues/NFL/games', headers={'Accept': 'application/x-ndjson'})
+            response = conn.getresponse()
+            self.assertEqual(response.getheader('Transfer-Encoding'), 'chunked')
+            self.assertEqual(len(response.read().splitlines()), len(self.nfl_client.get_all_games()))
+
+            conn.request('HEAD', '/v1/leagues/NFL/teams')
+            response = conn.getresponse()
+            self.assertEqual(response.read(), b'')
+            self.assertIsNotNone(response.getheader('Content-Length'))
+            self.assertIs(conn.sock, sock)
+        finally:
+            conn.close()
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(10)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)